@@ -0,0 +1,72 @@
+"""
+GTU Results Scraper - cohort analytics
+Groups results by the parts of the enrollment number (admission year,
+college, program, branch) and summarizes every group in one pass.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Enrollment number layout: YY CCC PP BB NNN, e.g. 22 640 03 16 220
+ENROLLMENT_PARTS = {"Batch": (0, 2), "College": (2, 5), "Program": (5, 7), "Branch": (7, 9)}
+GRADE_COLUMNS = ["SPI", "CPI", "CGPA"]
+PERCENTILES = [0.25, 0.5, 0.75, 0.9]
+BACKLOG_BINS = [-1, 0, 1, 2, np.inf]
+BACKLOG_LABELS = ["Back_0", "Back_1", "Back_2", "Back_3+"]
+COHORT_SHEETS = {"By Batch": ["Batch"], "By College": ["College"], "By Branch": ["Branch"]}
+RANKS_SHEET = "Ranks"
+
+
+def enrollment_parts(enrollments):
+    """Batch/College/Program/Branch columns sliced from a Series of enrollment numbers"""
+    enrollments = enrollments.astype(str).str.strip()
+    return pd.DataFrame({part: enrollments.str[start:end] for part, (start, end) in ENROLLMENT_PARTS.items()})
+
+
+def prepare(results):
+    """Numeric result columns plus the enrollment parts, rows without a valid enrollment dropped"""
+    frame = results[results["Enrollment_No"].astype(str).str.fullmatch(r"\d{12}")].copy()
+    for col in GRADE_COLUMNS + ["Current_Sem_Back", "Total_Back"]:
+        frame[col] = pd.to_numeric(frame[col], errors="coerce")
+    return pd.concat([frame, enrollment_parts(frame["Enrollment_No"])], axis=1)
+
+
+def cohort_summary(frame, by):
+    """One row per group: size, pass rate, grade percentiles and backlog histogram"""
+    groups = frame.groupby(by, sort=True)
+    summary = pd.DataFrame({
+        "Students": groups.size(),
+        "Pass_Rate": ((frame["Current_Sem_Back"] == 0).groupby([frame[key] for key in by]).mean() * 100).round(2),
+    })
+    for col in GRADE_COLUMNS:
+        summary[f"{col}_Mean"] = groups[col].mean().round(2)
+        quantiles = groups[col].quantile(PERCENTILES).unstack()
+        for p in PERCENTILES:
+            summary[f"{col}_P{int(p * 100)}"] = quantiles[p].round(2)
+            
+    backlogs = pd.cut(frame["Current_Sem_Back"].fillna(0), BACKLOG_BINS, labels=BACKLOG_LABELS)
+    histogram = pd.crosstab([frame[key] for key in by], backlogs).reindex(columns=BACKLOG_LABELS, fill_value=0)
+    return summary.join(histogram).fillna({label: 0 for label in BACKLOG_LABELS}).reset_index()
+
+
+def rank_students(frame):
+    """SPI ranks overall, within the college and within the college's branch (1 = best)"""
+    ranks = frame[["Enrollment_No", "Name", "SPI", "CPI", "CGPA"]].copy()
+    ranks["Overall_Rank"] = frame["SPI"].rank(method="min", ascending=False)
+    ranks["College_Rank"] = frame.groupby("College")["SPI"].rank(method="min", ascending=False)
+    ranks["Branch_Rank"] = frame.groupby(["College", "Branch"])["SPI"].rank(method="min", ascending=False)
+    rank_columns = ["Overall_Rank", "College_Rank", "Branch_Rank"]
+    ranks[rank_columns] = ranks[rank_columns].astype("Int64")
+    return ranks.sort_values(["Overall_Rank", "Enrollment_No"], na_position="last").reset_index(drop=True)
+
+
+def cohort_tables(results):
+    """All cohort sheets for a results table, {sheet name: DataFrame}"""
+    frame = prepare(results)
+    if frame.empty:
+        return {}
+    tables = {sheet: cohort_summary(frame, by) for sheet, by in COHORT_SHEETS.items()}
+    tables[RANKS_SHEET] = rank_students(frame)
+    return tables
+
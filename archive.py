@@ -0,0 +1,143 @@
+"""
+GTU Results Scraper - raw result page archive
+Every result page is kept as a zlib blob in one append-only file with an
+offset index next to it, so output tables can be rebuilt later without
+a browser, the network or captchas:
+
+    python -m archive list
+    python -m archive reparse --exam 5001 --output sem5.xlsx
+"""
+
+import os
+import sys
+import zlib
+import time
+import argparse
+import threading
+from pages import parse_result_page, STATUS_OK
+from writers import get_writer
+from common import DATA_DIR
+
+
+class PageArchive:
+    """Append-only store of compressed result pages keyed by (exam, enrollment)"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.blob_path = os.path.join(directory, "pages.bin")
+        self.index_path = os.path.join(directory, "pages.idx")
+        self.index = {}  # (exam, enrollment) -> (offset, length) of the newest page
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        
+        self._blobs = open(self.blob_path, "ab+")
+        blob_size = self._blobs.seek(0, os.SEEK_END)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 5:
+                        continue
+                    exam, enrollment, offset, length, _ = parts
+                    # Entries whose blob never reached the disk are ignored
+                    if int(offset) + int(length) <= blob_size:
+                        self.index[(exam, enrollment)] = (int(offset), int(length))
+        self._index = open(self.index_path, "a", encoding="utf-8")
+        
+    def __len__(self):
+        return len(self.index)
+        
+    def put(self, exam, enrollment, html):
+        """Append one page, a newer page of the same student replaces the old one"""
+        blob = zlib.compress(html.encode("utf-8"), 6)
+        with self.lock:
+            offset = self._blobs.seek(0, os.SEEK_END)
+            self._blobs.write(blob)
+            self._blobs.flush()
+            # The index line is written after its blob, so it never points at missing data
+            self._index.write(f"{exam}\t{enrollment}\t{offset}\t{len(blob)}\t{int(time.time())}\n")
+            self._index.flush()
+            self.index[(exam, enrollment)] = (offset, len(blob))
+            
+    def get(self, exam, enrollment):
+        """Stored page of a student, None when it was never archived"""
+        with self.lock:
+            location = self.index.get((exam, enrollment))
+            if location is None:
+                return None
+            offset, length = location
+            self._blobs.seek(offset)
+            blob = self._blobs.read(length)
+        return zlib.decompress(blob).decode("utf-8")
+        
+    def exams(self):
+        """{exam: number of archived students}"""
+        counts = {}
+        with self.lock:
+            for exam, _ in self.index:
+                counts[exam] = counts.get(exam, 0) + 1
+        return counts
+        
+    def pages(self, exam=None):
+        """Yield (exam, enrollment, html) in enrollment order, optionally for one exam"""
+        with self.lock:
+            keys = sorted(key for key in self.index if exam is None or key[0] == exam)
+        for key in keys:
+            yield key[0], key[1], self.get(*key)
+            
+    def close(self):
+        with self.lock:
+            for f in (self._blobs, self._index):
+                if not f.closed:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    f.close()
+
+
+def reparse(archive, exam, output, on_log=print):
+    """Rebuild the output tables of an exam from its archived pages, return {status: count}"""
+    counts = {}
+    writer = get_writer(output)
+    try:
+        for _, enrollment, html in archive.pages(exam):
+            status, data = parse_result_page(html)
+            counts[status] = counts.get(status, 0) + 1
+            if status == STATUS_OK:
+                writer.write(data)
+            else:
+                on_log(f"{enrollment}: {data}")
+    finally:
+        writer.close()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m archive", description="Archived result pages")
+    parser.add_argument("--dir", default=os.path.join(DATA_DIR, "archive"), help=argparse.SUPPRESS)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show archived exams and how many students each has")
+    rebuild = commands.add_parser("reparse", help="rebuild an output file from the archive, offline")
+    rebuild.add_argument("--exam", required=True, help="exam value, e.g. 5001")
+    rebuild.add_argument("--output", required=True, help="output file")
+    args = parser.parse_args(argv)
+    
+    archive = PageArchive(args.dir)
+    try:
+        if args.command == "list":
+            for exam, count in sorted(archive.exams().items()):
+                print(f"{exam}\t{count} students")
+            return 0
+            
+        begin = time.perf_counter()
+        counts = reparse(archive, args.exam, args.output)
+        elapsed = time.perf_counter() - begin
+        total = sum(counts.values())
+        print(f"Re-parsed {total} pages in {elapsed:.2f}s -> {args.output} "
+              f"({counts.get(STATUS_OK, 0)} results)")
+        return 0 if total else 1
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
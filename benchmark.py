@@ -0,0 +1,243 @@
+"""
+GTU Results Scraper - end-to-end benchmark
+Runs the scraping core used by the GUI and the CLI against the local mock
+server and reports throughput, per-student latency and memory:
+
+    python benchmark.py --students 200 --engines http browser --workers 1 4 --latency 0.05
+
+or measures how long the GUI takes from a cold process start to an
+interactive window:
+
+    python benchmark.py --startup
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import threading
+import tracemalloc
+import numpy as np
+from scraper import ENGINES, ScrapeRun, SeleniumSession, STATUS_OK
+from common import build_enrollments
+from captcha_solver import CaptchaSolver
+from mock_server import MockResultsServer
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+EXAM_VALUE = "5001"
+START_ENROLLMENT = "226400316000"
+STARTUP_BUDGET_S = 1.0
+# Runs in a fresh interpreter, prints wall-clock times once main is imported and once the window is up
+STARTUP_PROBE = """
+import time
+import main
+imported = time.time()
+try:
+    root = main.tk.Tk()
+except Exception:  # no display
+    print(imported, "none")
+    raise SystemExit
+main.GTUResultsScraperGUI.prewarm = lambda self: None  # the background work is not part of startup
+app = main.GTUResultsScraperGUI(root)
+root.update()
+print(imported, time.time())
+root.destroy()
+"""
+
+
+class ScriptedOperator:
+    """Answers captchas with the text the mock server issued, like a single human would"""
+    
+    def __init__(self, server, delay=0.0):
+        self.server = server
+        self.delay = delay
+        self.lock = threading.Lock()
+        
+    def __call__(self, enrollment, captcha_png):
+        with self.lock:
+            if self.delay:
+                time.sleep(self.delay)
+            return self.server.answer_for(captcha_png) or ""
+
+
+class TimedSession:
+    """Session wrapper recording when each enrollment was first submitted"""
+    
+    def __init__(self, session, started):
+        self.session = session
+        self.started = started
+        
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+        
+    def submit(self, enrollment, captcha):
+        self.started.setdefault(enrollment, time.perf_counter())
+        return self.session.submit(enrollment, captcha)
+
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_benchmark(server, engine_name, students, workers, prefetch=0, operator_delay=0.0, lean=True):
+    """Scrape students enrollments from the mock server, return the measurements"""
+    engine = {name.lower(): cls for name, cls in ENGINES.items()}[engine_name]
+    started = {}
+    latencies = []
+    
+    def session_factory(worker_id):
+        if engine is SeleniumSession:
+            session = SeleniumSession("Regular", EXAM_VALUE, base_url=server.url, headless=True, lean=lean)
+        else:
+            session = engine("Regular", EXAM_VALUE, base_url=server.url)
+        return TimedSession(session, started)
+        
+    def on_progress(processed, total, enrollment):
+        if enrollment in started:
+            latencies.append(time.perf_counter() - started[enrollment])
+            
+    with tempfile.TemporaryDirectory() as tmp:
+        run = ScrapeRun(
+            session_factory, build_enrollments(START_ENROLLMENT, students),
+            os.path.join(tmp, "benchmark.xlsx"), ScriptedOperator(server, operator_delay),
+            workers=workers,
+            prefetch=prefetch,
+            solver=CaptchaSolver(),
+            auto_solve=False,
+            harvest_dir=None,
+            timings_dir=None,
+            archive_dir=None,
+            on_progress=on_progress
+        )
+        tracemalloc.start()
+        begin = time.perf_counter()
+        run.run()
+        elapsed = time.perf_counter() - begin
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+    if not started:
+        raise RuntimeError("no session got as far as submitting the form")
+    latencies = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "engine": engine_name if engine is not SeleniumSession or lean else engine_name + " (full)",
+        "workers": workers,
+        "prefetch": prefetch,
+        "students": students,
+        "saved": run.counts[STATUS_OK],
+        "seconds": round(elapsed, 3),
+        "students_per_s": round(run.processed / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1000, 1),
+        "peak_heap_mb": round(peak / (1024 * 1024), 1),
+        "max_rss_mb": round(max_rss_mb(), 1) if resource else None,
+        "phases": run.telemetry.summary(),
+    }
+
+
+def measure_startup(runs=5):
+    """Seconds from spawning a Python process to main imported and to the window drawn, per run"""
+    samples = []
+    for _ in range(runs):
+        spawned = time.time()
+        result = subprocess.run([sys.executable, "-c", STARTUP_PROBE], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "probe failed")
+        imported, shown = result.stdout.split()
+        samples.append({
+            "import_s": float(imported) - spawned,
+            "window_s": float(shown) - spawned if shown != "none" else None,
+        })
+    return samples
+
+
+def report_startup(samples, budget):
+    """Print the startup times, True when the median stays within budget"""
+    imports = [sample["import_s"] for sample in samples]
+    windows = [sample["window_s"] for sample in samples if sample["window_s"] is not None]
+    print(f"import main: median {np.median(imports):.3f}s, max {max(imports):.3f}s over {len(samples)} runs")
+    if windows:
+        print(f"interactive window: median {np.median(windows):.3f}s, max {max(windows):.3f}s")
+        measured = float(np.median(windows))
+    else:
+        print("interactive window: no display, budget checked against the import time")
+        measured = float(np.median(imports))
+    within = measured <= budget
+    print(f"{'✓' if within else '✗'} {measured:.3f}s against a budget of {budget:.3f}s")
+    return within
+
+
+def print_table(rows):
+    columns = ["engine", "workers", "prefetch", "students", "saved", "seconds", "students_per_s",
+               "p50_ms", "p99_ms", "peak_heap_mb", "max_rss_mb"]
+    widths = {col: max(len(col), *(len(str(row.get(col))) for row in rows)) for col in columns}
+    print("  ".join(col.rjust(widths[col]) for col in columns))
+    for row in rows:
+        print("  ".join(str(row.get(col)).rjust(widths[col]) for col in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against the local mock server")
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--engines", nargs="+", choices=[name.lower() for name in ENGINES], default=["http"])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--prefetch", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05, help="base seconds the server adds to each page")
+    parser.add_argument("--jitter", type=float, default=0.05, help="random extra seconds per page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of posts answered with 503")
+    parser.add_argument("--missing-rate", type=float, default=0.1, help="fraction of enrollments without data")
+    parser.add_argument("--capacity", type=int, help="concurrent posts the server handles at full speed")
+    parser.add_argument("--operator-delay", type=float, default=0.0, help="seconds to answer each captcha")
+    parser.add_argument("--full-browser", action="store_true", help="browser sessions load every resource")
+    parser.add_argument("--startup", action="store_true", help="measure GUI cold start instead of scraping")
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_S, help="seconds")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if args.startup:
+        samples = measure_startup(args.startup_runs)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(samples, f, indent=2)
+        return 0 if report_startup(samples, args.startup_budget) else 1
+        
+    server = MockResultsServer(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        missing_rate=args.missing_rate, seed=0, capacity=args.capacity
+    ).start()
+    rows = []
+    try:
+        for engine_name in args.engines:
+            for workers in args.workers:
+                try:
+                    rows.append(run_benchmark(server, engine_name, args.students, workers,
+                                              args.prefetch, args.operator_delay, not args.full_browser))
+                except Exception as e:
+                    print(f"✗ {engine_name} with {workers} worker(s) failed: {e}", file=sys.stderr)
+    finally:
+        server.stop()
+        
+    if rows:
+        print_table(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+"""
+GTU Results Scraper - captcha prompts for headless runs
+A terminal prompt and a small local web page where pending captchas can be
+answered, by several operators at once.
+"""
+
+import io
+import time
+import base64
+import socket
+import threading
+import collections
+import numpy as np
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+from PIL import Image
+from captcha_solver import binarize
+from common import CaptchaExpired, CaptchaRequest
+
+
+def render_ascii(captcha_png):
+    """Captcha image as text, for terminals without a display"""
+    mask = binarize(Image.open(io.BytesIO(captcha_png)))
+    rows = np.flatnonzero(mask.any(axis=1))
+    columns = np.flatnonzero(mask.any(axis=0))
+    if not rows.size:
+        return ""
+    mask = mask[rows[0]:rows[-1] + 1, columns[0]:columns[-1] + 1]
+    # Merge row pairs, terminal cells are about twice as tall as they are wide
+    if len(mask) % 2:
+        mask = np.vstack([mask, np.zeros((1, mask.shape[1]), dtype=bool)])
+    mask = mask[0::2] | mask[1::2]
+    return "\n".join("".join("#" if inked else " " for inked in row) for row in mask)
+
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>GTU Results Scraper - Captcha</title>
+<meta http-equiv="refresh" content="{refresh}">
+<style>
+body {{ font-family: "Segoe UI", sans-serif; background: #f0f4f8; text-align: center; margin-top: 60px; }}
+img {{ border: 2px solid #1e3a8a; width: 240px; image-rendering: pixelated; }}
+input {{ font-size: 20px; padding: 6px; width: 180px; }}
+button {{ font-size: 16px; padding: 8px 18px; background: #2563eb; color: white; border: none; }}
+table {{ margin: 0 auto; border-collapse: collapse; }}
+td, th {{ padding: 4px 12px; border-bottom: 1px solid #cbd5e1; }}
+.small {{ color: #64748b; font-size: 13px; }}
+.small input {{ font-size: 13px; padding: 2px; width: 110px; }}
+.small button {{ font-size: 13px; padding: 2px 8px; }}
+</style></head>
+<body>
+<h2>GTU Results Scraper</h2>
+{body}
+</body></html>
+"""
+
+# Reloads the page as soon as the captcha shown was answered elsewhere or expired
+WATCH_SCRIPT = """<script>
+setInterval(function() {{
+  fetch("/pending?id={id}").then(function(r) {{ return r.text(); }})
+    .then(function(t) {{ if (t.trim() !== "yes") location.reload(); }});
+}}, 1000);
+</script>"""
+
+
+class OperatorStats:
+    """Answers and answer times of one operator"""
+    
+    def __init__(self):
+        self.answered = 0
+        self.late = 0  # answered after someone else or after expiry
+        self.latencies = collections.deque(maxlen=200)
+        
+    def median(self):
+        if not self.latencies:
+            return None
+        return float(np.median(self.latencies))
+        
+    def describe(self):
+        median = self.median()
+        text = f"{self.answered} answered"
+        if median is not None:
+            text += f", median {median:.1f}s"
+        if self.late:
+            text += f", {self.late} too late"
+        return text
+
+
+class WebCaptchaConsole:
+    """Serves pending captchas to any number of operators on a local web page
+    
+    Each operator is shown the oldest captcha nobody else is looking at, so
+    several people work through the queue side by side; when there are more
+    operators than captchas they race and the first answer wins. Captchas
+    left unanswered for expire_after seconds are withdrawn, the session then
+    fetches a fresh one.
+    """
+    
+    def __init__(self, host="127.0.0.1", port=8800, expire_after=120, lease=15):
+        self.pending = collections.OrderedDict()  # id -> (request, queued at)
+        self.shown = {}  # id -> (operator, shown at)
+        self.operators = collections.defaultdict(OperatorStats)
+        self.expired = 0
+        self.expire_after = expire_after
+        self.lease = lease  # seconds a captcha stays with the operator it was shown to
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        
+        handler = type("Handler", (CaptchaConsoleHandler,), {"console": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        if host == "0.0.0.0":
+            host = socket.gethostname()
+        return f"http://{host}:{port}/"
+        
+    def __call__(self, enrollment, captcha_png):
+        """Queue a captcha and block until it is answered on the page"""
+        request = CaptchaRequest(enrollment, captcha_png)
+        self.publish(request)
+        return self.wait(request)
+        
+    def publish(self, request):
+        """Offer a captcha to the operators, other prompts may answer the same request"""
+        with self.lock:
+            self.pending[id(request)] = (request, time.monotonic())
+            
+    def wait(self, request, stopped=None):
+        """Block until the request is answered, raise CaptchaExpired when nobody answers in time"""
+        deadline = time.monotonic() + self.expire_after
+        while not request.event.wait(0.2):
+            if self.stop_event.is_set() or (stopped and stopped()):
+                self.withdraw(request)
+                return None
+            if time.monotonic() > deadline:
+                self.withdraw(request)
+                # Answers typed into another prompt after this are too late as well
+                if request.resolve(None):
+                    with self.lock:
+                        self.expired += 1
+                    raise CaptchaExpired(request.enrollment)
+        self.withdraw(request)
+        return request.answer
+        
+    def withdraw(self, request):
+        with self.lock:
+            self.pending.pop(id(request), None)
+            self.shown.pop(id(request), None)
+            
+    def next_for(self, operator):
+        """The captcha to show an operator and the number waiting, (None, 0) when the queue is empty"""
+        now = time.monotonic()
+        with self.lock:
+            if not self.pending:
+                return None, 0
+            for request_id, (request, queued) in self.pending.items():
+                holder, shown_at = self.shown.get(request_id, (None, 0))
+                if holder == operator:
+                    return request, len(self.pending)
+                if holder is None or now - shown_at > self.lease:
+                    self.shown[request_id] = (operator, now)
+                    return request, len(self.pending)
+            # Everything is taken, help with the oldest one
+            return next(iter(self.pending.values()))[0], len(self.pending)
+            
+    def is_pending(self, request_id):
+        with self.lock:
+            return request_id in self.pending
+            
+    def answer(self, request_id, answer, operator="operator"):
+        """Answer a captcha, False when it was already answered or withdrawn"""
+        now = time.monotonic()
+        with self.lock:
+            stats = self.operators[operator]
+            entry = self.pending.pop(request_id, None)
+            holder, shown_at = self.shown.pop(request_id, (None, None))
+            if entry is None or not entry[0].resolve(answer):
+                stats.late += 1
+                return False
+            stats.answered += 1
+            stats.latencies.append(now - (shown_at if holder == operator else entry[1]))
+            return True
+            
+    def summary(self):
+        """Per-operator line for the end of the log, empty if nobody answered on the page"""
+        with self.lock:
+            if not self.operators:
+                return ""
+            parts = [f"{name} {stats.describe()}" for name, stats in sorted(self.operators.items())]
+            if self.expired:
+                parts.append(f"{self.expired} expired")
+        return "Operators: " + "; ".join(parts)
+        
+    def close(self):
+        self.stop_event.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class CaptchaConsoleHandler(BaseHTTPRequestHandler):
+    console = None
+    
+    def log_message(self, format, *args):
+        pass
+        
+    def _send(self, status, body, headers=(), content_type="text/html; charset=utf-8"):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def _operator(self):
+        """Name from the operator cookie, the client address until one is set"""
+        cookies = SimpleCookie(self.headers.get("Cookie", ""))
+        if "operator" in cookies and cookies["operator"].value:
+            return unquote(cookies["operator"].value)
+        return self.client_address[0]
+        
+    def _form(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/pending":
+            request_id = parse_qs(url.query).get("id", [""])[0]
+            pending = request_id.isdigit() and self.console.is_pending(int(request_id))
+            self._send(200, "yes" if pending else "no", content_type="text/plain")
+            return
+        if url.path == "/stats":
+            self._send(200, PAGE.format(refresh=5, body=self._stats()))
+            return
+            
+        operator = self._operator()
+        name_form = (
+            f'<form class="small" method="post" action="/name">Operator: {escape(operator)} '
+            f'<input name="name" placeholder="your name"> <button>Set</button> &middot; '
+            f'<a href="/stats">stats</a></form>'
+        )
+        request, waiting = self.console.next_for(operator)
+        if request is None:
+            self._send(200, PAGE.format(refresh=1, body="<p>No captcha waiting.</p>" + name_form))
+            return
+            
+        image = base64.b64encode(request.image).decode("ascii")
+        body = (
+            f"<p>Enrollment {escape(request.enrollment)} &middot; {waiting} waiting</p>"
+            f'<img src="data:image/png;base64,{image}"><br><br>'
+            f'<form method="post" action="/answer">'
+            f'<input type="hidden" name="id" value="{id(request)}">'
+            f'<input name="answer" autofocus autocomplete="off"> <button>Submit</button></form><br>'
+            + name_form + WATCH_SCRIPT.format(id=id(request))
+        )
+        self._send(200, PAGE.format(refresh=60, body=body))
+        
+    def _stats(self):
+        with self.console.lock:
+            rows = [(name, stats.answered, stats.median(), stats.late)
+                    for name, stats in sorted(self.console.operators.items())]
+            waiting = len(self.console.pending)
+            expired = self.console.expired
+        body = "".join(
+            f"<tr><td>{escape(name)}</td><td>{answered}</td>"
+            f"<td>{'-' if median is None else format(median, '.1f') + 's'}</td><td>{late}</td></tr>"
+            for name, answered, median, late in rows
+        )
+        return (
+            f"<p>{waiting} waiting &middot; {expired} expired &middot; <a href=\"/\">back</a></p>"
+            "<table><tr><th>Operator</th><th>Answered</th><th>Median time</th><th>Too late</th></tr>"
+            f"{body}</table>"
+        )
+        
+    def do_POST(self):
+        form = self._form()
+        if self.path == "/name":
+            name = form.get("name", "").strip()[:32]
+            cookie = f"operator={quote(name)}; Path=/; Max-Age=31536000" if name else "operator=; Path=/; Max-Age=0"
+            self._send(303, "", headers=[("Location", "/"), ("Set-Cookie", cookie)])
+            return
+        answer = form.get("answer", "").strip()
+        if answer and form.get("id", "").isdigit():
+            self.console.answer(int(form["id"]), answer, self._operator())
+        self._send(303, "", headers=[("Location", "/")])
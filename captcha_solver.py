@@ -0,0 +1,244 @@
+"""
+GTU Results Scraper - offline captcha solver
+Binarizes the captcha, cuts it into glyphs and matches every glyph against
+templates learned from answers the operator got right.
+"""
+
+import io
+import os
+import re
+import hashlib
+import threading
+import numpy as np
+from PIL import Image
+
+
+GLYPH_SIZE = 16  # normalized glyphs are GLYPH_SIZE x GLYPH_SIZE
+# Captchas are letters and digits; anything else is a typo, and unsafe in a harvest file name
+CAPTCHA_ANSWER = re.compile(r"[A-Za-z0-9]+")
+
+
+def binarize(image):
+    """Return a boolean ink mask using Otsu's threshold on the grayscale image"""
+    gray = np.asarray(image.convert("L"), dtype=np.uint8)
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    total = gray.size
+    cum_count = np.cumsum(hist)
+    cum_mean = np.cumsum(hist * np.arange(256))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (cum_mean[-1] * cum_count - total * cum_mean) ** 2 / (cum_count * (total - cum_count))
+    threshold = int(np.nanargmax(between))
+    mask = gray <= threshold
+    
+    # Drop isolated noise pixels (fewer than two inked neighbours)
+    padded = np.pad(mask, 1)
+    neighbours = sum(
+        padded[1 + dy:padded.shape[0] - 1 + dy, 1 + dx:padded.shape[1] - 1 + dx]
+        for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx
+    )
+    return mask & (neighbours >= 2)
+
+
+def segment(mask, min_pixels=4):
+    """Split an ink mask into glyph masks using the column projection"""
+    columns = mask.any(axis=0)
+    runs = []
+    start = None
+    for x, inked in enumerate(columns):
+        if inked and start is None:
+            start = x
+        elif not inked and start is not None:
+            runs.append((start, x))
+            start = None
+    if start is not None:
+        runs.append((start, len(columns)))
+    runs = [(begin, end) for begin, end in runs if mask[:, begin:end].sum() >= min_pixels]
+    if not runs:
+        return []
+        
+    # Touching glyphs show up as one unusually wide run, split it evenly
+    median = float(np.median([end - begin for begin, end in runs]))
+    glyphs = []
+    for begin, end in runs:
+        width = end - begin
+        parts = int(round(width / median)) if width > 1.8 * median else 1
+        step = (end - begin) / parts
+        for i in range(parts):
+            glyph = mask[:, int(begin + i * step):int(begin + (i + 1) * step)]
+            rows = np.flatnonzero(glyph.any(axis=1))
+            if rows.size:
+                glyphs.append(glyph[rows[0]:rows[-1] + 1])
+    return glyphs
+
+
+def glyph_features(glyph):
+    """Scale a glyph mask into a GLYPH_SIZE square, keeping its aspect ratio, as a unit vector"""
+    height, width = glyph.shape
+    side = max(height, width)
+    canvas = np.zeros((side, side), dtype=np.uint8)
+    top, left = (side - height) // 2, (side - width) // 2
+    canvas[top:top + height, left:left + width] = glyph * 255
+    
+    image = Image.fromarray(canvas).resize((GLYPH_SIZE, GLYPH_SIZE), Image.Resampling.BILINEAR)
+    vector = np.asarray(image, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def captcha_glyphs(captcha_png):
+    """Feature vectors for every glyph of a captcha image"""
+    image = Image.open(io.BytesIO(captcha_png))
+    return [glyph_features(glyph) for glyph in segment(binarize(image))]
+
+
+class CaptchaSolver:
+    """Nearest-neighbour glyph classifier with persistent templates"""
+    
+    def __init__(self, path=None, max_templates=40):
+        self.path = path
+        self.max_templates = max_templates
+        self.templates = np.zeros((0, GLYPH_SIZE * GLYPH_SIZE), dtype=np.float32)
+        self.labels = np.zeros(0, dtype="<U1")
+        self.lengths = np.zeros(16, dtype=np.int64)  # confirmed answers by length
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+            
+    def __len__(self):
+        return len(self.labels)
+        
+    def solve(self, captcha_png):
+        """Return (answer, confidence), confidence is 0 when no guess is possible"""
+        glyphs = captcha_glyphs(captcha_png)
+        with self.lock:
+            if not glyphs or not len(self.labels):
+                return None, 0.0
+            # A lost or extra glyph cannot show up in the per-glyph scores
+            if self.lengths.any() and len(glyphs) != int(np.argmax(self.lengths)):
+                return None, 0.0
+            similarity = np.stack(glyphs) @ self.templates.T
+            
+            answer = []
+            confidence = 1.0
+            for scores in similarity:
+                best = int(np.argmax(scores))
+                char = self.labels[best]
+                # Margin against the closest template of any other character
+                others = scores[self.labels != char]
+                runner_up = float(others.max()) if others.size else 0.0
+                score = float(scores[best])
+                confidence = min(confidence, score * min(1.0, (score - runner_up) * 10))
+                answer.append(char)
+        return "".join(answer), max(0.0, confidence)
+        
+    def learn(self, captcha_png, answer):
+        """Add the glyphs of a confirmed captcha as templates, False if it did not segment cleanly"""
+        glyphs = captcha_glyphs(captcha_png)
+        with self.lock:
+            if len(answer) < len(self.lengths):
+                self.lengths[len(answer)] += 1
+        if len(glyphs) != len(answer):
+            return False
+        with self.lock:
+            self.templates = np.vstack([self.templates, np.stack(glyphs)])
+            self.labels = np.concatenate([self.labels, np.array(list(answer), dtype="<U1")])
+            self._prune()
+        return True
+        
+    def _prune(self):
+        """Keep only the newest max_templates templates per character"""
+        keep = np.ones(len(self.labels), dtype=bool)
+        for char in np.unique(self.labels):
+            indices = np.flatnonzero(self.labels == char)
+            keep[indices[:-self.max_templates]] = False
+        self.templates = self.templates[keep]
+        self.labels = self.labels[keep]
+        
+    def load(self):
+        with np.load(self.path) as data:
+            self.templates = data["templates"].astype(np.float32)
+            self.labels = data["labels"].astype("<U1")
+            self.lengths = data["lengths"]
+            
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self.lock:
+            tmp_path = self.path + ".tmp.npz"
+            np.savez_compressed(tmp_path, templates=self.templates, labels=self.labels, lengths=self.lengths)
+            os.replace(tmp_path, self.path)
+            
+    def bootstrap(self, harvest_dir):
+        """Learn from every harvested "<answer>_<hash>.png" captcha, return how many were used"""
+        used = 0
+        for filename in sorted(os.listdir(harvest_dir)):
+            if not filename.endswith(".png") or "_" not in filename:
+                continue
+            with open(os.path.join(harvest_dir, filename), "rb") as f:
+                if self.learn(f.read(), filename.split("_")[0]):
+                    used += 1
+        return used
+
+
+class SolvingCaptchaProvider:
+    """Answers captchas with the solver when confident, otherwise asks the operator
+    
+    Every accepted answer is harvested and learned; an auto answer the site
+    rejects is counted and the retry for that enrollment goes to the operator.
+    """
+    
+    def __init__(self, solver, ask_human, threshold=0.7, auto=True, harvest_dir=None, save_every=25):
+        self.solver = solver
+        self.ask_human = ask_human
+        self.threshold = threshold
+        self.auto = auto
+        self.harvest_dir = harvest_dir
+        self.save_every = save_every
+        self.force_human = set()
+        self.auto_answers = {}
+        self.stats = {"auto": 0, "human": 0, "incorrect_auto": 0, "incorrect_human": 0, "learned": 0}
+        self.lock = threading.Lock()
+        
+    def __call__(self, enrollment, captcha_png):
+        key = hashlib.sha1(captcha_png).hexdigest()
+        if self.auto and enrollment not in self.force_human:
+            answer, confidence = self.solver.solve(captcha_png)
+            if answer and confidence >= self.threshold:
+                with self.lock:
+                    self.stats["auto"] += 1
+                    self.auto_answers[key] = answer
+                return answer
+                
+        with self.lock:
+            self.stats["human"] += 1
+        return self.ask_human(enrollment, captcha_png)
+        
+    def report(self, enrollment, captcha_png, answer, accepted):
+        """Feed back whether the site accepted an answer"""
+        key = hashlib.sha1(captcha_png).hexdigest()
+        with self.lock:
+            was_auto = self.auto_answers.pop(key, None) == answer
+            if not accepted:
+                self.stats["incorrect_auto" if was_auto else "incorrect_human"] += 1
+                if was_auto:
+                    self.force_human.add(enrollment)
+                return
+            self.force_human.discard(enrollment)
+            
+        if was_auto or not CAPTCHA_ANSWER.fullmatch(answer) or not self.solver.learn(captcha_png, answer):
+            return
+        with self.lock:
+            self.stats["learned"] += 1
+            learned = self.stats["learned"]
+        if self.harvest_dir:
+            os.makedirs(self.harvest_dir, exist_ok=True)
+            with open(os.path.join(self.harvest_dir, f"{answer}_{key[:12]}.png"), "wb") as f:
+                f.write(captcha_png)
+        if learned % self.save_every == 0:
+            self.solver.save()
+            
+    def summary(self):
+        stats = self.stats
+        return (f"Captchas: {stats['auto']} solved automatically, {stats['human']} by operator, "
+                f"{stats['incorrect_auto']} auto / {stats['incorrect_human']} operator answers rejected")
@@ -0,0 +1,66 @@
+"""
+GTU Results Scraper - exam catalogue cache
+Keeps the exam dropdown of each result type on disk so it can be shown
+without loading the results page, and merges refreshes into it.
+"""
+
+import os
+import json
+import time
+import threading
+
+
+DEFAULT_TTL = 6 * 60 * 60  # seconds before a cached exam list is refreshed
+
+
+class ExamCatalogue:
+    """Persistent (value, text) exam lists keyed by result type"""
+    
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            self.load()
+            
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A damaged cache is only a slower first load
+            data = {}
+        self.entries = {
+            result_type: {"fetched_at": entry["fetched_at"], "exams": [tuple(exam) for exam in entry["exams"]]}
+            for result_type, entry in data.items()
+        }
+        
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+        
+    def get(self, result_type):
+        """Return (exams, stale); exams is empty when nothing is cached"""
+        with self.lock:
+            entry = self.entries.get(result_type)
+            if not entry:
+                return [], True
+            return list(entry["exams"]), time.time() - entry["fetched_at"] > self.ttl
+            
+    def update(self, result_type, exams):
+        """Merge a fresh exam list into the cache, return the exams that were not cached yet"""
+        with self.lock:
+            entry = self.entries.get(result_type, {"exams": []})
+            known = {value for value, text in entry["exams"]}
+            fetched = {value for value, text in exams}
+            added = [exam for exam in exams if exam[0] not in known]
+            
+            # Site order first; exams the site no longer lists are kept at the end
+            merged = list(exams) + [exam for exam in entry["exams"] if exam[0] not in fetched]
+            self.entries[result_type] = {"fetched_at": time.time(), "exams": merged}
+            self.save()
+        return added
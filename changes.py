@@ -0,0 +1,126 @@
+"""
+GTU Results Scraper - differential re-scrape
+Compares freshly scraped results against an earlier output file, e.g. after
+revaluation, and writes only the students whose grades or backlogs changed
+and the students who have a result now but did not before.
+"""
+
+import os
+import hashlib
+import pandas as pd
+from stats import ResultStats, to_number
+from writers import open_spool, read_results
+
+
+COMPARED_COLUMNS = ["SPI", "CPI", "CGPA", "Current_Sem_Back", "Total_Back"]
+CHANGE_COLUMNS = ["Change", "Enrollment_No", "Name"] + COMPARED_COLUMNS
+CHANGED = "changed"
+NEW = "new"
+
+
+def row_fingerprint(row):
+    """8-byte digest of the compared values of one result row, independent of how numbers were formatted"""
+    parts = []
+    for col in COMPARED_COLUMNS:
+        number = to_number(row.get(col))
+        parts.append("" if number is None else f"{number:.2f}")
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=8).digest()
+
+
+def change_path_for(baseline):
+    """sem5.xlsx -> sem5.changes.csv"""
+    return os.path.splitext(baseline)[0] + ".changes.csv"
+
+
+class ChangeSetWriter:
+    """Result sink of a diff run, streams changed and new students to a CSV file
+    
+    Only a fingerprint per baseline student is kept in memory. Old values are
+    looked up once, when the run ends, for the students that changed.
+    """
+    
+    def __init__(self, file_path, baseline, flush_every=25, stats=None, on_flush=None):
+        self.file_path = file_path
+        self.baseline = baseline
+        self.flush_every = flush_every
+        self.stats = stats if stats is not None else ResultStats()
+        self.on_flush = on_flush
+        self.pending = 0
+        self.counts = {CHANGED: 0, NEW: 0, "unchanged": 0}
+        self.changed = set()
+        self.spool_path = file_path + ".partial.csv"
+        
+        results = read_results(baseline)
+        self.fingerprints = {
+            str(row["Enrollment_No"]): row_fingerprint(row)
+            for row in results.to_dict("records") if pd.notna(row.get("Enrollment_No"))
+        }
+        del results
+        
+        # Changes streamed by an interrupted run of the same diff are kept
+        self._file, self._csv, rows = open_spool(self.spool_path, CHANGE_COLUMNS)
+        for row in rows:
+            self.stats.add(row)
+            self.changed.add(row["Enrollment_No"])
+            self.counts[row["Change"]] += 1
+            
+    def write(self, row):
+        """Compare one scraped row with the baseline, unchanged rows are not written"""
+        enrollment = row.get("Enrollment_No", "")
+        # A resumed run can scrape a student again that the interrupted run had already spooled
+        if enrollment in self.changed:
+            return
+        self.stats.add(row)
+        old = self.fingerprints.get(enrollment)
+        if old == row_fingerprint(row):
+            self.counts["unchanged"] += 1
+            return
+        change = NEW if old is None else CHANGED
+        self.changed.add(enrollment)
+        self.counts[change] += 1
+        self._csv.writerow({"Change": change, **{col: row.get(col, "") for col in CHANGE_COLUMNS[1:]}})
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+            
+    def flush(self):
+        """Flush streamed changes and fsync them to disk"""
+        if self._file.closed:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.pending = 0
+        if self.on_flush:
+            self.on_flush()
+            
+    def close(self):
+        """Build the change set: new values next to the baseline values of every changed student"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        
+        changes = pd.read_csv(self.spool_path, dtype=str, keep_default_na=False)
+        if changes.empty:
+            os.remove(self.spool_path)
+            return
+        baseline = read_results(self.baseline)
+        baseline["Enrollment_No"] = baseline["Enrollment_No"].astype(str)
+        old = baseline[baseline["Enrollment_No"].isin(self.changed)][["Enrollment_No"] + COMPARED_COLUMNS]
+        old = old.drop_duplicates("Enrollment_No", keep="last").rename(
+            columns={col: f"Old_{col}" for col in COMPARED_COLUMNS}
+        )
+        changes = changes.merge(old, on="Enrollment_No", how="left")
+        columns = ["Change", "Enrollment_No", "Name"]
+        for col in COMPARED_COLUMNS:
+            columns += [f"Old_{col}", col]
+        changes = changes[columns].sort_values(["Change", "Enrollment_No"], ignore_index=True)
+        
+        temp_path = self.file_path + ".tmp"
+        changes.to_csv(temp_path, index=False)
+        os.replace(temp_path, self.file_path)
+        os.remove(self.spool_path)
+        
+    def describe(self):
+        return (f"{self.counts[CHANGED]} changed, {self.counts[NEW]} newly available, "
+                f"{self.counts['unchanged']} unchanged")
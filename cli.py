@@ -0,0 +1,289 @@
+"""
+GTU Results Scraper - command line entry point
+Runs the same scraping core as the GUI without Tk, e.g. on a server or in a scheduled job:
+
+    python -m cli --exam 5001 --start 226400316220 --count 60 --engine http --captcha web
+"""
+
+import os
+import sys
+import queue
+import argparse
+import tempfile
+import threading
+from scraper import SeleniumSession, ScrapeRun, ENGINES, BASE_URL, DATA_DIR, STATUS_OK, STATUS_SKIPPED
+from common import DEFAULT_MAX_MISSES, CaptchaRequest, build_enrollments, read_enrollment_list
+from jobs import ScrapeJob, SessionShelf, plan_jobs, read_job_file, run_jobs
+from captcha_solver import CaptchaSolver
+from catalogue import ExamCatalogue
+from store import JobJournal, ResultStore
+from telemetry import format_duration
+from captcha_console import WebCaptchaConsole, render_ascii
+from writers import OUTPUT_EXTENSIONS, read_results
+from changes import change_path_for
+
+
+def baseline_enrollments(path):
+    """Valid enrollment numbers of an earlier output file, in file order"""
+    enrollments = read_results(path)["Enrollment_No"].dropna().astype(str).str.strip()
+    return list(dict.fromkeys(e for e in enrollments if len(e) == 12 and e.isdigit()))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Scrape GTU results without the GUI")
+    parser.add_argument("--exam", help="exam value from the ddlbatch dropdown, e.g. 5001")
+    parser.add_argument("--archive", action="store_true", help="use the Archive results page")
+    parser.add_argument("--list-exams", action="store_true", help="print the exams (cached for a few hours) and exit")
+    
+    enrollments = parser.add_mutually_exclusive_group()
+    enrollments.add_argument("--start", help="first enrollment number (12 digits), use with --count")
+    enrollments.add_argument("--list", dest="list_file",
+                             help="text file with one enrollment number per line, or a CSV file with an Enrollment_No column")
+    enrollments.add_argument("--jobs", dest="job_file",
+                             help="CSV file of jobs (exam, start, count, list, output, result_type) run back to back")
+    parser.add_argument("--count", type=int, default=1, help="number of consecutive students from --start")
+    
+    parser.add_argument("--engine", choices=[name.lower() for name in ENGINES], default="http")
+    parser.add_argument("--workers", type=int, default=1, help="parallel sessions")
+    parser.add_argument("--prefetch", type=int, default=0, help="extra sessions keeping captchas ready")
+    parser.add_argument("--discover", type=int, nargs="?", const=DEFAULT_MAX_MISSES, default=0, metavar="MISSES",
+                        help="scrape known students first and stop a branch after this many consecutive "
+                        f"empty numbers (default: {DEFAULT_MAX_MISSES})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="scrape students again even if their result is already stored")
+    parser.add_argument("--full-browser", action="store_true",
+                        help="let browser sessions load stylesheets, fonts and images too")
+    parser.add_argument("--output",
+                        help="output file, the extension picks the format: " + ", ".join(OUTPUT_EXTENSIONS)
+                        + " (default: gtu_results.xlsx, or <baseline>.changes.csv with --diff)")
+    parser.add_argument("--diff", metavar="BASELINE",
+                        help="re-scrape and write only students changed since this earlier output file")
+    parser.add_argument("--captcha", choices=["solver", "stdin", "web"], default="stdin",
+                        help="where captchas the solver is unsure about are answered")
+    parser.add_argument("--no-auto-solve", action="store_true", help="never submit solver answers")
+    parser.add_argument("--port", type=int, default=8800, help="port of the web captcha prompt")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address the web captcha prompt listens on, 0.0.0.0 lets operators on the LAN join")
+    parser.add_argument("--captcha-expiry", type=int, default=120, metavar="SECONDS",
+                        help="withdraw web captchas nobody answered within this time and fetch fresh ones")
+    parser.add_argument("--base-url", default=BASE_URL, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.list_exams:
+        return args
+    if args.workers <= 0 or args.prefetch < 0 or args.discover < 0:
+        parser.error("--workers must be positive, --prefetch and --discover must not be negative")
+    if args.job_file:
+        if args.diff:
+            parser.error("--diff works on a single exam, not with --jobs")
+        try:
+            args.jobs = plan_jobs(read_job_file(args.job_file))
+        except (OSError, ValueError) as e:
+            parser.error(f"--jobs: {str(e)}")
+        if not args.jobs:
+            parser.error(f"--jobs: {args.job_file} has no jobs")
+        return args
+    if not args.exam or not (args.start or args.list_file or args.diff):
+        parser.error("--exam and one of --start, --list or --jobs are required")
+    if args.diff:
+        if not os.path.exists(args.diff):
+            parser.error(f"--diff: {args.diff} does not exist")
+        args.output = args.output or change_path_for(args.diff)
+        if not args.output.lower().endswith(".csv"):
+            parser.error("--output must be a .csv file with --diff")
+    args.output = args.output or "gtu_results.xlsx"
+    if args.start and (len(args.start) != 12 or not args.start.isdigit()):
+        parser.error("--start must be exactly 12 digits")
+    if args.count <= 0:
+        parser.error("--count must be positive")
+    return args
+
+
+class TerminalPrompt:
+    """Captchas answered on stdin, prompted from the main thread"""
+    
+    def __init__(self):
+        self.requests = queue.Queue()
+        self.stop_event = threading.Event()
+        
+    def __call__(self, enrollment, captcha_png):
+        request = CaptchaRequest(enrollment, captcha_png)
+        self.requests.put(request)
+        # A captcha queued after Ctrl+C, or the one being typed in, is never answered
+        while not request.event.wait(0.2):
+            if self.stop_event.is_set():
+                return None
+        return request.answer
+        
+    def serve(self, run_thread):
+        """Answer captchas until the run thread finishes"""
+        path = os.path.join(tempfile.gettempdir(), "gtu_captcha.png")
+        while run_thread.is_alive():
+            try:
+                request = self.requests.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            with open(path, "wb") as f:
+                f.write(request.image)
+            print(render_ascii(request.image))
+            try:
+                answer = input(f"Captcha for {request.enrollment} (image: {path}): ").strip()
+            except EOFError:
+                answer = None
+            request.resolve(answer)
+
+
+def solver_guess(solver):
+    """Unattended prompt: always submit the solver's best guess"""
+    def ask(enrollment, captcha_png):
+        answer, _ = solver.solve(captcha_png)
+        return answer or ""
+    return ask
+
+
+def make_session(engine, result_type, exam_value, base_url, lean=True):
+    """Session for the chosen engine, browsers run headless"""
+    if engine is SeleniumSession:
+        return SeleniumSession(result_type, exam_value, base_url=base_url, headless=True, lean=lean)
+    return engine(result_type, exam_value, base_url=base_url)
+
+
+def list_exams(result_type, engine, base_url):
+    """Print the exam catalogue, refreshing it from the website when stale"""
+    catalogue = ExamCatalogue(os.path.join(DATA_DIR, "exam_catalogue.json"))
+    exams, stale = catalogue.get(result_type)
+    if stale:
+        session = make_session(engine, result_type, None, base_url)
+        try:
+            session.start()
+            catalogue.update(result_type, session.load_exams())
+        finally:
+            session.quit()
+        exams, _ = catalogue.get(result_type)
+    for value, text in exams:
+        print(f"{value}\t{text}")
+
+
+def print_progress(run, processed, total, every=10):
+    """Rate and ETA line every few students"""
+    if processed % every and processed != total:
+        return
+    eta = run.telemetry.eta(total - processed)
+    line = f"Progress: {processed}/{total} | {run.telemetry.rate_per_min():.1f}/min | {run.pool.limiter.describe()}"
+    if eta is not None and processed < total:
+        line += f" | ETA {format_duration(eta)}"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result_type = "Archive" if args.archive else "Regular"
+    engine = {name.lower(): cls for name, cls in ENGINES.items()}[args.engine]
+    if args.list_exams:
+        list_exams(result_type, engine, args.base_url)
+        return 0
+        
+    if args.job_file:
+        jobs = args.jobs
+    else:
+        if args.list_file:
+            enrollments = read_enrollment_list(args.list_file)
+        elif args.start:
+            enrollments = build_enrollments(args.start, args.count)
+        else:
+            # Diff without a range: everyone in the baseline
+            enrollments = baseline_enrollments(args.diff)
+        jobs = [ScrapeJob(args.exam, enrollments, args.output, result_type)]
+        
+    solver = CaptchaSolver(os.path.join(DATA_DIR, "captcha_templates.npz"))
+    terminal = None
+    console = None
+    if args.captcha == "stdin":
+        ask_captcha = terminal = TerminalPrompt()
+    elif args.captcha == "web":
+        ask_captcha = console = WebCaptchaConsole(args.host, args.port, expire_after=args.captcha_expiry)
+        print(f"Answer captchas at {console.url}", flush=True)
+    else:
+        ask_captcha = solver_guess(solver)
+        
+    journal = JobJournal(os.path.join(DATA_DIR, "jobs.sqlite3"))
+    result_store = ResultStore(os.path.join(DATA_DIR, "results.sqlite3"))
+    shelf = SessionShelf()
+    runs = []
+    stopping = threading.Event()
+    
+    def run_job(job):
+        def make(worker_id):
+            return make_session(engine, job.result_type, job.exam_value, args.base_url, lean=not args.full_browser)
+            
+        run = ScrapeRun(
+            shelf.factory(job, make), job.enrollments, job.output, ask_captcha,
+            workers=args.workers,
+            prefetch=args.prefetch,
+            solver=solver,
+            auto_solve=not args.no_auto_solve,
+            on_log=lambda message: print(message, flush=True),
+            on_progress=lambda processed, total, enrollment: print_progress(run, processed, total),
+            journal=journal,
+            result_store=result_store,
+            skip_known=not args.refresh,
+            baseline=args.diff,
+            release_session=shelf.put,
+            max_misses=args.discover,
+            job_params=job.job_params
+        )
+        runs.append(run)
+        if stopping.is_set():
+            return
+        run.run()
+        if args.diff:
+            print(f"Done: {run.writer.describe()} -> {job.output if os.path.exists(job.output) else 'no changes'}")
+            return
+        known = f", {len(run.known)} already stored" if run.known else ""
+        skipped = run.counts[STATUS_SKIPPED]
+        without = run.processed - run.counts[STATUS_OK] - skipped
+        print(f"Done: {run.counts[STATUS_OK]} saved{known}, {without} without result"
+              f"{f', {skipped} skipped' if skipped else ''} -> {job.output}", flush=True)
+        
+    # The jobs run on a worker thread so Ctrl+C and stdin prompts stay on the main thread
+    failed = []
+    
+    def target():
+        try:
+            failed.extend(run_jobs(jobs, run_job, on_log=lambda message: print(message, flush=True),
+                                   stopped=stopping.is_set))
+        finally:
+            shelf.close()
+            
+    run_thread = threading.Thread(target=target, daemon=True)
+    run_thread.start()
+    try:
+        if terminal:
+            terminal.serve(run_thread)
+        while run_thread.is_alive():
+            run_thread.join(0.2)
+    except KeyboardInterrupt:
+        print("\nStopping, finishing submitted students...", flush=True)
+        stopping.set()
+        if runs:
+            runs[-1].stop()
+        if console:
+            console.stop_event.set()
+        if terminal:
+            terminal.stop_event.set()
+        run_thread.join()
+    finally:
+        if console:
+            console.close()
+            
+    if console and console.summary():
+        print(console.summary())
+    for job, error in failed:
+        print(f"✗ Error in {job.describe()}: {error}", file=sys.stderr)
+    if len(jobs) > 1:
+        print(f"Jobs: {len(jobs) - len(failed)} of {len(jobs)} finished")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+GTU Results Scraper - shared constants and helpers
+Only the standard library is imported here, so the GUI can build its
+window before pandas, NumPy and Selenium are loaded.
+"""
+
+import os
+import csv
+import threading
+
+
+BASE_URL = "https://www.gturesults.in/"
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".gtu_scraper")
+ENGINE_NAMES = ["Browser", "HTTP"]
+DEFAULT_MAX_MISSES = 15  # range discovery gives up a branch after this many empty numbers in a row
+
+
+ENROLLMENT_COLUMNS = ("enrollment_no", "enrollment", "enrollment no", "enrollment number", "enrolment_no")
+
+
+def build_enrollments(enrollment_start, num_students):
+    """Build the consecutive enrollment numbers to scrape, counting over all 12 digits"""
+    first = int(enrollment_start)
+    last = min(first + num_students, 10 ** 12)
+    return [str(n).zfill(12) for n in range(first, last)]
+
+
+def is_enrollment(text):
+    return len(text) == 12 and text.isdigit()
+
+
+def read_enrollment_list(path):
+    """Enrollment numbers from a text file, one per line ("#" starts a comment), or from a CSV file
+
+    A CSV file is read from its Enrollment_No column, or the first 12-digit field
+    of each row when there is no such header. Duplicates are dropped.
+    """
+    enrollments = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.reader(f))
+            header = [cell.strip().lower() for cell in rows[0]] if rows else []
+            column = next((header.index(name) for name in ENROLLMENT_COLUMNS if name in header), None)
+            for row in rows[1:] if column is not None else rows:
+                cells = [row[column]] if column is not None and column < len(row) else row
+                enrollment = next((cell.strip() for cell in cells if is_enrollment(cell.strip())), None)
+                if enrollment:
+                    enrollments.append(enrollment)
+                elif column is not None and any(cell.strip() for cell in cells):
+                    raise ValueError(f"Invalid enrollment number in {path}: {cells[0].strip()}")
+        else:
+            for line in f:
+                enrollment = line.split("#")[0].strip()
+                if not enrollment:
+                    continue
+                if not is_enrollment(enrollment):
+                    raise ValueError(f"Invalid enrollment number in {path}: {enrollment}")
+                enrollments.append(enrollment)
+    return list(dict.fromkeys(enrollments))
+
+
+def exam_value_from_label(label):
+    """Extract the ddlbatch value from a "text (value)" dropdown label"""
+    return label.split("(")[-1].rstrip(")")
+
+
+class CaptchaExpired(Exception):
+    """Nobody answered a captcha in time, the session should fetch a fresh one"""
+
+
+class CaptchaRequest:
+    """A captcha image waiting for an answer, the first answer wins"""
+    
+    def __init__(self, enrollment, image):
+        self.enrollment = enrollment
+        self.image = image
+        self.answer = None
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        
+    def resolve(self, answer):
+        """Set the answer, False if the captcha was already answered"""
+        with self.lock:
+            if self.event.is_set():
+                return False
+            self.answer = answer
+            self.event.set()
+            return True
@@ -0,0 +1,159 @@
+"""
+GTU Results Scraper - sparse range discovery
+Enrollment ranges have holes (detained, transferred or never admitted
+numbers). Numbers known to hold students are scraped first, and a branch
+is given up once a run of consecutive numbers past its last known student
+comes back "Data not available".
+"""
+
+import threading
+import collections
+from pages import STATUS_OK, STATUS_NOT_AVAILABLE
+from store import STATE_NOT_AVAILABLE
+from common import DEFAULT_MAX_MISSES
+
+
+PREFIX_DIGITS = 9  # year, college and branch; the last 3 digits number the students
+RANGE_GAP = 10  # known students this close together count as one occupied range
+
+# Scraping order, most likely populated first
+RANK_KNOWN = 0  # has a result for some exam
+RANK_IN_RANGE = 1  # between known students of its branch
+RANK_UNKNOWN = 2
+RANK_EMPTY = 3  # "Data not available" before
+
+
+def split_enrollment(enrollment):
+    """226400316220 -> ("226400316", 220)"""
+    return enrollment[:PREFIX_DIGITS], int(enrollment[PREFIX_DIGITS:])
+
+
+class OccupancyMap:
+    """Enrollment numbers that held a student, or did not, in earlier runs, per prefix"""
+    
+    def __init__(self, hits=(), misses=(), gap=RANGE_GAP):
+        self.gap = gap
+        self.hits = collections.defaultdict(set)
+        self.misses = collections.defaultdict(set)
+        for enrollment in hits:
+            prefix, suffix = split_enrollment(enrollment)
+            self.hits[prefix].add(suffix)
+        for enrollment in misses:
+            prefix, suffix = split_enrollment(enrollment)
+            if suffix not in self.hits[prefix]:
+                self.misses[prefix].add(suffix)
+        self.ranges = {prefix: self.occupied_ranges(prefix) for prefix in self.hits}
+        
+    @classmethod
+    def load(cls, enrollments, result_store=None, journal=None):
+        """What the result store and job journal know about the prefixes of these enrollments"""
+        prefixes = {enrollment[:PREFIX_DIGITS] for enrollment in enrollments}
+        hits = result_store.enrollments(prefixes) if result_store is not None else set()
+        misses = journal.enrollments_in_state(STATE_NOT_AVAILABLE, prefixes) if journal is not None else set()
+        return cls(hits, misses)
+        
+    def occupied_ranges(self, prefix):
+        """Known students of a prefix merged into (first, last) suffix ranges"""
+        ranges = []
+        for suffix in sorted(self.hits.get(prefix, ())):
+            if ranges and suffix - ranges[-1][1] <= self.gap:
+                ranges[-1][1] = suffix
+            else:
+                ranges.append([suffix, suffix])
+        return [tuple(bounds) for bounds in ranges]
+        
+    def last_known(self, prefix):
+        """Highest suffix of a known student, -1 when the prefix has none"""
+        return max(self.hits.get(prefix, ()), default=-1)
+        
+    def rank(self, enrollment):
+        prefix, suffix = split_enrollment(enrollment)
+        if suffix in self.hits.get(prefix, ()):
+            return RANK_KNOWN
+        if any(first <= suffix <= last for first, last in self.ranges.get(prefix, ())):
+            return RANK_IN_RANGE
+        if suffix in self.misses.get(prefix, ()):
+            return RANK_EMPTY
+        return RANK_UNKNOWN
+        
+    def prioritise(self, enrollments):
+        """Likely students first, the rest in their original order"""
+        return sorted(enrollments, key=self.rank)
+        
+    def describe(self, enrollments):
+        counts = collections.Counter(self.rank(enrollment) for enrollment in enrollments)
+        return (f"{counts[RANK_KNOWN]} known students, {counts[RANK_IN_RANGE]} inside known ranges, "
+                f"{counts[RANK_UNKNOWN]} unknown, {counts[RANK_EMPTY]} empty before")
+
+
+class RangeDiscovery:
+    """Closes a branch after max_misses consecutive empty numbers past its last student
+    
+    Numbers found empty by earlier runs count towards the run, but a branch is
+    only closed by an outcome of this run. Once closed, numbers past its last
+    student are skipped; a student found there after all opens it again for
+    the numbers not handed out yet. Known students are always scraped.
+    """
+    
+    def __init__(self, occupancy, max_misses=DEFAULT_MAX_MISSES, on_log=None):
+        self.occupancy = occupancy
+        self.max_misses = max_misses
+        self.on_log = on_log or (lambda message: None)
+        self.lock = threading.Lock()
+        self.checked = collections.defaultdict(dict)  # prefix -> suffix -> found a student
+        for prefix, suffixes in occupancy.misses.items():
+            self.checked[prefix].update(dict.fromkeys(suffixes, False))
+        self.last_hit = {}  # prefix -> highest suffix with a student, known or found
+        self.closed = set()  # prefixes whose numbers past the last student are skipped
+        self.skipped = collections.Counter()  # prefix -> enrollments skipped
+        
+    def record(self, enrollment, status):
+        """Feed the outcome of one scraped enrollment"""
+        if status not in (STATUS_OK, STATUS_NOT_AVAILABLE):
+            return
+        prefix, suffix = split_enrollment(enrollment)
+        with self.lock:
+            checked = self.checked[prefix]
+            checked[suffix] = status == STATUS_OK
+            last_hit = self.last_hit.get(prefix, self.occupancy.last_known(prefix))
+            if status == STATUS_OK:
+                self.last_hit[prefix] = max(last_hit, suffix)
+                if prefix in self.closed and suffix > last_hit:
+                    self.closed.discard(prefix)
+                    self.on_log(f"Found a student at {enrollment}, scraping the rest of {prefix}xxx again")
+                return
+            self.last_hit[prefix] = last_hit
+            if suffix <= last_hit:
+                # A hole between students, not the end of the branch
+                return
+                
+            # Length of the run of checked empty numbers through this one
+            first = suffix
+            while first - 1 > last_hit and checked.get(first - 1) is False:
+                first -= 1
+            last = suffix
+            while checked.get(last + 1) is False:
+                last += 1
+            if last - first + 1 >= self.max_misses and prefix not in self.closed:
+                self.closed.add(prefix)
+                self.on_log(f"No students at {prefix}{first:03d}-{prefix}{last:03d} "
+                            f"({last - first + 1} in a row), skipping the rest of {prefix}xxx")
+                            
+    def should_skip(self, enrollment):
+        """True for numbers past the last student of a closed branch, never for known students"""
+        prefix, suffix = split_enrollment(enrollment)
+        with self.lock:
+            if (prefix not in self.closed or suffix <= self.last_hit[prefix]
+                    or self.occupancy.rank(enrollment) == RANK_KNOWN):
+                return False
+            self.skipped[prefix] += 1
+            return True
+            
+    def summary(self):
+        """End-of-run line, empty when nothing was skipped"""
+        with self.lock:
+            total = sum(self.skipped.values())
+            if not total:
+                return ""
+            return (f"Range discovery: {total} enrollment(s) skipped in {len(self.skipped)} branch(es) "
+                    f"after {self.max_misses} consecutive misses")
@@ -0,0 +1,180 @@
+"""
+GTU Results Scraper - job queue
+Several (exam, enrollments, output) jobs run back to back without anyone
+at the desk. Jobs are grouped by exam, and the sessions one job leaves on
+the results page carry on with the next job instead of loading it again.
+"""
+
+import os
+import csv
+import threading
+import collections
+from common import build_enrollments, is_enrollment, read_enrollment_list
+
+
+RESULT_TYPES = ["Regular", "Archive"]
+
+
+class ScrapeJob:
+    """One exam and the enrollments to scrape for it into one output file"""
+    
+    def __init__(self, exam_value, enrollments, output, result_type="Regular", name=""):
+        self.exam_value = exam_value
+        self.enrollments = list(enrollments)
+        self.output = output
+        self.result_type = result_type
+        self.name = name or exam_value
+        
+    @property
+    def key(self):
+        return self.result_type, self.exam_value
+        
+    @property
+    def job_params(self):
+        return {"result_type": self.result_type, "exam_value": self.exam_value}
+        
+    def describe(self):
+        return f"{self.name}: {len(self.enrollments)} students -> {self.output}"
+
+
+def read_job_file(path):
+    """Jobs from a CSV file with exam plus start/count or a list file per row, output and result_type optional
+    
+    List files are looked up next to the job file.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            row = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+            if not any(row.values()):
+                continue
+            exam = row.get("exam", "")
+            if not exam:
+                raise ValueError(f"{path}, line {line}: exam is missing")
+            if row.get("list"):
+                enrollments = read_enrollment_list(os.path.join(folder, row["list"]))
+            elif is_enrollment(row.get("start", "")):
+                enrollments = build_enrollments(row["start"], int(row.get("count") or 1))
+            else:
+                raise ValueError(f"{path}, line {line}: needs a 12-digit start or a list file")
+            result_type = row.get("result_type") or "Regular"
+            if result_type not in RESULT_TYPES:
+                raise ValueError(f"{path}, line {line}: result_type must be one of " + ", ".join(RESULT_TYPES))
+            jobs.append(ScrapeJob(exam, enrollments, row.get("output") or f"results_{exam}.xlsx", result_type))
+    return jobs
+
+
+def plan_jobs(jobs):
+    """Order jobs so each exam is selected once
+    
+    Exams keep the order they were first queued in; jobs of the same exam
+    writing the same output are merged into one run.
+    """
+    groups = collections.OrderedDict()  # (result_type, exam) -> {output: job}
+    for job in jobs:
+        outputs = groups.setdefault(job.key, collections.OrderedDict())
+        merged = outputs.get(job.output)
+        if merged is None:
+            outputs[job.output] = ScrapeJob(job.exam_value, job.enrollments, job.output, job.result_type, job.name)
+        else:
+            merged.enrollments = list(dict.fromkeys(merged.enrollments + job.enrollments))
+    return [job for outputs in groups.values() for job in outputs.values()]
+
+
+class JobQueue:
+    """Jobs waiting to be run, in the order they were added"""
+    
+    def __init__(self):
+        self.jobs = []
+        self.lock = threading.Lock()
+        
+    def __len__(self):
+        return len(self.jobs)
+        
+    def add(self, job):
+        with self.lock:
+            self.jobs.append(job)
+            
+    def extend(self, jobs):
+        with self.lock:
+            self.jobs.extend(jobs)
+            
+    def take(self):
+        """Remove every queued job and return them in run order"""
+        with self.lock:
+            jobs, self.jobs = self.jobs, []
+        return plan_jobs(jobs)
+        
+    def describe(self):
+        with self.lock:
+            exams = len({job.key for job in self.jobs})
+            students = sum(len(job.enrollments) for job in self.jobs)
+            return f"{len(self.jobs)} job(s), {exams} exam(s), {students} students"
+
+
+class SessionShelf:
+    """Sessions a finished job left on the results page, taken over by the next job
+    
+    A session is only re-pointed to another exam when none is left for the
+    same one, which is why jobs are grouped by exam.
+    """
+    
+    def __init__(self):
+        self.sessions = collections.defaultdict(list)  # result type -> sessions
+        self.lock = threading.Lock()
+        
+    def put(self, session):
+        with self.lock:
+            self.sessions[session.result_type].append(session)
+            
+    def take(self, result_type, exam_value):
+        """A shelved session for the exam, None when there is none to reuse"""
+        with self.lock:
+            shelved = self.sessions[result_type]
+            same = [session for session in shelved if session.exam_value == exam_value]
+            session = (same or shelved or [None])[0]
+            if session is None:
+                return None
+            shelved.remove(session)
+        if session.exam_value != exam_value:
+            try:
+                session.select_exam(exam_value)
+            except Exception:
+                session.quit()
+                return None
+        return session
+        
+    def factory(self, job, make_session):
+        """Session factory for a job's run: shelved sessions first, then make_session(worker_id)"""
+        def session_factory(worker_id):
+            return self.take(job.result_type, job.exam_value) or make_session(worker_id)
+        return session_factory
+        
+    def close(self):
+        with self.lock:
+            sessions = [session for shelved in self.sessions.values() for session in shelved]
+            self.sessions.clear()
+        for session in sessions:
+            session.quit()
+
+
+def run_jobs(jobs, run_job, on_log=None, stopped=None):
+    """Run planned jobs back to back, a failing job is logged and the next one starts
+    
+    Returns (job, error) for every job that failed.
+    """
+    on_log = on_log or (lambda message: None)
+    failed = []
+    for number, job in enumerate(jobs, start=1):
+        if stopped and stopped():
+            on_log(f"Stopped, {len(jobs) - number + 1} job(s) not started")
+            break
+        if len(jobs) > 1:
+            on_log(f"\n=== Job {number}/{len(jobs)}: {job.describe()} ===")
+        try:
+            run_job(job)
+        except Exception as e:
+            on_log(f"✗ Job {job.name} failed: {str(e)}")
+            failed.append((job, e))
+    return failed
@@ -0,0 +1,62 @@
+"""
+GTU Results Scraper - status log sink
+Log messages from any thread are buffered here and handed to the UI in
+batches, the widget keeps only the newest lines, and everything is also
+appended to a size-rotated file.
+"""
+
+import os
+import time
+import threading
+
+
+class LogSink:
+    """Thread-safe queue of log lines for the UI with a rotating file behind it"""
+    
+    def __init__(self, max_lines=2000, path=None, max_bytes=1024 * 1024, backups=3):
+        self.max_lines = max_lines
+        self.pending = []
+        self.lock = threading.Lock()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            
+    def write(self, message):
+        """Queue one message, cheap enough to call from worker threads"""
+        with self.lock:
+            self.pending.append(f"{message}")
+            
+    def drain(self):
+        """Take the messages queued since the last drain, at most max_lines of them for display"""
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if not batch:
+            return []
+        if self.path:
+            self._append(batch)
+        return batch[-self.max_lines:]
+        
+    def clear(self):
+        with self.lock:
+            self.pending = []
+        
+    def _append(self, batch):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        text = "".join(f"{stamp} {line}\n" for line in "\n".join(batch).split("\n") if line.strip())
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) + len(text) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(text)
+        except OSError:
+            # The on-screen log matters more than its copy on disk
+            pass
+            
+    def _rotate(self):
+        """status.log -> status.log.1 -> ... -> status.log.<backups>, the oldest is dropped"""
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        os.replace(self.path, f"{self.path}.1")
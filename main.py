@@ -6,26 +6,34 @@ Date: 28/01/2026
 
 import os
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import threading
-import pandas as pd
-from PIL import Image, ImageTk
+import queue
 import io
-import requests
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver import ChromeOptions
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import importlib
+from common import (
+    DATA_DIR, ENGINE_NAMES, DEFAULT_MAX_MISSES, CaptchaRequest, build_enrollments, exam_value_from_label,
+    read_enrollment_list
+)
+from catalogue import ExamCatalogue
+from store import JobJournal, ResultStore
+from logsink import LogSink
+from jobs import JobQueue, ScrapeJob, SessionShelf, read_job_file, run_jobs
+
+# The scraping stack (pandas, NumPy, Selenium, PIL) is imported on first use
+# and by prewarm() once the window is up, so the window appears at once.
+
+
+LOG_FLUSH_MS = 100  # worker messages reach the Status Log in batches this often
+PREWARM_DELAY_MS = 200  # let the window paint before the background imports start
+WEB_CONSOLE_PORT = 8800  # captchas are also served to operators on the LAN when "Share captchas" is on
 
 
 class GTUResultsScraperGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("GTU Results Scraper")
-        self.root.geometry("800x750")
+        self.root.geometry("800x825")
         self.root.resizable(False, False)
         
         # Variables
@@ -34,18 +42,42 @@ class GTUResultsScraperGUI:
         self.enrollment_var = tk.StringVar()
         self.num_students_var = tk.StringVar()
         self.filename_var = tk.StringVar(value="gtu_results.xlsx")
+        self.sessions_var = tk.StringVar(value="1")
+        self.prefetch_var = tk.StringVar(value="0")
+        self.engine_var = tk.StringVar(value="Browser")
         self.captcha_var = tk.StringVar()
+        self.autosolve_var = tk.BooleanVar(value=True)
+        self.lean_var = tk.BooleanVar(value=True)
+        self.share_var = tk.BooleanVar(value=False)
+        self.discover_var = tk.BooleanVar(value=False)
+        self.refresh_var = tk.BooleanVar(value=False)
         
         # Driver and state
         self.driver = None
+        self.driver_lean = None
+        self.driver_lock = threading.Lock()
         self.exam_options = []
         self.captcha_image_label = None
         self.is_scraping = False
         self.current_enrollment = ""
-        self.captcha_submitted = False
+        self.captcha_queue = queue.Queue()
+        self.active_captcha = None
+        self.scrape_run = None
+        self.web_console = None
+        self.job_queue = JobQueue()
+        self.closing = False
+        self.captcha_solver = None
+        self.solver_lock = threading.Lock()
+        self.exam_catalogue = ExamCatalogue(os.path.join(DATA_DIR, "exam_catalogue.json"))
+        self.job_journal = JobJournal(os.path.join(DATA_DIR, "jobs.sqlite3"))
+        self.result_store = ResultStore(os.path.join(DATA_DIR, "results.sqlite3"))
+        self.log_sink = LogSink(max_lines=2000, path=os.path.join(DATA_DIR, "logs", "status.log"))
         
         # Setup UI
         self.setup_ui()
+        self.root.after(0, self.offer_resume)
+        self.root.after(LOG_FLUSH_MS, self.flush_log)
+        self.root.after(PREWARM_DELAY_MS, self.prewarm)
         
     def setup_ui(self):
         """Setup the main UI components"""
@@ -146,6 +178,16 @@ class GTUResultsScraperGUI:
             bg_color=bg_color
         )
         
+        # Known students first, give up a branch after a run of empty numbers
+        tk.Checkbutton(
+            form_frame,
+            text="Skip empty ranges",
+            variable=self.discover_var,
+            font=("Segoe UI", 10),
+            bg=bg_color,
+            activebackground=bg_color
+        ).grid(row=3, column=2, padx=(10, 0), sticky="w")
+        
         # Output Filename
         self.create_field(
             form_frame, "Output Filename:", 4,
@@ -154,6 +196,61 @@ class GTUResultsScraperGUI:
             bg_color=bg_color
         )
         
+        # Scrape students again even if the result store has them, e.g. after rechecking
+        tk.Checkbutton(
+            form_frame,
+            text="Re-scrape stored results",
+            variable=self.refresh_var,
+            font=("Segoe UI", 10),
+            bg=bg_color,
+            activebackground=bg_color
+        ).grid(row=4, column=2, padx=(10, 0), sticky="w")
+        
+        # Parallel sessions
+        self.create_field(
+            form_frame, "Parallel Sessions:", 5,
+            widget_type="entry",
+            variable=self.sessions_var,
+            bg_color=bg_color
+        )
+        
+        # Extra sessions that keep captchas ready while others wait on the server
+        prefetch_frame = tk.Frame(form_frame, bg=bg_color)
+        prefetch_frame.grid(row=5, column=2, padx=(10, 0), sticky="w")
+        tk.Label(
+            prefetch_frame,
+            text="Captcha Prefetch:",
+            font=("Segoe UI", 10),
+            bg=bg_color
+        ).pack(side=tk.LEFT)
+        tk.Entry(
+            prefetch_frame,
+            textvariable=self.prefetch_var,
+            font=("Segoe UI", 10),
+            width=4,
+            relief=tk.SOLID,
+            borderwidth=1
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Scraping engine
+        self.create_field(
+            form_frame, "Engine:", 6,
+            widget_type="dropdown",
+            values=ENGINE_NAMES,
+            variable=self.engine_var,
+            bg_color=bg_color
+        )
+        
+        # Headless browsers that skip stylesheets, fonts and images other than the captcha
+        tk.Checkbutton(
+            form_frame,
+            text="Lean browser",
+            variable=self.lean_var,
+            font=("Segoe UI", 10),
+            bg=bg_color,
+            activebackground=bg_color
+        ).grid(row=6, column=2, padx=(10, 0), sticky="w")
+        
     def create_field(self, parent, label_text, row, widget_type="entry", 
                      values=None, variable=None, command=None, bg_color="#f0f4f8"):
         """Helper to create form fields"""
@@ -186,7 +283,7 @@ class GTUResultsScraperGUI:
                 relief=tk.SOLID,
                 borderwidth=1
             )
-        
+            
         widget.grid(row=row, column=1, sticky="w", pady=6, padx=(10, 0))
         return widget
         
@@ -245,6 +342,7 @@ class GTUResultsScraperGUI:
             borderwidth=1
         )
         self.captcha_entry.pack(side=tk.LEFT, padx=5)
+        self.captcha_entry.bind("<Return>", lambda e: self.submit_captcha())
         
         # Submit captcha button
         self.captcha_submit_btn = tk.Button(
@@ -262,6 +360,36 @@ class GTUResultsScraperGUI:
         )
         self.captcha_submit_btn.pack(side=tk.LEFT, padx=5)
         
+        # Number of captchas waiting behind the one shown
+        self.captcha_queue_label = tk.Label(
+            input_frame,
+            text="Queued: 0",
+            font=("Segoe UI", 9),
+            bg=bg_color,
+            fg="#64748b"
+        )
+        self.captcha_queue_label.pack(side=tk.LEFT, padx=5)
+        
+        # Offline solver, falls back to the operator when unsure
+        tk.Checkbutton(
+            input_frame,
+            text="Auto-solve",
+            variable=self.autosolve_var,
+            font=("Segoe UI", 9),
+            bg=bg_color,
+            activebackground=bg_color
+        ).pack(side=tk.LEFT, padx=5)
+        
+        # Lets more operators answer from their own browsers, the first answer wins
+        tk.Checkbutton(
+            input_frame,
+            text="Share on LAN",
+            variable=self.share_var,
+            font=("Segoe UI", 9),
+            bg=bg_color,
+            activebackground=bg_color
+        ).pack(side=tk.LEFT, padx=5)
+        
     def create_progress_section(self, parent, bg_color):
         """Create progress bar section"""
         progress_frame = tk.Frame(parent, bg=bg_color)
@@ -291,6 +419,15 @@ class GTUResultsScraperGUI:
         )
         self.progress_label.pack(anchor="w")
         
+        self.stats_label = tk.Label(
+            progress_frame,
+            text="No results yet",
+            font=("Segoe UI", 9),
+            bg=bg_color,
+            fg="#64748b"
+        )
+        self.stats_label.pack(anchor="w")
+        
         # Configure progress bar style
         style = ttk.Style()
         style.theme_use('clam')
@@ -304,8 +441,33 @@ class GTUResultsScraperGUI:
         
     def create_scrape_button(self, parent, button_color, button_hover):
         """Create the main scrape button"""
+        button_frame = tk.Frame(parent, bg=parent.cget("bg"))
+        button_frame.pack(pady=8)
+        
+        # Several exams and ranges, or enrollment list files, run back to back
+        tk.Button(
+            button_frame,
+            text="Add to Queue",
+            command=self.add_to_queue,
+            font=("Segoe UI", 10),
+            cursor="hand2",
+            relief=tk.FLAT,
+            padx=10,
+            pady=6
+        ).pack(side=tk.LEFT, padx=5)
+        tk.Button(
+            button_frame,
+            text="Load Job File...",
+            command=self.load_job_file,
+            font=("Segoe UI", 10),
+            cursor="hand2",
+            relief=tk.FLAT,
+            padx=10,
+            pady=6
+        ).pack(side=tk.LEFT, padx=5)
+        
         self.scrape_btn = tk.Button(
-            parent,
+            button_frame,
             text="Start Scraping",
             command=self.start_scraping,
             bg=button_color,
@@ -318,7 +480,16 @@ class GTUResultsScraperGUI:
             activebackground=button_hover,
             activeforeground="white"
         )
-        self.scrape_btn.pack(pady=8)
+        self.scrape_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.queue_label = tk.Label(
+            button_frame,
+            text="Queue: empty",
+            font=("Segoe UI", 9),
+            bg=parent.cget("bg"),
+            fg="#64748b"
+        )
+        self.queue_label.pack(side=tk.LEFT, padx=5)
         
         # Hover effects
         self.scrape_btn.bind("<Enter>", lambda e: self.scrape_btn.config(bg=button_hover))
@@ -348,10 +519,20 @@ class GTUResultsScraperGUI:
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
     def log(self, message):
-        """Add message to log area"""
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        """Add message to log area, safe to call from any thread"""
+        self.log_sink.write(message)
+        
+    def flush_log(self):
+        """Show the messages logged since the last call in one widget update"""
+        lines = self.log_sink.drain()
+        if lines:
+            self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+            # Keep only the newest lines in the widget
+            excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - self.log_sink.max_lines
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+            self.log_text.see(tk.END)
+        self.root.after(LOG_FLUSH_MS, self.flush_log)
         
     def on_result_type_change(self):
         """Handle result type dropdown change"""
@@ -359,51 +540,87 @@ class GTUResultsScraperGUI:
         self.exam_dropdown['values'] = []
         self.log(f"Result type changed to: {self.result_type_var.get()}")
         
+    def offer_resume(self):
+        """Offer to fill in the form for the most recent interrupted run"""
+        job = next((job for job in self.job_journal.unfinished_jobs() if self.form_can_resume(*job)), None)
+        if job is None:
+            return
+        params, output, done, total, enrollments = job
+        exam_value = params.get("exam_value", "")
+        result_type = params.get("result_type", "Regular")
+        
+        cached, _ = self.exam_catalogue.get(result_type)
+        exam_label = next((f"{text} ({value})" for value, text in cached if value == exam_value), exam_value)
+        if not messagebox.askyesno(
+            "Resume",
+            f"An interrupted run was found:\n\n{exam_label}\n{total} students from {enrollments[0]}, "
+            f"{done} done\nOutput: {output}\n\nFill in the form to resume it?"
+        ):
+            return
+        self.result_type_var.set(result_type)
+        self.exam_var.set(exam_label)
+        self.enrollment_var.set(enrollments[0])
+        self.num_students_var.set(str(total))
+        self.filename_var.set(output)
+        # max_misses is part of the job id, the run only resumes with the same setting
+        self.discover_var.set(bool(params.get("max_misses", 0)))
+        self.log(f"Form filled in to resume: {done} / {total} students already done")
+        
+    def form_can_resume(self, params, output, done, total, enrollments):
+        """True when filling in the form reproduces the interrupted job"""
+        if not enrollments or enrollments != build_enrollments(enrollments[0], total):
+            return False
+        # A --diff job writes a change set, a normal run would upsert full results into it
+        if params.get("baseline"):
+            return False
+        # The GUI only discovers ranges with the default number of misses
+        return params.get("max_misses", 0) in (0, DEFAULT_MAX_MISSES)
+        
     def load_exam_options(self):
-        """Load exam options from website"""
+        """Load exam options from the cache, refreshing it from the website when stale"""
+        result_type = self.result_type_var.get()
+        options, stale = self.exam_catalogue.get(result_type)
+        if options:
+            self.set_exam_options(options)
+            self.log(f"Loaded {len(options)} exam options (cached)")
+        if not stale:
+            return
         self.log("Loading exam options from website...")
-        threading.Thread(target=self._load_exam_options_thread, daemon=True).start()
+        threading.Thread(target=self._load_exam_options_thread, args=(result_type,), daemon=True).start()
+        
+    def set_exam_options(self, options):
+        """Fill the exam dropdown"""
+        self.exam_options = options
+        self.exam_dropdown.config(values=[f"{text} ({value})" for value, text in options])
         
-    def _load_exam_options_thread(self):
+    def _load_exam_options_thread(self, result_type):
         """Thread to load exam options"""
         try:
-            # Initialize driver if not exists
-            if not self.driver:
-                options = ChromeOptions()
-                options.add_argument("--window-size=960,1080")
-                options.add_argument("--window-position=-2000,0")  # Move window off-screen
-                options.add_argument("--disable-gpu")
-                self.driver = webdriver.Chrome(options=options)
+            # Navigate to appropriate URL and read the exam dropdown
+            session = self.create_session(result_type, primary=True)
+            session.start()
+            added = self.exam_catalogue.update(result_type, session.load_exams())
+            session.quit()
+            options, _ = self.exam_catalogue.get(result_type)
             
-            # Navigate to appropriate URL
-            if self.result_type_var.get() == "Archive":
-                self.driver.get("https://www.gturesults.in/Default.aspx?ext=archive")
-            else:
-                self.driver.get("https://www.gturesults.in/")
-            
-            # Wait for dropdown to load
-            wait = WebDriverWait(self.driver, 10)
-            exam_dropdown = wait.until(
-                EC.presence_of_element_located((By.ID, "ddlbatch"))
-            )
-            
-            # Get options
-            select = Select(exam_dropdown)
-            options = [(opt.get_attribute("value"), opt.text) for opt in select.options if opt.get_attribute("value")]
-            
-            self.exam_options = options
-            option_texts = [f"{text} ({value})" for value, text in options]
-            
-            # Update dropdown in main thread
-            self.root.after(0, lambda: self.exam_dropdown.config(values=option_texts))
-            self.root.after(0, lambda: self.log(f"Loaded {len(options)} exam options"))
+            # Update dropdown in main thread, unless the result type changed meanwhile
+            if self.result_type_var.get() == result_type:
+                self.root.after(0, lambda: self.set_exam_options(options))
+            self.root.after(0, lambda: self.log(f"Loaded {len(options)} exam options ({len(added)} new)"))
             
         except Exception as e:
-            self.root.after(0, lambda: self.log(f"Error loading exams: {str(e)}"))
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to load exam options: {str(e)}"))
+            err = str(e)
+            self.root.after(0, lambda err=err: self.log(f"Error loading exams: {err}"))
+            # A stale cached list is still usable, only interrupt when there is nothing to show
+            if not self.exam_catalogue.get(result_type)[0]:
+                self.root.after(0, lambda err=err: messagebox.showerror("Error", f"Failed to load exam options: {err}"))
             
     def validate_form(self):
         """Validate all form inputs"""
+        return self.validate_job() and self.validate_settings()
+        
+    def validate_job(self):
+        """Validate the exam, range and output file"""
         if not self.exam_var.get():
             messagebox.showerror("Validation Error", "Please select an exam")
             return False
@@ -421,16 +638,88 @@ class GTUResultsScraperGUI:
             messagebox.showerror("Validation Error", "Number of students must be a positive integer")
             return False
             
+        from writers import OUTPUT_EXTENSIONS
+        
         filename = self.filename_var.get().strip()
-        if not filename.endswith('.xlsx'):
-            messagebox.showerror("Validation Error", "Filename must end with .xlsx")
+        if not filename.lower().endswith(tuple(OUTPUT_EXTENSIONS)):
+            messagebox.showerror("Validation Error", "Filename must end with " + ", ".join(OUTPUT_EXTENSIONS))
+            return False
+        return True
+        
+    def validate_settings(self):
+        """Validate the session settings"""
+        try:
+            sessions = int(self.sessions_var.get())
+            if not 1 <= sessions <= 8:
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror("Validation Error", "Parallel sessions must be between 1 and 8")
+            return False
+            
+        try:
+            prefetch = int(self.prefetch_var.get())
+            if not 0 <= prefetch <= 4:
+                raise ValueError()
+        except ValueError:
+            messagebox.showerror("Validation Error", "Captcha prefetch must be between 0 and 4")
             return False
             
         return True
         
+    def form_job(self):
+        """The exam and range in the form as a job"""
+        selected = self.exam_var.get()
+        enrollments = build_enrollments(self.enrollment_var.get().strip(), int(self.num_students_var.get()))
+        return ScrapeJob(exam_value_from_label(selected), enrollments, self.filename_var.get().strip(),
+                         self.result_type_var.get(), name=selected)
+        
+    def add_to_queue(self):
+        """Queue the exam and range in the form, to run after the jobs already queued"""
+        if not self.validate_job():
+            return
+        job = self.form_job()
+        self.job_queue.add(job)
+        self.log(f"Queued {job.describe()}")
+        self.update_queue_label()
+        
+    def load_job_file(self):
+        """Queue jobs from a CSV job file, or an enrollment list for the exam selected in the form"""
+        path = filedialog.askopenfilename(
+            title="Job file or enrollment list",
+            filetypes=[("CSV and text files", "*.csv *.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8-sig") as f:
+                header = [cell.strip().lower() for cell in f.readline().split(",")]
+            if "exam" in header:
+                jobs = read_job_file(path)
+            elif not self.exam_var.get():
+                messagebox.showerror("Validation Error", "Please select an exam for the enrollment list")
+                return
+            else:
+                # A plain enrollment list goes to the exam and output file in the form
+                selected = self.exam_var.get()
+                jobs = [ScrapeJob(exam_value_from_label(selected), read_enrollment_list(path),
+                                  self.filename_var.get().strip(), self.result_type_var.get(), name=selected)]
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not read {os.path.basename(path)}: {str(e)}")
+            return
+        self.job_queue.extend(jobs)
+        for job in jobs:
+            self.log(f"Queued {job.describe()}")
+        self.update_queue_label()
+        
+    def update_queue_label(self):
+        self.queue_label.config(text=f"Queue: {self.job_queue.describe()}" if len(self.job_queue) else "Queue: empty")
+        
     def start_scraping(self):
-        """Start the scraping process"""
-        if not self.validate_form():
+        """Start the scraping process, the queued jobs if there are any, else the form"""
+        if len(self.job_queue):
+            if not self.validate_settings():
+                return
+        elif not self.validate_form():
             return
             
         if self.is_scraping:
@@ -440,137 +729,69 @@ class GTUResultsScraperGUI:
         self.is_scraping = True
         self.scrape_btn.config(state=tk.DISABLED, text="Scraping...")
         self.log_text.delete(1.0, tk.END)
+        self.log_sink.clear()
         self.log("Starting scraping process...")
         
+        jobs = self.job_queue.take() if len(self.job_queue) else [self.form_job()]
+        self.update_queue_label()
+        
         # Start scraping in separate thread
-        threading.Thread(target=self.scrape_results, daemon=True).start()
+        threading.Thread(target=self.scrape_results, args=(jobs,), daemon=True).start()
         
-    def scrape_results(self):
-        """Main scraping logic"""
+    def scrape_results(self, jobs):
+        """Main scraping logic, runs the jobs one after another"""
+        from scraper import ScrapeRun
+        
+        shelf = SessionShelf()
         try:
-            # Initialize driver if needed
-            if not self.driver:
-                self.root.after(0, lambda: self.log("Initializing browser..."))
-                options = ChromeOptions()
-                options.add_argument("--window-size=960,1080")
-                options.add_argument("--window-position=-2000,0")  # Move window off-screen
-                options.add_argument("--disable-gpu")
-                self.driver = webdriver.Chrome(options=options)
-                
-                # Navigate and select exam
-                if self.result_type_var.get() == "Archive":
-                    self.driver.get("https://www.gturesults.in/Default.aspx?ext=archive")
-                else:
-                    self.driver.get("https://www.gturesults.in/")
-            
-            # Select exam
-            exam_selection = self.driver.find_element(By.ID, "ddlbatch")
-            dropdown = Select(exam_selection)
-            
-            # Extract value from selected option
-            selected = self.exam_var.get()
-            exam_value = selected.split("(")[-1].rstrip(")")
-            dropdown.select_by_value(exam_value)
-            
-            self.root.after(0, lambda: self.log(f"Selected exam: {selected}"))
-            
-            # Parse enrollment number
-            enrollment_start = self.enrollment_var.get()
-            num_students = int(self.num_students_var.get())
+            num_sessions = int(self.sessions_var.get())
+            prefetch = int(self.prefetch_var.get())
+            max_misses = DEFAULT_MAX_MISSES if self.discover_var.get() else 0
+            skip_known = not self.refresh_var.get()
             
-            # Calculate enrollment range
-            fixed_part = enrollment_start[:9]  # First 9 digits
-            start_num = int(enrollment_start[9:])  # Last 3 digits
-            end_num = start_num + num_students - 1
-            
-            # Setup progress
-            total = num_students
-            self.root.after(0, lambda: self.progress_bar.config(maximum=total))
-            
-            # Scraping loop
-            for i, enroll_num in enumerate(range(start_num, end_num + 1)):
-                # Build enrollment number
-                build_enroll = fixed_part + str(enroll_num).zfill(3)
-                self.current_enrollment = build_enroll
-                
-                self.root.after(0, lambda e=build_enroll, idx=i+1, tot=total: self.log(f"\n[{idx}/{tot}] Processing enrollment: {e}"))
-                
-                # Fill enrollment number
-                enroll_no = self.driver.find_element(By.ID, "txtenroll")
-                enroll_no.clear()
-                enroll_no.send_keys(build_enroll)
-                
-                # Fill password
-                ps = self.driver.find_element(By.ID, "txtpassword")
-                ps.clear()
-                ps.send_keys("123456789")
+            engine = self.engine_var.get()
+            self.root.after(0, lambda: self.log(f"Engine: {engine}"))
+            if self.share_var.get():
+                from captcha_console import WebCaptchaConsole
+                self.web_console = WebCaptchaConsole("0.0.0.0", WEB_CONSOLE_PORT)
+                self.log(f"Captchas are also served at {self.web_console.url}")
                 
-                # Get and display captcha
-                self.captcha_submitted = False
-                self.root.after(0, self.display_captcha)
-                
-                # Wait for captcha submission
-                while not self.captcha_submitted:
-                    threading.Event().wait(0.1)
-                
-                # Submit form
-                btn = self.driver.find_element(By.ID, "btnSearch")
-                btn.send_keys(Keys.ENTER)
-                
-                # Wait for results
+            def run_job(job):
+                self.log(f"Selected exam: {job.name}")
+                # Only the first job may use the window's own browser, later ones take over its session
+                primary = job is jobs[0]
+                self.scrape_run = ScrapeRun(
+                    shelf.factory(job, lambda worker_id: self.create_session(
+                        job.result_type, job.exam_value, primary=primary and worker_id == 0)),
+                    job.enrollments, job.output, self.request_captcha,
+                    workers=num_sessions,
+                    prefetch=prefetch,
+                    solver=self.get_captcha_solver(),
+                    auto_solve=self.autosolve_var.get(),
+                    on_log=self.log,
+                    on_progress=lambda p, t, e: self.root.after(0, lambda: self.update_progress(p, t, e)),
+                    journal=self.job_journal,
+                    result_store=self.result_store,
+                    skip_known=skip_known,
+                    release_session=shelf.put,
+                    max_misses=max_misses,
+                    job_params=job.job_params
+                )
+                # Setup progress, a resumed job only has its remaining enrollments left
+                total = len(self.scrape_run.enrollments)
+                self.root.after(0, lambda: self.progress_bar.config(maximum=total))
                 try:
-                    wait = WebDriverWait(self.driver, 15)
-                    wait.until(
-                        EC.any_of(
-                            EC.presence_of_element_located((By.ID, "lblCGPA")),
-                            EC.presence_of_element_located((By.ID, "lblmsg"))
-                        )
-                    )
-                except Exception:
-                    self.root.after(0, lambda e=build_enroll: self.log(f"Timeout for {e}"))
-                    continue
-                
-                # Check for errors
-                if self.driver.find_elements(By.ID, "lblmsg"):
-                    msg = self.driver.find_element(By.ID, "lblmsg").text.strip()
-                    if "Data not available" in msg or "Incorrect captcha" in msg:
-                        self.root.after(0, lambda e=build_enroll, m=msg: self.log(f"Error for {e}: {m}"))
-                        continue
-                
-                # Scrape data
-                try:
-                    name = self.driver.find_element(By.ID, "lblName").text.strip()
-                    enrollment_number = self.driver.find_element(By.ID, "lblExam").text.strip()
-                    current_sem_back = self.driver.find_element(By.ID, "lblCUPBack").text.strip()
-                    total_back = self.driver.find_element(By.ID, "lblTotalBack").text.strip()
-                    try:
-                        spi = self.driver.find_element(By.ID, "lblSPI").text.strip()
-                    except:
-                        spi = "0"
-                    try:
-                        cpi = self.driver.find_element(By.ID, "lblCPI").text.strip()
-                    except:
-                        cpi = "0"
-                    try:
-                        cgpa = self.driver.find_element(By.ID, "lblCGPA").text.strip()
-                    except:
-                        cgpa = "0"
-                    
-                    # Save to Excel
-                    self.save_to_excel(name, enrollment_number, current_sem_back, 
-                                     total_back, spi, cpi, cgpa)
-                    
-                    self.root.after(0, lambda n=name, e=enrollment_number: self.log(f"✓ Saved to Excel: {n} ({e})"))
+                    self.scrape_run.run()
+                finally:
+                    self.scrape_run = None
                     
-                except Exception as e:
-                    self.root.after(0, lambda err=str(e): self.log(f"Error scraping data: {err}"))
-                
-                # Update progress
-                progress = i + 1
-                self.root.after(0, lambda p=progress, t=total, e=build_enroll: self.update_progress(p, t, e))
-            
-            # Add summary
-            self.add_summary()
+            failed = run_jobs(jobs, run_job, on_log=self.log, stopped=lambda: self.closing)
+            if self.web_console and self.web_console.summary():
+                self.log(self.web_console.summary())
+            if failed:
+                message = f"{len(failed)} of {len(jobs)} job(s) failed, see the Status Log"
+                self.root.after(0, lambda: messagebox.showerror("Error", message))
+                return
             
             self.root.after(0, lambda: self.log("\n✓ Scraping completed successfully!"))
             self.root.after(0, lambda: messagebox.showinfo("Success", "Scraping completed!"))
@@ -580,10 +801,120 @@ class GTUResultsScraperGUI:
             self.root.after(0, lambda err=str(e): messagebox.showerror("Error", f"Scraping failed: {err}"))
             
         finally:
+            self.scrape_run = None
+            shelf.close()
+            if self.web_console:
+                self.web_console.close()
+                self.web_console = None
             self.is_scraping = False
             self.root.after(0, lambda: self.scrape_btn.config(state=tk.NORMAL, text="Start Scraping"))
             self.root.after(0, self.reset_form)
-    
+            
+    def prewarm(self):
+        """Load the scraping stack and start the browser in the background while the form is filled in"""
+        threading.Thread(target=self._prewarm_thread, args=(self.engine_var.get(), self.lean_var.get()),
+                         daemon=True).start()
+        
+    def _prewarm_thread(self, engine, lean):
+        """Thread to import the heavy modules and open the primary browser"""
+        try:
+            # Loaded only so later imports are instant
+            importlib.import_module("scraper")
+            importlib.import_module("PIL.ImageTk")
+            self.get_captcha_solver()
+            if engine == "Browser" and not self.is_scraping:
+                self.primary_driver(lean)
+                self.log("Browser ready")
+        except Exception as e:
+            # Not fatal, the browser is started again when it is needed
+            self.log(f"Browser pre-start failed: {str(e)}")
+            
+    def get_captcha_solver(self):
+        """The offline captcha solver, loaded on first use"""
+        with self.solver_lock:
+            if self.captcha_solver is None:
+                from captcha_solver import CaptchaSolver
+                self.captcha_solver = CaptchaSolver(os.path.join(DATA_DIR, "captcha_templates.npz"))
+            return self.captcha_solver
+            
+    def primary_driver(self, lean):
+        """The browser that stays open between runs and is reused, (re)started when needed"""
+        from scraper import chrome_options, start_chrome, driver_alive
+        
+        with self.driver_lock:
+            if self.driver and (not driver_alive(self.driver) or self.driver_lean != lean):
+                # The browser crashed, was closed or was started with the other profile
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+                self.driver = None
+            if not self.driver:
+                self.driver = start_chrome(chrome_options(lean=lean))
+                self.driver_lean = lean
+            return self.driver
+            
+    def create_session(self, result_type, exam_value=None, primary=False):
+        """Create a session for the selected engine"""
+        from scraper import ENGINES, SeleniumSession
+        
+        engine = ENGINES[self.engine_var.get()]
+        lean = self.lean_var.get()
+        if engine is SeleniumSession and primary:
+            return SeleniumSession(result_type, exam_value, driver=self.primary_driver(lean), lean=lean)
+        if engine is SeleniumSession:
+            return SeleniumSession(result_type, exam_value, lean=lean)
+        return engine(result_type, exam_value)
+        
+    def request_captcha(self, enrollment, captcha_png):
+        """Queue a captcha for the operator and wait for the answer (worker threads)"""
+        request = CaptchaRequest(enrollment, captcha_png)
+        self.captcha_queue.put(request)
+        self.root.after(0, self.show_next_captcha)
+        
+        def stopped():
+            return self.scrape_run is None or self.scrape_run.stop_event.is_set()
+            
+        console = self.web_console
+        if console:
+            # Whoever answers first, here or on the web page, wins
+            console.publish(request)
+            try:
+                return console.wait(request, stopped)
+            finally:
+                self.root.after(0, self.show_next_captcha)
+                
+        # Wait for captcha submission
+        while not request.event.wait(0.1):
+            if stopped():
+                return None
+        return request.answer
+        
+    def show_next_captcha(self):
+        """Show the next queued captcha if none is waiting for input"""
+        if self.active_captcha and self.active_captcha.event.is_set():
+            # Answered on the web page or expired
+            self.active_captcha = None
+            self.captcha_image_label.config(image="", text="Captcha will appear here")
+            self.captcha_image_label.image = None
+            self.captcha_submit_btn.config(state=tk.DISABLED)
+        self.captcha_queue_label.config(text=f"Queued: {self.captcha_queue.qsize()}")
+        if self.active_captcha:
+            return
+        while not self.active_captcha and not self.captcha_queue.empty():
+            request = self.captcha_queue.get_nowait()
+            if not request.event.is_set():
+                self.active_captcha = request
+        if not self.active_captcha:
+            return
+        self.captcha_queue_label.config(text=f"Queued: {self.captcha_queue.qsize()}")
+        self.current_enrollment = self.active_captcha.enrollment
+        if self.scrape_run:
+            with self.scrape_run.telemetry.phase("captcha_display"):
+                self.display_captcha(self.active_captcha.image)
+        else:
+            self.display_captcha(self.active_captcha.image)
+        
     def reset_form(self):
         """Reset all form fields after scraping completes"""
         # Clear input fields
@@ -600,37 +931,23 @@ class GTUResultsScraperGUI:
         # Reset progress
         self.progress_bar['value'] = 0
         self.progress_label.config(text="0 / 0 students processed | Current: None")
+        self.stats_label.config(text="No results yet")
         self.current_enrollment = ""
+        self.active_captcha = None
+        self.captcha_queue = queue.Queue()
+        self.captcha_queue_label.config(text="Queued: 0")
         
         self.log("\n--- Form reset. Ready for new scraping session ---\n")
-            
-    def display_captcha(self):
-        """Display captcha image from website using base64 extraction"""
+        
+    def display_captcha(self, captcha_bytes):
+        """Display captcha image exported by a browser session"""
+        from PIL import Image, ImageTk
+        
         try:
             self.captcha_submit_btn.config(state=tk.NORMAL)
             self.captcha_var.set("")
             self.captcha_entry.focus()
             
-            # Get captcha image element
-            captcha_element = self.driver.find_element(By.ID, "imgCaptcha")
-            
-            # Extract Base64 directly from the browser using JavaScript
-            import base64
-            
-            # Execute JavaScript to convert image to base64
-            base64_data = self.driver.execute_script("""
-                const img = arguments[0];
-                const canvas = document.createElement('canvas');
-                canvas.width = img.naturalWidth;
-                canvas.height = img.naturalHeight;
-                const ctx = canvas.getContext('2d');
-                ctx.drawImage(img, 0, 0);
-                return canvas.toDataURL('image/png').split(',')[1];
-            """, captcha_element)
-            
-            # Decode base64 to bytes
-            captcha_bytes = base64.b64decode(base64_data)
-            
             # Open image from bytes
             image = Image.open(io.BytesIO(captcha_bytes))
             
@@ -662,110 +979,38 @@ class GTUResultsScraperGUI:
             messagebox.showwarning("Warning", "Please enter captcha")
             return
             
-        try:
-            captcha_field = self.driver.find_element(By.ID, "CodeNumberTextBox")
-            captcha_field.clear()
-            captcha_field.send_keys(captcha_value)
+        request, self.active_captcha = self.active_captcha, None
+        if request is None:
+            return
             
-            self.captcha_submitted = True
-            self.captcha_submit_btn.config(state=tk.DISABLED)
+        self.captcha_submit_btn.config(state=tk.DISABLED)
+        if request.resolve(captcha_value):
             self.log(f"Captcha submitted: {captcha_value}")
-            
-        except Exception as e:
-            self.log(f"Error submitting captcha: {str(e)}")
-            
-    def save_to_excel(self, name, enrollment_number, current_sem_back, 
-                     total_back, spi, cpi, cgpa):
-        """Save result data to Excel file"""
-        file_path = self.filename_var.get()
-        
-        if not os.path.exists(file_path):
-            result_data = {
-                'Name': [name],
-                'Enrollment_No': [str(enrollment_number)],
-                'Current_Sem_Back': [current_sem_back],
-                'Total_Back': [total_back],
-                'SPI': [spi],
-                'CPI': [cpi],
-                'CGPA': [cgpa]
-            }
-            data = pd.DataFrame(result_data)
         else:
-            data = pd.read_excel(file_path)
-            data["Enrollment_No"] = data["Enrollment_No"].astype(str)
-            result_data = {
-                'Name': name,
-                'Enrollment_No': str(enrollment_number),
-                'Current_Sem_Back': current_sem_back,
-                'Total_Back': total_back,
-                'SPI': spi,
-                'CPI': cpi,
-                'CGPA': cgpa
-            }
-            data.loc[len(data)] = result_data
-            
-        data.to_excel(file_path, index=False)
-        
-    def add_summary(self):
-        """Add summary statistics to Excel"""
-        file_path = self.filename_var.get()
-        if os.path.exists(file_path):
-            df = pd.read_excel(file_path, dtype={"Enrollment_No": str})
-            for col in ["SPI", "CPI", "CGPA", "Current_Sem_Back", "Total_Back"]:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-            
-            summary_rows = [
-                {
-                    'Name': "MAX",
-                    'Enrollment_No': " - ",
-                    'Current_Sem_Back': df["Current_Sem_Back"].max(),
-                    'Total_Back': df["Total_Back"].max(),
-                    'SPI': df["SPI"].max(),
-                    'CPI': df["CPI"].max(),
-                    'CGPA': df["CGPA"].max()
-                },
-                {
-                    'Name': "MIN",
-                    'Enrollment_No': " - ",
-                    'Current_Sem_Back': df["Current_Sem_Back"].min(),
-                    'Total_Back': df["Total_Back"].min(),
-                    'SPI': df["SPI"].min(),
-                    'CPI': df["CPI"].min(),
-                    'CGPA': df["CGPA"].min()
-                },
-                {
-                    'Name': "AVG",
-                    'Enrollment_No': " - ",
-                    'Current_Sem_Back': round(df["Current_Sem_Back"].mean(), 2),
-                    'Total_Back': round(df["Total_Back"].mean(), 2),
-                    'SPI': round(df["SPI"].mean(), 2),
-                    'CPI': round(df["CPI"].mean(), 2),
-                    'CGPA': round(df["CGPA"].mean(), 2)
-                },
-                {
-                    'Name': "Total Failed Students",
-                    'Enrollment_No': " - ",
-                    'Current_Sem_Back': df[df["Current_Sem_Back"] > 0].shape[0],
-                    'Total_Back': 0,
-                    'SPI': 0,
-                    'CPI': 0,
-                    'CGPA': 0
-                }
-            ]
-            
-            for row in summary_rows:
-                df.loc[len(df)] = row
-            
-            df.to_excel(file_path, index=False)
-            self.log("Summary statistics added to Excel")
-            
+            self.log(f"Captcha for {request.enrollment} was already answered")
+        
+        # With prefetch sessions the next captcha is already waiting
+        self.show_next_captcha()
+        
     def update_progress(self, current, total, enrollment="None"):
         """Update progress bar"""
         self.progress_bar['value'] = current
-        self.progress_label.config(text=f"{current} / {total} students processed | Current: {enrollment}")
+        text = f"{current} / {total} students processed"
+        if self.scrape_run:
+            telemetry = self.scrape_run.telemetry
+            eta = telemetry.eta(total - current)
+            text += f" | {telemetry.rate_per_min():.1f}/min | {self.scrape_run.pool.limiter.describe()}"
+            if eta is not None and current < total:
+                from telemetry import format_duration
+                text += f" | ETA {format_duration(eta)}"
+            self.stats_label.config(text=self.scrape_run.stats.describe())
+        self.progress_label.config(text=f"{text} | Current: {enrollment}")
         
     def on_closing(self):
         """Handle window closing"""
+        self.closing = True
+        if self.scrape_run:
+            self.scrape_run.stop()
         if self.driver:
             self.driver.quit()
         self.root.destroy()
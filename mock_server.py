@@ -0,0 +1,290 @@
+"""
+GTU Results Scraper - local stand-in for the GTU results site
+Mimics Default.aspx closely enough to run the scraping engines and benchmarks offline.
+"""
+
+import io
+import hashlib
+import random
+import secrets
+import string
+import threading
+import time
+import zlib
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from PIL import Image, ImageDraw
+
+
+CAPTCHA_ALPHABET = string.ascii_uppercase + string.digits
+DEFAULT_EXAMS = [
+    ("5001", "BE SEM 5 - Regular (DEC 2025)"),
+    ("5002", "BE SEM 3 - Regular (DEC 2025)"),
+    ("4990", "BE SEM 4 - Remedial (JUL 2025)"),
+]
+SUBJECTS = [
+    ("3150703", "Analysis and Design of Algorithms"),
+    ("3150709", "Professional Ethics"),
+    ("3150710", "Computer Networks"),
+    ("3150711", "Software Engineering"),
+    ("3150713", "Python for Data Science"),
+]
+GRADES = ["AA", "AB", "BB", "BC", "CC", "CD", "DD", "FF"]
+GRADE_POINTS = {"AA": 10, "AB": 9, "BB": 8, "BC": 7, "CC": 6, "CD": 5, "DD": 4, "FF": 0}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><title>GTU Results</title>
+<link rel="stylesheet" href="/static/site.css"></head>
+<body>
+<form method="post" action="{action}" id="form1">
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />
+<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="CA0B0334" />
+<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="{validation}" />
+<select name="ddlbatch" id="ddlbatch">
+<option value="">-- Select Exam --</option>
+{options}
+</select>
+<input name="txtenroll" type="text" id="txtenroll" value="" />
+<input name="txtpassword" type="password" id="txtpassword" value="" />
+<img id="imgCaptcha" src="CaptchaImage.aspx?guid={guid}" alt="captcha" />
+<input name="CodeNumberTextBox" type="text" id="CodeNumberTextBox" value="" />
+<input type="submit" name="btnSearch" value="Search" id="btnSearch" />
+</form>
+{result}
+</body></html>
+"""
+
+
+def student_record(exam, enrollment):
+    """Deterministic fake result for an enrollment"""
+    rng = random.Random(zlib.crc32(f"{exam}:{enrollment}".encode()))
+    grades = [rng.choices(GRADES, weights=[2, 4, 6, 6, 5, 3, 2, 2])[0] for _ in SUBJECTS]
+    spi = round(sum(GRADE_POINTS[g] for g in grades) / len(grades), 2)
+    current_back = sum(1 for g in grades if g == "FF")
+    return {
+        "lblName": f"STUDENT {enrollment[-3:]} {rng.choice(['PATEL', 'SHAH', 'MEHTA', 'DESAI', 'JOSHI'])}",
+        "lblExam": enrollment,
+        "lblCUPBack": str(current_back),
+        "lblTotalBack": str(current_back + rng.choice([0, 0, 0, 1, 2])),
+        "lblSPI": f"{spi:.2f}",
+        "lblCPI": f"{min(10, max(0, spi + rng.uniform(-0.8, 0.8))):.2f}",
+        "lblCGPA": f"{min(10, max(0, spi + rng.uniform(-0.6, 0.6))):.2f}",
+        "subjects": list(zip(SUBJECTS, grades)),
+    }
+
+
+def render_captcha(text):
+    """Draw captcha text on a small noisy 120x40 PNG"""
+    image = Image.new("RGB", (120, 40), "white")
+    draw = ImageDraw.Draw(image)
+    rng = random.Random(text)
+    for _ in range(60):
+        x, y = rng.randrange(120), rng.randrange(40)
+        draw.point((x, y), fill=(180, 180, 180))
+    for i, ch in enumerate(text):
+        draw.text((14 + i * 20, 14 + rng.randint(-3, 3)), ch, fill=(20, 20, 90))
+    out = io.BytesIO()
+    image.save(out, "PNG")
+    return out.getvalue()
+
+
+class MockResultsServer:
+    """Threaded HTTP server imitating the results portal"""
+    
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 missing_rate=0.0, captcha_mode="check", exams=None, seed=None, capacity=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.missing_rate = missing_rate
+        self.capacity = capacity  # concurrent posts served at full speed, None for unlimited
+        self.active_posts = 0
+        self.captcha_mode = captcha_mode
+        self.exams = exams or DEFAULT_EXAMS
+        self.rng = random.Random(seed)
+        self.sessions = {}
+        self.issued = {}  # sha1 of every captcha image served -> its text
+        self.lock = threading.Lock()
+        self.stats = {"pages": 0, "captchas": 0, "posts": 0, "errors": 0, "throttled": 0}
+        
+        handler = type("Handler", (MockHandler,), {"mock": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+        
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+        
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+        
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        
+    def is_missing(self, exam, enrollment):
+        """Stable "Data not available" gaps"""
+        return zlib.crc32(f"gap:{exam}:{enrollment}".encode()) % 10000 < self.missing_rate * 10000
+        
+    def delay(self, overload=0):
+        """Sleep like a page render, each post over capacity makes it slower like a busy server"""
+        if self.latency or self.jitter:
+            time.sleep(self.latency * (1 + 4 * overload) + self.rng.uniform(0, self.jitter))
+            
+    def answer_for(self, captcha_png):
+        """Text of a captcha image this server served, for scripted operators"""
+        with self.lock:
+            return self.issued.get(hashlib.sha1(captcha_png).hexdigest())
+            
+    def session(self, sid):
+        with self.lock:
+            return self.sessions.setdefault(sid, {"captcha": None, "viewstate": None})
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    mock = None
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+        
+    def _session_id(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        if "ASP.NET_SessionId" in cookie:
+            return cookie["ASP.NET_SessionId"].value, False
+        return secrets.token_hex(12), True
+        
+    def _send(self, status, body, content_type="text/html; charset=utf-8", sid=None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if sid:
+            self.send_header("Set-Cookie", f"ASP.NET_SessionId={sid}; path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(body)
+        
+    def _page(self, sid, result_html="", selected=""):
+        session = self.mock.session(sid)
+        session["viewstate"] = secrets.token_urlsafe(24)
+        options = "\n".join(
+            '<option{} value="{}">{}</option>'.format(
+                ' selected="selected"' if value == selected else "", value, escape(text)
+            )
+            for value, text in self.mock.exams
+        )
+        action = "./Default.aspx" + ("?ext=archive" if "archive" in self.path else "")
+        return PAGE_TEMPLATE.format(
+            action=action, viewstate=session["viewstate"], validation=secrets.token_urlsafe(16),
+            options=options, guid=secrets.token_hex(8), result=result_html
+        )
+        
+    def do_GET(self):
+        sid, new = self._session_id()
+        path = urlparse(self.path).path
+        if path.startswith("/static/"):
+            self._send(200, "body{font-family:sans-serif}", "text/css")
+        elif path.endswith("CaptchaImage.aspx"):
+            text = "".join(self.mock.rng.choice(CAPTCHA_ALPHABET) for _ in range(5))
+            image = render_captcha(text)
+            self.mock.session(sid)["captcha"] = text
+            with self.mock.lock:
+                self.mock.issued[hashlib.sha1(image).hexdigest()] = text
+            self.mock.stats["captchas"] += 1
+            self._send(200, image, "image/png", sid if new else None)
+        elif path in ("/", "/Default.aspx"):
+            self.mock.delay()
+            self.mock.stats["pages"] += 1
+            self._send(200, self._page(sid), sid=sid if new else None)
+        else:
+            self._send(404, "Not found")
+            
+    def do_POST(self):
+        sid, new = self._session_id()
+        length = int(self.headers.get("Content-Length", 0))
+        form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        with self.mock.lock:
+            self.mock.stats["posts"] += 1
+            self.mock.active_posts += 1
+            overload = max(0, self.mock.active_posts - self.mock.capacity) if self.mock.capacity else 0
+        try:
+            self.mock.delay(overload)
+        finally:
+            with self.mock.lock:
+                self.mock.active_posts -= 1
+                
+        if self.mock.capacity and overload > self.mock.capacity:
+            # Far over capacity the real site starts refusing requests
+            self.mock.stats["throttled"] += 1
+            self._send(503, "Service Unavailable")
+            return
+        if self.mock.rng.random() < self.mock.error_rate:
+            self.mock.stats["errors"] += 1
+            self._send(503, "Service Unavailable")
+            return
+            
+        session = self.mock.session(sid)
+        exam = form.get("ddlbatch", "")
+        enrollment = form.get("txtenroll", "")
+        answer = form.get("CodeNumberTextBox", "")
+        expected, session["captcha"] = session["captcha"], None
+        
+        if new or form.get("__VIEWSTATE") != session["viewstate"]:
+            result = '<span id="lblmsg">Session expired, please try again.</span>'
+        elif self.mock.captcha_mode == "check" and (not expected or answer.upper() != expected):
+            result = '<span id="lblmsg">Incorrect captcha code, please try again.</span>'
+        elif not answer:
+            result = '<span id="lblmsg">Incorrect captcha code, please try again.</span>'
+        elif exam not in dict(self.mock.exams) or self.mock.is_missing(exam, enrollment):
+            result = '<span id="lblmsg">Data not available for this enrollment.</span>'
+        else:
+            record = student_record(exam, enrollment)
+            rows = "\n".join(
+                f"<tr><td>{code}</td><td>{escape(name)}</td><td>{grade}</td></tr>"
+                for (code, name), grade in record["subjects"]
+            )
+            labels = "\n".join(
+                f'<span id="{label}">{escape(value)}</span>'
+                for label, value in record.items() if label.startswith("lbl")
+            )
+            result = (
+                f'<div class="result">{labels}\n'
+                f'<table id="grdvSubject"><tr><th>Subject Code</th><th>Subject Name</th><th>Grade</th></tr>\n'
+                f"{rows}\n</table></div>"
+            )
+        self._send(200, self._page(sid, result, selected=exam), sid=sid if new else None)
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Local stand-in for the GTU results site")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="base seconds added to each page")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds per page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of posts answered with 503")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="fraction of enrollments without data")
+    parser.add_argument("--captcha", choices=["check", "any"], default="check")
+    parser.add_argument("--capacity", type=int, help="concurrent posts served at full speed, slower beyond that")
+    args = parser.parse_args()
+    
+    server = MockResultsServer(
+        port=args.port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        missing_rate=args.missing_rate, captcha_mode=args.captcha, capacity=args.capacity
+    )
+    print(f"Mock GTU results server on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+GTU Results Scraper - result page parsing
+Reads the ASP.NET results page (form state, exam list, result labels) from HTML.
+"""
+
+from html.parser import HTMLParser
+try:
+    import lxml.html
+except ImportError:  # optional, falls back to html.parser
+    lxml = None
+
+
+# Outcome of a single enrollment
+STATUS_OK = "ok"
+STATUS_NOT_AVAILABLE = "not_available"
+STATUS_INCORRECT_CAPTCHA = "incorrect_captcha"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+STATUS_PAGE = "page"  # result page snapshot waiting to be parsed
+STATUS_SKIPPED = "skipped"  # never asked, range discovery found the rest of its branch empty
+
+# Result labels on the results page and the output column they fill
+RESULT_LABELS = {
+    "Name": "lblName",
+    "Enrollment_No": "lblExam",
+    "Current_Sem_Back": "lblCUPBack",
+    "Total_Back": "lblTotalBack",
+    "SPI": "lblSPI",
+    "CPI": "lblCPI",
+    "CGPA": "lblCGPA",
+}
+OPTIONAL_LABELS = ("SPI", "CPI", "CGPA")
+
+TEXT_TAGS = ("span", "label", "div", "td", "a", "b", "font")
+
+
+class ResultsPage(HTMLParser):
+    """Form fields, exam options, element text and tables of one results page"""
+    
+    def __init__(self, html):
+        super().__init__(convert_charrefs=True)
+        self.form_action = None
+        self.hidden = {}
+        self.inputs = {}
+        self.exams = []
+        self.images = {}
+        self.labels = {}
+        self.tables = []
+        self._tables = []
+        self._cell = None
+        self._open = []
+        self._select = None
+        self._option = None
+        self.feed(html)
+        self.close()
+        
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        element_id = attrs.get("id")
+        self._table_start(tag)
+        
+        if tag == "form" and self.form_action is None:
+            self.form_action = attrs.get("action", "")
+        elif tag == "input":
+            name = attrs.get("name")
+            if not name:
+                return
+            if attrs.get("type", "text").lower() == "hidden":
+                self.hidden[name] = attrs.get("value", "")
+            else:
+                self.inputs[name] = attrs.get("value", "")
+        elif tag == "select":
+            self._select = element_id or attrs.get("name")
+        elif tag == "option" and self._select == "ddlbatch":
+            self._option = [attrs.get("value", ""), ""]
+        elif tag == "img" and element_id:
+            self.images[element_id] = attrs.get("src", "")
+        elif tag in TEXT_TAGS and element_id:
+            self.labels[element_id] = ""
+            self._open.append((tag, element_id))
+            
+    def handle_endtag(self, tag):
+        self._table_end(tag)
+        if tag == "select":
+            self._select = None
+        elif tag == "option" and self._option is not None:
+            value, text = self._option
+            if value:
+                self.exams.append((value, text.strip()))
+            self._option = None
+        elif any(open_tag == tag for open_tag, _ in self._open):
+            # Also close anything left unclosed inside this element
+            while self._open:
+                open_tag, element_id = self._open.pop()
+                self.labels[element_id] = self.labels[element_id].strip()
+                if open_tag == tag:
+                    break
+                    
+    def handle_data(self, data):
+        if self._option is not None:
+            self._option[1] += data
+        for _, element_id in self._open:
+            self.labels[element_id] += data
+        if self._cell is not None:
+            self._cell[-1] += data
+            
+    def _table_start(self, tag):
+        if tag == "table":
+            self._tables.append([])
+        elif not self._tables:
+            return
+        elif tag == "tr":
+            self._tables[-1].append([])
+        elif tag in ("td", "th") and self._tables[-1]:
+            self._cell = self._tables[-1][-1]
+            self._cell.append("")
+            
+    def _table_end(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            self._cell[-1] = self._cell[-1].strip()
+            self._cell = None
+        elif tag == "table" and self._tables:
+            self.tables.append(self._tables.pop())
+            self._cell = None
+
+
+def result_from_labels(labels):
+    """Classify a submitted page from its label texts, return (status, row or message)"""
+    msg = labels.get("lblmsg", "")
+    if "Data not available" in msg:
+        return STATUS_NOT_AVAILABLE, msg
+    if "Incorrect captcha" in msg:
+        return STATUS_INCORRECT_CAPTCHA, msg
+        
+    missing = [label for col, label in RESULT_LABELS.items()
+               if col not in OPTIONAL_LABELS and label not in labels]
+    if missing:
+        return STATUS_ERROR, msg or f"Error scraping data: missing {', '.join(missing)}"
+        
+    row = {col: labels.get(label, "0") for col, label in RESULT_LABELS.items()}
+    return STATUS_OK, row
+
+
+def subject_rows(tables):
+    """Rows of the subject-wise grade table, keyed by its header cells"""
+    for rows in tables:
+        if len(rows) < 2:
+            continue
+        header = " ".join(rows[0]).lower()
+        if "subject" not in header or "grade" not in header:
+            continue
+        columns = [cell.strip().replace(" ", "_") for cell in rows[0]]
+        return [dict(zip(columns, row)) for row in rows[1:] if len(row) == len(columns)]
+    return []
+
+
+def _lxml_snapshot(html):
+    """Labels and tables of a page using lxml"""
+    tree = lxml.html.fromstring(html)
+    labels = {}
+    for label in ("lblmsg",) + tuple(RESULT_LABELS.values()):
+        element = tree.get_element_by_id(label, None)
+        if element is not None:
+            labels[label] = element.text_content().strip()
+    tables = [
+        [[cell.text_content().strip() for cell in tr.xpath("./th|./td")] for tr in table.iter("tr")]
+        for table in tree.iter("table")
+    ]
+    return labels, tables
+
+
+def parse_result_page(html):
+    """Parse a result page snapshot, return (status, row or message)
+    
+    The row of a successful result carries the subject-wise grades under "Subjects".
+    """
+    if lxml is not None:
+        labels, tables = _lxml_snapshot(html)
+    else:
+        page = ResultsPage(html)
+        labels, tables = page.labels, page.tables
+        
+    status, data = result_from_labels(labels)
+    if status == STATUS_OK:
+        data["Subjects"] = subject_rows(tables)
+    return status, data
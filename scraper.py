@@ -0,0 +1,827 @@
+"""
+GTU Results Scraper - scraping core
+Browser sessions and the worker pool that drives them, independent of the GUI.
+"""
+
+import os
+import json
+import base64
+import heapq
+import queue
+import threading
+import time
+import collections
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver import ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from writers import get_writer
+from changes import ChangeSetWriter
+from stats import ResultStats
+from telemetry import Telemetry
+from throttle import AdaptiveLimiter
+from archive import PageArchive
+from store import STATE_DONE, STATE_NOT_AVAILABLE, STATE_FAILED, STATE_SKIPPED, COMPLETE_STATES
+from discovery import OccupancyMap, RangeDiscovery
+from captcha_solver import CaptchaSolver, SolvingCaptchaProvider
+from common import BASE_URL, DATA_DIR, ENGINE_NAMES, CaptchaExpired
+from pages import (
+    ResultsPage, parse_result_page, STATUS_OK, STATUS_NOT_AVAILABLE,
+    STATUS_INCORRECT_CAPTCHA, STATUS_TIMEOUT, STATUS_ERROR, STATUS_PAGE, STATUS_SKIPPED
+)
+
+
+DRIVER_CACHE = os.path.join(DATA_DIR, "chromedriver.json")
+DEFAULT_PASSWORD = "123456789"
+FAILURE_SESSION = "session"  # the session crashed while handling the enrollment
+# Failure class -> (attempts, first backoff in seconds); anything not listed, like STATUS_NOT_AVAILABLE, is final
+RETRY_POLICY = {
+    STATUS_INCORRECT_CAPTCHA: (3, 0),  # a new captcha is all it takes
+    STATUS_TIMEOUT: (3, 2.0),  # give the server time to recover
+    STATUS_ERROR: (3, 2.0),
+    FAILURE_SESSION: (3, 0),  # the worker backs off before restarting the session
+}
+MAX_BACKOFF = 30
+RETRY_LABELS = {
+    STATUS_INCORRECT_CAPTCHA: "Incorrect captcha", STATUS_TIMEOUT: "Timeout",
+    STATUS_ERROR: "Error", FAILURE_SESSION: "Session crash",
+}
+# Resources a lean browser does not download. The captcha comes from an .aspx
+# handler, so none of the file type patterns match it.
+LEAN_BLOCKED_URLS = [
+    pattern
+    for ext in ["css", "woff", "woff2", "ttf", "otf", "eot", "png", "jpg", "jpeg", "gif", "svg", "ico", "webp", "mp4"]
+    for pattern in (f"*.{ext}", f"*.{ext}?*")
+] + ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*fonts.googleapis.com*",
+     "*fonts.gstatic.com*"]
+LEAN_CHROME_FLAGS = [
+    "--disable-extensions", "--disable-background-networking", "--disable-default-apps",
+    "--disable-sync", "--no-first-run", "--mute-audio",
+]
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0 Safari/537.36"
+)
+
+
+def results_url(result_type, base_url=BASE_URL):
+    """Return the results page URL for a result type"""
+    if result_type == "Archive":
+        return urljoin(base_url, "Default.aspx?ext=archive")
+    return base_url
+
+
+def driver_alive(driver):
+    """False once the browser has crashed or was closed"""
+    try:
+        driver.current_window_handle
+        return True
+    except Exception:
+        return False
+
+
+def chrome_options(headless=False, lean=False):
+    """Chrome options used for every browser session, lean ones always run headless"""
+    options = ChromeOptions()
+    options.add_argument("--window-size=960,1080")
+    if headless or lean:
+        options.add_argument("--headless=new")
+    else:
+        options.add_argument("--window-position=-2000,0")  # Move window off-screen
+    options.add_argument("--disable-gpu")
+    if lean:
+        # Hand the page over once the DOM is ready instead of after every stylesheet and image
+        options.page_load_strategy = "eager"
+        for flag in LEAN_CHROME_FLAGS:
+            options.add_argument(flag)
+    return options
+
+
+def start_chrome(options):
+    """Start Chrome with the chromedriver found last time, Selenium Manager resolves it only when that fails"""
+    try:
+        with open(DRIVER_CACHE, encoding="utf-8") as f:
+            cached = json.load(f)["path"]
+    except (OSError, ValueError, KeyError):
+        cached = None
+    if cached and os.path.exists(cached):
+        try:
+            return webdriver.Chrome(options=options, service=ChromeService(executable_path=cached))
+        except Exception:
+            # Usually Chrome updated itself and the cached driver no longer matches
+            pass
+            
+    driver = webdriver.Chrome(options=options)
+    try:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with open(DRIVER_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"path": driver.service.path}, f)
+    except (OSError, AttributeError):
+        pass
+    return driver
+
+
+def block_resources(driver):
+    """Stop the browser from fetching what the scraper never looks at"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+    except Exception:
+        # Not a Chromium driver, pages simply load in full
+        pass
+
+
+class SeleniumSession:
+    """One Chrome browser on the results page with the exam selected"""
+    
+    def __init__(self, result_type, exam_value=None, driver=None, timeout=15, base_url=BASE_URL,
+                 headless=False, lean=False):
+        self.result_type = result_type
+        self.exam_value = exam_value
+        self.driver = driver
+        self.timeout = timeout
+        self.base_url = base_url
+        self.headless = headless
+        self.lean = lean
+        self.owns_driver = driver is None
+        self.ready = False  # on the results page with the exam selected
+        
+    def start(self):
+        """Open the results page and select the exam"""
+        if not self.driver:
+            self.driver = start_chrome(chrome_options(self.headless, self.lean))
+        if self.lean:
+            block_resources(self.driver)
+        self.driver.get(results_url(self.result_type, self.base_url))
+        
+        exam_dropdown = WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.ID, "ddlbatch"))
+        )
+        if self.exam_value:
+            Select(exam_dropdown).select_by_value(self.exam_value)
+        self.ready = True
+        
+    def select_exam(self, exam_value):
+        """Switch the dropdown to another exam without reloading the page"""
+        Select(self.driver.find_element(By.ID, "ddlbatch")).select_by_value(exam_value)
+        self.exam_value = exam_value
+        
+    def load_exams(self):
+        """Return (value, text) for every exam in the dropdown"""
+        # One script call instead of two WebDriver round trips per option
+        options = self.driver.execute_script("""
+            return Array.from(document.getElementById('ddlbatch').options, o => [o.value, o.text.trim()]);
+        """)
+        return [(value, text) for value, text in options if value]
+        
+    def fetch_captcha(self):
+        """Return the captcha image on the current page as PNG bytes"""
+        # With eager page loads the image may still be downloading
+        try:
+            WebDriverWait(self.driver, 10).until(lambda driver: driver.execute_script("""
+                const img = document.getElementById('imgCaptcha');
+                return img !== null && img.complete && img.naturalWidth > 0;
+            """))
+        except Exception:
+            raise RuntimeError("Captcha image did not load")
+            
+        # Extract Base64 directly from the browser using JavaScript
+        captcha_element = self.driver.find_element(By.ID, "imgCaptcha")
+        base64_data = self.driver.execute_script("""
+            const img = arguments[0];
+            const canvas = document.createElement('canvas');
+            canvas.width = img.naturalWidth;
+            canvas.height = img.naturalHeight;
+            const ctx = canvas.getContext('2d');
+            ctx.drawImage(img, 0, 0);
+            return canvas.toDataURL('image/png').split(',')[1];
+        """, captcha_element)
+        return base64.b64decode(base64_data)
+        
+    def submit(self, enrollment, captcha):
+        """Fill and submit the form, return (STATUS_PAGE, page snapshot) or a failure"""
+        enroll_no = self.driver.find_element(By.ID, "txtenroll")
+        enroll_no.clear()
+        enroll_no.send_keys(enrollment)
+        
+        ps = self.driver.find_element(By.ID, "txtpassword")
+        ps.clear()
+        ps.send_keys(DEFAULT_PASSWORD)
+        
+        captcha_field = self.driver.find_element(By.ID, "CodeNumberTextBox")
+        captcha_field.clear()
+        captcha_field.send_keys(captcha)
+        
+        btn = self.driver.find_element(By.ID, "btnSearch")
+        btn.send_keys(Keys.ENTER)
+        
+        # Wait for results
+        try:
+            WebDriverWait(self.driver, self.timeout).until(
+                EC.any_of(
+                    EC.presence_of_element_located((By.ID, "lblCGPA")),
+                    EC.presence_of_element_located((By.ID, "lblmsg"))
+                )
+            )
+        except Exception:
+            return STATUS_TIMEOUT, "Timeout"
+            
+        # One round-trip for the whole page, labels are parsed off the browser thread
+        return STATUS_PAGE, self.driver.page_source
+        
+    def quit(self):
+        """Close the browser if this session started it"""
+        self.ready = False
+        if self.driver and self.owns_driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+
+class HttpSession:
+    """Results page driven over plain HTTP by posting the ASP.NET form directly"""
+    
+    def __init__(self, result_type, exam_value=None, timeout=15, base_url=BASE_URL):
+        self.result_type = result_type
+        self.exam_value = exam_value
+        self.timeout = timeout
+        self.url = results_url(result_type, base_url)
+        self.page = None
+        self.page_url = self.url
+        self.ready = False
+        
+        # Keep-alive connection pool, cookies hold this session's captcha
+        self.http = requests.Session()
+        self.http.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        
+    def start(self):
+        """Load the results page and check the exam exists"""
+        response = self.http.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        self._set_page(response)
+        if self.page is None:
+            raise RuntimeError("Results form not found on page")
+        if self.exam_value and self.exam_value not in dict(self.page.exams):
+            raise ValueError(f"Exam {self.exam_value} not found on results page")
+        self.ready = True
+        
+    def select_exam(self, exam_value):
+        """Post the next students for another exam, the form carries ddlbatch with every search"""
+        if self.page is not None and exam_value not in dict(self.page.exams):
+            raise ValueError(f"Exam {exam_value} not found on results page")
+        self.exam_value = exam_value
+        
+    def load_exams(self):
+        """Return (value, text) for every exam in the dropdown"""
+        return list(self.page.exams)
+        
+    def fetch_captcha(self):
+        """Download this session's captcha image"""
+        if self.page is None or "imgCaptcha" not in self.page.images:
+            self.start()
+        captcha_url = urljoin(self.page_url, self.page.images["imgCaptcha"])
+        response = self.http.get(captcha_url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+        
+    def submit(self, enrollment, captcha):
+        """Post the search form, return (STATUS_PAGE, page snapshot) or a failure"""
+        form = dict(self.page.hidden)
+        form.update({
+            "ddlbatch": self.exam_value,
+            "txtenroll": enrollment,
+            "txtpassword": DEFAULT_PASSWORD,
+            "CodeNumberTextBox": captcha,
+            "btnSearch": self.page.inputs.get("btnSearch", "Search"),
+        })
+        action = urljoin(self.page_url, self.page.form_action or "")
+        
+        try:
+            response = self.http.post(action, data=form, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.Timeout:
+            return STATUS_TIMEOUT, "Timeout"
+        except requests.RequestException as e:
+            self.page = None
+            return STATUS_ERROR, str(e)
+            
+        # The response carries __VIEWSTATE/__EVENTVALIDATION for the next post
+        self._set_page(response)
+        if self.page is None:
+            return STATUS_ERROR, "Unexpected response page"
+        return STATUS_PAGE, response.text
+        
+    def quit(self):
+        self.ready = False
+        self.http.close()
+        
+    def _set_page(self, response):
+        self.page = ResultsPage(response.text)
+        self.page_url = response.url
+        if "__VIEWSTATE" not in self.page.hidden:
+            # Not the results form (error page), reload before the next student
+            self.page = None
+
+
+# Scraping engines selectable at runtime
+ENGINES = dict(zip(ENGINE_NAMES, [SeleniumSession, HttpSession]))
+
+
+class OrderedMerger:
+    """Releases worker outcomes in enrollment order"""
+    
+    def __init__(self, on_result):
+        self.on_result = on_result
+        self.next_index = 0
+        self.pending = []
+        self.lock = threading.Lock()
+        
+    def put(self, index, enrollment, status, data):
+        """Queue an outcome and release every outcome that is next in order
+        
+        A failing on_result does not hold back the outcomes after it, the
+        first error is raised once they are all released.
+        """
+        error = None
+        with self.lock:
+            heapq.heappush(self.pending, (index, enrollment, status, data))
+            while self.pending and self.pending[0][0] == self.next_index:
+                item = heapq.heappop(self.pending)
+                self.next_index += 1
+                try:
+                    self.on_result(*item)
+                except Exception as e:
+                    error = error or e
+        if error:
+            raise error
+
+
+class ScrapePool:
+    """Runs several sessions over one enrollment list in parallel
+    
+    Each session fetches its next captcha before claiming an enrollment, so
+    with spare prefetch sessions there is always a captcha ready for the
+    operator while the other sessions wait on the server. Result pages are
+    parsed on a separate thread so sessions move on right after submitting.
+    Failed enrollments are retried per RETRY_POLICY; a retry waiting out its
+    backoff does not hold up fresh work.
+    """
+    
+    def __init__(self, session_factory, enrollments, num_workers, solve_captcha,
+                 on_result, on_log=None, prefetch=0, report_captcha=None, retry_policy=RETRY_POLICY,
+                 parse_page=parse_result_page, max_restarts=3, telemetry=None, on_page=None,
+                 release_session=None, should_skip=None):
+        self.session_factory = session_factory
+        self.release_session = release_session
+        self.should_skip = should_skip
+        self.enrollments = enrollments
+        self.num_workers = max(1, min(num_workers, len(enrollments)))
+        self.num_sessions = max(1, min(num_workers + prefetch, len(enrollments)))
+        self.solve_captcha = solve_captcha
+        self.report_captcha = report_captcha
+        self.retry_policy = retry_policy
+        self.parse_page = parse_page
+        self.max_restarts = max_restarts
+        self.telemetry = telemetry or Telemetry()
+        self.on_page = on_page
+        self.merger = OrderedMerger(on_result)
+        self.on_log = on_log or (lambda message: None)
+        self.stop_event = threading.Event()
+        
+        # At most num_workers submissions are in flight, fewer while the server struggles;
+        # extra sessions just hold captchas
+        self.limiter = AdaptiveLimiter(self.num_workers)
+        self.limiter.on_decrease = lambda limiter: self.on_log(f"Server is slowing down: {limiter.describe()}")
+        self.parse_queue = queue.Queue()
+        
+        # Work state, guarded by work_ready
+        self.work_ready = threading.Condition()
+        self.next_index = 0
+        self.retries = []  # heap of (due time, sequence, index)
+        self.retry_sequence = 0
+        self.attempts = collections.Counter()  # (index, failure class) -> failed attempts
+        self.outstanding = 0
+        
+        # failure class -> Counter of retried / recovered / gave up
+        self.retry_stats = collections.defaultdict(collections.Counter)
+        self.retried_for = collections.defaultdict(set)  # index -> failure classes it was retried for
+        
+    def claim(self):
+        """Hand out the next enrollment index (due retries first), None when all work is done"""
+        while True:
+            index = self._next_index()
+            if index is None or not (self.should_skip and self.should_skip(self.enrollments[index])):
+                return index
+            self.finish(index, STATUS_SKIPPED, "Skipped, empty range")
+            
+    def _next_index(self):
+        with self.work_ready:
+            while not self.stop_event.is_set():
+                now = time.monotonic()
+                if self.retries and self.retries[0][0] <= now:
+                    index = heapq.heappop(self.retries)[2]
+                elif self.next_index < len(self.enrollments):
+                    index = self.next_index
+                    self.next_index += 1
+                elif self.retries or self.outstanding:
+                    # Wait for the next backoff to run out or for pages still being parsed
+                    self.work_ready.wait(min(0.5, self.retries[0][0] - now) if self.retries else 0.5)
+                    continue
+                else:
+                    return None
+                self.outstanding += 1
+                return index
+            return None
+            
+    def finish(self, index, status, data):
+        """Record the final outcome of an enrollment"""
+        with self.work_ready:
+            for failure in self.retried_for.pop(index, ()):
+                self.retry_stats[failure]["recovered" if status in (STATUS_OK, STATUS_NOT_AVAILABLE) else "gave up"] += 1
+        try:
+            self.merger.put(index, self.enrollments[index], status, data)
+        except Exception as e:
+            # The enrollment still counts as finished, or the pool would wait for it forever
+            self.on_log(f"✗ Could not record the result of {self.enrollments[index]}: {str(e)}")
+        with self.work_ready:
+            self.outstanding -= 1
+            self.work_ready.notify_all()
+            
+    def retry(self, index, delay=0):
+        """Put an enrollment back in the queue, ahead of fresh work once delay seconds have passed"""
+        with self.work_ready:
+            heapq.heappush(self.retries, (time.monotonic() + delay, self.retry_sequence, index))
+            self.retry_sequence += 1
+            self.outstanding -= 1
+            self.work_ready.notify_all()
+            
+    def fail(self, index, status, data):
+        """Retry a failed enrollment if its failure class allows another attempt, else finish it"""
+        attempts, backoff = self.retry_policy.get(status, (1, 0))
+        with self.work_ready:
+            self.attempts[(index, status)] += 1
+            failed = self.attempts[(index, status)]
+            if failed < attempts:
+                self.retry_stats[status]["retried"] += 1
+                self.retried_for[index].add(status)
+        if failed >= attempts:
+            self.finish(index, STATUS_ERROR if status == FAILURE_SESSION else status, data)
+            return
+        delay = min(backoff * 2 ** (failed - 1), MAX_BACKOFF)
+        self.on_log(f"{RETRY_LABELS.get(status, status)} for {self.enrollments[index]}, retrying "
+                    f"{'in ' + format(delay, 'g') + 's ' if delay else ''}({failed}/{attempts - 1})")
+        self.retry(index, delay)
+        
+    def retry_report(self):
+        """One line per failure class that needed retries, e.g. for the end of the log"""
+        lines = []
+        for failure in self.retry_policy:
+            counts = self.retry_stats.get(failure)
+            if counts:
+                lines.append(f"{RETRY_LABELS.get(failure, failure)}: {counts['retried']} retries, "
+                             f"{counts['recovered']} recovered, {counts['gave up']} gave up")
+        return lines
+            
+    def run(self):
+        """Scrape every enrollment and block until all sessions are done"""
+        parser = threading.Thread(target=self._parser, daemon=True)
+        parser.start()
+        threads = [
+            threading.Thread(target=self._worker, args=(worker_id,), daemon=True)
+            for worker_id in range(self.num_sessions)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.parse_queue.put(None)
+        parser.join()
+        
+        # Release the merger past anything no session got to
+        unfinished = [item[2] for item in self.retries] + list(range(self.next_index, len(self.enrollments)))
+        for index in sorted(unfinished):
+            self.merger.put(index, self.enrollments[index], STATUS_ERROR, "Not scraped")
+            
+    def stop(self):
+        self.stop_event.set()
+        
+    def _worker(self, worker_id):
+        session = None
+        index = None
+        failures = 0
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    if session is None:
+                        with self.telemetry.phase("session_start"):
+                            session = self.session_factory(worker_id)
+                            # A session handed over by the previous job is already on the page
+                            reused = session.ready
+                            if not reused:
+                                session.start()
+                        state = "restarted" if failures else "reused" if reused else "ready"
+                        self.on_log(f"Session {worker_id + 1} {state}")
+                        
+                    with self.telemetry.phase("captcha_fetch"):
+                        captcha_png = session.fetch_captcha()
+                    index = self.claim()
+                    if index is None:
+                        break
+                    enrollment = self.enrollments[index]
+                    try:
+                        with self.telemetry.phase("captcha_wait"):
+                            answer = self.solve_captcha(enrollment, captcha_png)
+                    except CaptchaExpired:
+                        # Not the enrollment's fault, it goes back to the front of the queue
+                        self.on_log(f"Captcha for {enrollment} expired, fetching a new one")
+                        self.retry(index)
+                        index = None
+                        continue
+                    if answer is None:
+                        break
+                        
+                    with self.telemetry.phase("throttle"):
+                        started = self.limiter.acquire()
+                    ok = False
+                    try:
+                        with self.telemetry.phase("submit"):
+                            status, data = session.submit(enrollment, answer)
+                        ok = status not in (STATUS_TIMEOUT, STATUS_ERROR)
+                    finally:
+                        self.limiter.release(started, ok)
+                    # From here on the enrollment belongs to the parser or to fail(), not to this session
+                    index, submitted = None, index
+                    if status == STATUS_PAGE:
+                        self.parse_queue.put((submitted, captcha_png, answer, data))
+                        failures = 0
+                    else:
+                        self.fail(submitted, status, data)
+                    
+                except Exception as e:
+                    # A crashed browser or expired session: start over on the exam page
+                    failures += 1
+                    self.on_log(f"✗ Session {worker_id + 1} failed: {str(e)}")
+                    if session:
+                        session.quit()
+                        session = None
+                    if index is not None:
+                        self.fail(index, FAILURE_SESSION, f"Session failed: {str(e)}")
+                        index = None
+                    if failures > self.max_restarts:
+                        self.on_log(f"✗ Session {worker_id + 1} gave up after {failures} failures")
+                        break
+                    self.stop_event.wait(min(2 ** failures, 30))
+                    
+        finally:
+            if session and self.release_session and not self.stop_event.is_set():
+                self.release_session(session)
+            elif session:
+                session.quit()
+            if index is not None:
+                self.finish(index, STATUS_ERROR, "Not scraped")
+                
+    def _parser(self):
+        """Parse result page snapshots handed over by the sessions"""
+        while True:
+            item = self.parse_queue.get()
+            if item is None:
+                return
+            index, captcha_png, answer, html = item
+            enrollment = self.enrollments[index]
+            try:
+                with self.telemetry.phase("parse"):
+                    status, data = self.parse_page(html)
+            except Exception as e:
+                status, data = STATUS_ERROR, f"Error parsing page: {str(e)}"
+            try:
+                if self.on_page and status == STATUS_OK:
+                    self.on_page(enrollment, html)
+                    
+                if self.report_captcha and status in (STATUS_OK, STATUS_NOT_AVAILABLE, STATUS_INCORRECT_CAPTCHA):
+                    self.report_captcha(enrollment, captcha_png, answer, status != STATUS_INCORRECT_CAPTCHA)
+            except Exception as e:
+                # A local failure (archive, captcha harvest) says nothing about the result itself
+                self.on_log(f"✗ Error handling the result of {enrollment}: {str(e)}")
+                
+            if status == STATUS_OK:
+                self.finish(index, status, data)
+            else:
+                self.fail(index, status, data)
+
+
+class ScrapeRun:
+    """One complete scraping run, shared by the GUI and the command line
+    
+    Captchas go to the offline solver first and to ask_captcha when it is
+    unsure; results are written to the output file in enrollment order.
+    """
+    
+    def __init__(self, session_factory, enrollments, output, ask_captcha, workers=1, prefetch=0,
+                 solver=None, auto_solve=True, on_log=None, on_progress=None, journal=None, job_params=None,
+                 result_store=None, skip_known=True, baseline=None, release_session=None, max_misses=0,
+                 harvest_dir=os.path.join(DATA_DIR, "captchas"), timings_dir=os.path.join(DATA_DIR, "runs"),
+                 archive_dir=os.path.join(DATA_DIR, "archive")):
+        self.output = output
+        self.baseline = baseline
+        self.job_params = dict(job_params or {})
+        if baseline:
+            # A diff is its own job, resuming it must not mix with a normal run of the same range
+            self.job_params["baseline"] = os.path.abspath(baseline)
+        if max_misses:
+            # Skipped numbers count as done, a resume without range discovery must scrape them
+            self.job_params["max_misses"] = max_misses
+        self.journal = journal
+        self.job_id = None
+        self.resumed = 0
+        if journal:
+            # Enrollments finished by an earlier, interrupted run of the same job are skipped
+            self.job_id, states = journal.open_job(self.job_params, os.path.abspath(output), enrollments)
+            remaining = [enrollment for enrollment in enrollments if states.get(enrollment) not in COMPLETE_STATES]
+            self.resumed = len(enrollments) - len(remaining)
+            enrollments = remaining
+        self.result_store = result_store
+        self.known = []
+        exam = self.job_params.get("exam_value")
+        if result_store and exam and skip_known and not baseline:
+            # Students with a stored result cost nothing, their rows come from the store
+            stored = result_store.known(exam)
+            self.known = [enrollment for enrollment in enrollments if enrollment in stored]
+            enrollments = [enrollment for enrollment in enrollments if enrollment not in stored]
+        self.discovery = None
+        if max_misses:
+            # Likely students first, so a branch's empty tail is reached last and can be cut off
+            occupancy = OccupancyMap.load(enrollments, result_store, journal)
+            enrollments = occupancy.prioritise(enrollments)
+            self.discovery = RangeDiscovery(occupancy, max_misses, on_log)
+        self.enrollments = enrollments
+        # An empty solver is falsy (no templates yet), so test for None explicitly
+        self.solver = solver if solver is not None else CaptchaSolver(os.path.join(DATA_DIR, "captcha_templates.npz"))
+        self.on_log = on_log or (lambda message: None)
+        self.on_progress = on_progress or (lambda processed, total, enrollment: None)
+        self.processed = 0
+        self.counts = collections.Counter()
+        self.stats = ResultStats()
+        self.telemetry = Telemetry()
+        self.harvest_dir = harvest_dir
+        self.timings_dir = timings_dir
+        self.archive_dir = archive_dir
+        self.archive = None
+        self.writer = None
+        
+        self.provider = SolvingCaptchaProvider(
+            self.solver, ask_captcha, auto=auto_solve, harvest_dir=harvest_dir
+        )
+        self.pool = ScrapePool(
+            session_factory, enrollments, workers,
+            solve_captcha=self.provider,
+            report_captcha=self.provider.report,
+            on_result=self.handle_result,
+            on_log=self.on_log,
+            prefetch=prefetch,
+            telemetry=self.telemetry,
+            on_page=self.archive_page,
+            release_session=release_session,
+            should_skip=self.discovery.should_skip if self.discovery else None
+        )
+        
+    @property
+    def stop_event(self):
+        return self.pool.stop_event
+        
+    def stop(self):
+        self.pool.stop()
+        
+    def run(self):
+        """Scrape all enrollments, then build the output file with its summary"""
+        exam = self.job_params.get("exam_value")
+        if self.baseline:
+            self.writer = ChangeSetWriter(self.output, self.baseline, stats=self.stats, on_flush=self.commit)
+        else:
+            self.writer = get_writer(self.output, stats=self.stats, on_flush=self.commit)
+        if self.archive_dir and exam:
+            self.archive = PageArchive(self.archive_dir)
+        try:
+            if (self.solver.path and not os.path.exists(self.solver.path)
+                    and self.harvest_dir and os.path.isdir(self.harvest_dir)):
+                # No templates file yet: start from the captchas operators answered in earlier runs
+                learned = self.solver.bootstrap(self.harvest_dir)
+                if learned:
+                    self.solver.save()
+                    self.on_log(f"Captcha solver: learned {learned} harvested captcha(s)")
+            if self.resumed:
+                self.on_log(f"Resuming job: {self.resumed} enrollment(s) already done, "
+                            f"{len(self.enrollments)} left")
+            if self.known:
+                for row in self.result_store.get(exam, self.known):
+                    self.writer.write(row)
+                if self.journal:
+                    for enrollment in self.known:
+                        self.journal.mark(self.job_id, enrollment, STATE_DONE)
+                self.on_log(f"Skipping {len(self.known)} student(s) already in the result store, "
+                            f"{len(self.enrollments)} left to scrape")
+            if self.discovery and self.enrollments:
+                self.on_log(f"Range discovery: {self.discovery.occupancy.describe(self.enrollments)}")
+            if self.enrollments:
+                self.on_log(f"Initializing {self.pool.num_sessions} session(s)...")
+                self.pool.run()
+                for line in self.pool.retry_report():
+                    self.on_log(f"Retries - {line}")
+                if self.counts[STATUS_NOT_AVAILABLE]:
+                    self.on_log(f"Data not available: {self.counts[STATUS_NOT_AVAILABLE]} enrollment(s), not retried")
+                if self.discovery and self.discovery.summary():
+                    self.on_log(self.discovery.summary())
+            self.solver.save()
+            self.on_log(self.provider.summary())
+        finally:
+            # Keep whatever was scraped before a failure
+            with self.telemetry.phase("build_output"):
+                self.writer.close()
+            if self.archive is not None:
+                self.archive.close()
+            self.export_timings()
+        if self.journal and not self.journal.finish(self.job_id):
+            self.on_log("Some enrollments were not scraped, run the same range again to retry only those")
+        if self.baseline:
+            self.on_log(f"Compared with {self.baseline}: {self.writer.describe()}")
+            if not os.path.exists(self.output):
+                self.on_log("No changes, change set not created")
+        elif os.path.exists(self.output):
+            self.on_log(f"Summary: {self.stats.describe()}")
+        else:
+            self.on_log("No results found, output file not created")
+        
+    def commit(self):
+        """Make journal states and stored results durable, called after each writer flush"""
+        if self.journal:
+            self.journal.commit()
+        if self.result_store:
+            self.result_store.commit()
+            
+    def archive_page(self, enrollment, html):
+        """Keep the raw result page so the output can be rebuilt offline later"""
+        if self.archive is not None:
+            with self.telemetry.phase("archive"):
+                self.archive.put(self.job_params["exam_value"], enrollment, html)
+                
+    def export_timings(self):
+        """Log where the time went and save the phase timings of this run"""
+        self.on_log(self.telemetry.breakdown())
+        if not self.timings_dir:
+            return
+        try:
+            os.makedirs(self.timings_dir, exist_ok=True)
+            name = time.strftime("run_%Y%m%d_%H%M%S")
+            if self.job_id:
+                name += "_" + self.job_id[:8]
+            # Jobs run back to back can finish within the same second
+            base_path = os.path.join(self.timings_dir, name)
+            number = 1
+            while os.path.exists(base_path + ".json"):
+                number += 1
+                base_path = os.path.join(self.timings_dir, f"{name}_{number}")
+            json_path, _ = self.telemetry.export(base_path)
+            self.on_log(f"Phase timings saved to {json_path} (and .csv)")
+        except OSError as e:
+            self.on_log(f"Could not save phase timings: {str(e)}")
+            
+    def handle_result(self, index, enrollment, status, data):
+        """Write one scraped enrollment, called in enrollment order"""
+        total = len(self.enrollments)
+        self.counts[status] += 1
+        if self.journal:
+            # Marked before the row is written, the writer's next flush commits both
+            state = {
+                STATUS_OK: STATE_DONE, STATUS_NOT_AVAILABLE: STATE_NOT_AVAILABLE, STATUS_SKIPPED: STATE_SKIPPED
+            }.get(status, STATE_FAILED)
+            self.journal.mark(self.job_id, enrollment, state, "" if status == STATUS_OK else str(data))
+        if self.discovery:
+            self.discovery.record(enrollment, status)
+        if status == STATUS_OK:
+            with self.telemetry.phase("write"):
+                if self.result_store and self.job_params.get("exam_value"):
+                    self.result_store.put(self.job_params["exam_value"], enrollment, data)
+                self.writer.write(data)
+            self.on_log(f"[{index + 1}/{total}] ✓ Saved: {data['Name']} ({enrollment})")
+        elif status == STATUS_SKIPPED:
+            # Logged once per branch by the discovery
+            pass
+        elif status == STATUS_TIMEOUT:
+            self.on_log(f"[{index + 1}/{total}] Timeout for {enrollment}")
+        else:
+            self.on_log(f"[{index + 1}/{total}] Error for {enrollment}: {data}")
+            
+        self.processed += 1
+        self.telemetry.completed()
+        self.on_progress(self.processed, total, enrollment)
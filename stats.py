@@ -0,0 +1,164 @@
+"""
+GTU Results Scraper - running summary statistics
+Aggregates are updated as each result is written, so the summary never
+needs the output file to be read back.
+"""
+
+import math
+import threading
+
+
+NUMERIC_COLUMNS = ["Current_Sem_Back", "Total_Back", "SPI", "CPI", "CGPA"]
+GRADE_COLUMNS = ["SPI", "CPI", "CGPA"]
+QUANTILES = [("P25", 0.25), ("Median", 0.5), ("P75", 0.75), ("P90", 0.9)]
+
+
+def to_number(value):
+    """Float value of a result cell, None when it is blank or not a number"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class P2Quantile:
+    """Streaming quantile estimate in constant memory (Jain & Chlamtac's P-square algorithm)"""
+    
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+        
+    def add(self, x):
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+            
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+            
+        # Move the three middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+                
+    def value(self):
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < 5:
+            # Exact quantile of the few values seen so far
+            rank = self.p * (len(q) - 1)
+            low = int(rank)
+            high = min(low + 1, len(q) - 1)
+            return q[low] + (q[high] - q[low]) * (rank - low)
+        return q[2]
+
+
+class RunningStat:
+    """Count, min, max and mean of one column, optionally with quantile estimates"""
+    
+    def __init__(self, quantiles=()):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.quantiles = {name: P2Quantile(p) for name, p in quantiles}
+        
+    def add(self, x):
+        self.count += 1
+        self.total += x
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+            
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class ResultStats:
+    """Running aggregates over every result row written"""
+    
+    def __init__(self):
+        self.columns = {
+            col: RunningStat(QUANTILES if col in GRADE_COLUMNS else ()) for col in NUMERIC_COLUMNS
+        }
+        self.students = 0
+        self.failed = 0  # students with a backlog in the current semester
+        self.with_backlog = 0  # students with any backlog
+        self.lock = threading.Lock()
+        
+    def add(self, row):
+        """Update the aggregates with one result row"""
+        values = {col: to_number(row.get(col)) for col in NUMERIC_COLUMNS}
+        with self.lock:
+            self.students += 1
+            for col, value in values.items():
+                if value is not None:
+                    self.columns[col].add(value)
+            if (values["Current_Sem_Back"] or 0) > 0:
+                self.failed += 1
+            if (values["Total_Back"] or 0) > 0:
+                self.with_backlog += 1
+                
+    def summary_rows(self):
+        """Rows of the summary sheet, one per statistic"""
+        def row(label, value_of, columns=NUMERIC_COLUMNS):
+            values = {}
+            for col in columns:
+                value = value_of(self.columns[col])
+                values[col] = round(value, 2) if value is not None else None
+            return {"Statistic": label, **values}
+            
+        with self.lock:
+            rows = [
+                row("Students", lambda stat: stat.count),
+                row("MAX", lambda stat: stat.max),
+                row("MIN", lambda stat: stat.min),
+                row("AVG", lambda stat: stat.mean),
+            ]
+            for name, _ in QUANTILES:
+                rows.append(row(name, lambda stat: stat.quantiles[name].value(), GRADE_COLUMNS))
+            rows.append({"Statistic": "Total Failed Students",
+                         "Current_Sem_Back": self.failed, "Total_Back": self.with_backlog})
+        return rows
+        
+    def describe(self):
+        """One line for live display"""
+        with self.lock:
+            if not self.students:
+                return "No results yet"
+            parts = []
+            for col in GRADE_COLUMNS:
+                stat = self.columns[col]
+                if stat.count:
+                    parts.append(f"{col} avg {stat.mean:.2f} (median {stat.quantiles['Median'].value():.2f})")
+            parts.append(f"Failed: {self.failed}/{self.students}")
+        return " | ".join(parts)
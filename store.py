@@ -0,0 +1,214 @@
+"""
+GTU Results Scraper - job journal and result store
+Records the state of every enrollment of a run in SQLite so an interrupted
+run picks up where it stopped instead of scraping the whole range again,
+and keeps every scraped result so later runs skip students already known.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+
+STATE_PENDING = "pending"
+STATE_DONE = "done"
+STATE_NOT_AVAILABLE = "not_available"
+STATE_FAILED = "failed"
+STATE_SKIPPED = "skipped"
+COMPLETE_STATES = (STATE_DONE, STATE_NOT_AVAILABLE, STATE_SKIPPED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    output TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    finished INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    enrollment TEXT NOT NULL,
+    state TEXT NOT NULL,
+    detail TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (job_id, enrollment)
+);
+"""
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    exam TEXT NOT NULL,
+    enrollment TEXT NOT NULL,
+    data TEXT NOT NULL,
+    scraped_at REAL NOT NULL,
+    PRIMARY KEY (exam, enrollment)
+);
+"""
+
+
+def connect(path, schema):
+    """SQLite connection shared between threads, in WAL mode"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps committed transactions safe across an app crash, NORMAL skips an fsync per commit
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(schema)
+    db.commit()
+    return db
+
+
+def job_id_for(params, output, enrollments):
+    """Stable id of a run: same exam, output file and enrollments give the same job"""
+    key = json.dumps([params, output, enrollments], sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class JobJournal:
+    """Per-enrollment job state in a write-ahead-logged SQLite database"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = connect(path, SCHEMA)
+        
+    def open_job(self, params, output, enrollments):
+        """Create or resume the job for a run, return (job_id, {enrollment: state})"""
+        job_id = job_id_for(params, output, enrollments)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT finished FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                self.db.execute(
+                    "INSERT INTO jobs (job_id, params, output, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, json.dumps(params), output, now, now)
+                )
+                self.db.executemany(
+                    "INSERT INTO job_items (job_id, position, enrollment, state) VALUES (?, ?, ?, ?)",
+                    [(job_id, i, enrollment, STATE_PENDING) for i, enrollment in enumerate(enrollments)]
+                )
+            elif row[0]:
+                # A finished job run again is a fresh scrape of the same range
+                self.db.execute("UPDATE jobs SET finished = 0, updated_at = ? WHERE job_id = ?", (now, job_id))
+                self.db.execute("UPDATE job_items SET state = ?, detail = '' WHERE job_id = ?",
+                                (STATE_PENDING, job_id))
+            self.db.commit()
+            states = dict(self.db.execute(
+                "SELECT enrollment, state FROM job_items WHERE job_id = ?", (job_id,)
+            ).fetchall())
+        return job_id, states
+        
+    def mark(self, job_id, enrollment, state, detail=""):
+        """Record an enrollment's outcome, made durable by the next commit()"""
+        with self.lock:
+            self.db.execute(
+                "UPDATE job_items SET state = ?, detail = ? WHERE job_id = ? AND enrollment = ?",
+                (state, detail, job_id, enrollment)
+            )
+            
+    def commit(self):
+        with self.lock:
+            self.db.commit()
+            
+    def finish(self, job_id):
+        """Close the job once every enrollment has a final result"""
+        placeholders = ", ".join("?" * len(COMPLETE_STATES))
+        with self.lock:
+            open_items = self.db.execute(
+                f"SELECT COUNT(*) FROM job_items WHERE job_id = ? AND state NOT IN ({placeholders})",
+                (job_id, *COMPLETE_STATES)
+            ).fetchone()[0]
+            self.db.execute("UPDATE jobs SET finished = ?, updated_at = ? WHERE job_id = ?",
+                            (int(open_items == 0), time.time(), job_id))
+            self.db.commit()
+        return open_items == 0
+        
+    def enrollments_in_state(self, state, prefixes):
+        """Distinct enrollments any job recorded in a state, limited to the given 9-digit prefixes"""
+        prefixes = list(prefixes)
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT DISTINCT enrollment FROM job_items WHERE state = ? AND substr(enrollment, 1, 9) IN "
+                f"({', '.join('?' * len(prefixes))})", (state, *prefixes)
+            ).fetchall() if prefixes else []
+        return {enrollment for enrollment, in rows}
+        
+    def unfinished_jobs(self):
+        """(params, output, done, total, enrollments) of interrupted jobs, newest first"""
+        with self.lock:
+            jobs = self.db.execute(
+                "SELECT job_id, params, output FROM jobs WHERE finished = 0 ORDER BY updated_at DESC"
+            ).fetchall()
+            result = []
+            for job_id, params, output in jobs:
+                items = self.db.execute(
+                    "SELECT enrollment, state FROM job_items WHERE job_id = ? ORDER BY position", (job_id,)
+                ).fetchall()
+                done = sum(1 for _, state in items if state in COMPLETE_STATES)
+                result.append((json.loads(params), output, done, len(items), [e for e, _ in items]))
+        return result
+        
+    def close(self):
+        with self.lock:
+            self.db.commit()
+            self.db.close()
+
+
+class ResultStore:
+    """Every successfully scraped result, one row per (exam, enrollment)"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = connect(path, RESULTS_SCHEMA)
+        
+    def known(self, exam):
+        """Enrollments of an exam that already have a result, as a set for O(1) lookups"""
+        with self.lock:
+            rows = self.db.execute("SELECT enrollment FROM results WHERE exam = ?", (exam,)).fetchall()
+        return {enrollment for enrollment, in rows}
+        
+    def enrollments(self, prefixes):
+        """Enrollments with a result for any exam, limited to the given 9-digit prefixes"""
+        prefixes = list(prefixes)
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT DISTINCT enrollment FROM results WHERE substr(enrollment, 1, 9) IN "
+                f"({', '.join('?' * len(prefixes))})", prefixes
+            ).fetchall() if prefixes else []
+        return {enrollment for enrollment, in rows}
+        
+    def get(self, exam, enrollments):
+        """Stored result rows of the given enrollments, in the given order"""
+        wanted = list(enrollments)
+        rows = {}
+        with self.lock:
+            # Stay below SQLite's limit on query parameters
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                rows.update(self.db.execute(
+                    f"SELECT enrollment, data FROM results WHERE exam = ? AND enrollment IN "
+                    f"({', '.join('?' * len(chunk))})", (exam, *chunk)
+                ).fetchall())
+        return [json.loads(rows[enrollment]) for enrollment in wanted if enrollment in rows]
+        
+    def put(self, exam, enrollment, row):
+        """Insert or replace a result, made durable by the next commit()"""
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO results (exam, enrollment, data, scraped_at) VALUES (?, ?, ?, ?)",
+                (exam, enrollment, json.dumps(row), time.time())
+            )
+            
+    def commit(self):
+        with self.lock:
+            self.db.commit()
+            
+    def close(self):
+        with self.lock:
+            self.db.commit()
+            self.db.close()
@@ -0,0 +1,120 @@
+"""
+GTU Results Scraper - run telemetry
+Monotonic per-phase timers, throughput and ETA for one scraping run.
+"""
+
+import csv
+import json
+import time
+import threading
+import contextlib
+import collections
+import numpy as np
+
+
+# Phases of one student, in the order they happen
+PHASES = ["session_start", "captcha_fetch", "captcha_display", "captcha_wait", "throttle", "submit", "parse", "archive",
+          "write"]
+HISTOGRAM_EDGES_MS = [0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, float("inf")]
+
+
+class Telemetry:
+    """Collects phase durations and completion times of a run"""
+    
+    def __init__(self, rate_window=60):
+        self.durations = collections.defaultdict(list)
+        self.completions = collections.deque()
+        self.rate_window = rate_window
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one sample of a phase"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - begin)
+            
+    def record(self, name, seconds):
+        with self.lock:
+            self.durations[name].append(seconds)
+            
+    def completed(self):
+        """Count one finished student towards the rate"""
+        now = time.monotonic()
+        with self.lock:
+            self.completions.append(now)
+            
+    def rate_per_min(self):
+        """Students per minute over the last rate_window seconds"""
+        now = time.monotonic()
+        with self.lock:
+            while self.completions and now - self.completions[0] > self.rate_window:
+                self.completions.popleft()
+            # Early in the run the window only reaches back to the start
+            span = now - max(self.started, now - self.rate_window)
+            return len(self.completions) * 60 / span if span > 0 else 0.0
+            
+    def eta(self, remaining):
+        """Seconds until remaining students are done at the current rate, None when unknown"""
+        rate = self.rate_per_min()
+        return remaining * 60 / rate if rate else None
+        
+    def summary(self):
+        """Per phase: count, total, mean and percentiles in milliseconds, plus a histogram"""
+        with self.lock:
+            durations = {name: np.array(values) * 1000 for name, values in self.durations.items() if values}
+        names = [name for name in PHASES if name in durations] + sorted(set(durations) - set(PHASES))
+        result = {}
+        for name in names:
+            values = durations[name]
+            counts, _ = np.histogram(values, bins=HISTOGRAM_EDGES_MS)
+            result[name] = {
+                "count": int(values.size),
+                "total_s": round(float(values.sum()) / 1000, 3),
+                "mean_ms": round(float(values.mean()), 1),
+                "p50_ms": round(float(np.percentile(values, 50)), 1),
+                "p90_ms": round(float(np.percentile(values, 90)), 1),
+                "p99_ms": round(float(np.percentile(values, 99)), 1),
+                "max_ms": round(float(values.max()), 1),
+                "histogram": {f"<{edge:g}ms" if edge != float("inf") else "longer": int(count)
+                              for edge, count in zip(HISTOGRAM_EDGES_MS[1:], counts)},
+            }
+        return result
+        
+    def breakdown(self):
+        """One line naming where the time went, e.g. for the end of the log"""
+        summary = self.summary()
+        total = sum(stats["total_s"] for stats in summary.values())
+        if not total:
+            return "No timings recorded"
+        parts = [f"{name} {stats['total_s'] / total:.0%}" for name, stats in
+                 sorted(summary.items(), key=lambda item: -item[1]["total_s"])]
+        return "Time spent: " + ", ".join(parts)
+        
+    def export(self, base_path):
+        """Write base_path.json (with histograms) and base_path.csv, return both paths"""
+        summary = self.summary()
+        json_path, csv_path = base_path + ".json", base_path + ".csv"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_s": round(time.monotonic() - self.started, 3), "phases": summary}, f, indent=2)
+            
+        columns = ["phase", "count", "total_s", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for name, stats in summary.items():
+                writer.writerow([name] + [stats[col] for col in columns[1:]])
+        return json_path, csv_path
+
+
+def format_duration(seconds):
+    """Short human duration: 42s, 5m 07s, 1h 12m"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
@@ -0,0 +1,50 @@
+"""
+Shared fixtures: the repository modules on sys.path, a throwaway data
+directory instead of ~/.gtu_scraper, and a running mock results server.
+"""
+
+import os
+import sys
+import tempfile
+
+# DATA_DIR is resolved when common is imported, so the home directory is swapped first
+_home = tempfile.mkdtemp(prefix="gtu_tests_")
+os.environ["HOME"] = os.environ["USERPROFILE"] = _home
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from mock_server import MockResultsServer
+
+
+@pytest.fixture
+def mock_server():
+    server = MockResultsServer(missing_rate=0.2, seed=1).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def scrape(mock_server, tmp_path):
+    """Run a ScrapeRun over the mock server with an operator that always answers correctly"""
+    from scraper import HttpSession, ScrapeRun
+    from captcha_solver import CaptchaSolver
+    from store import JobJournal, ResultStore
+    
+    journal = JobJournal(str(tmp_path / "jobs.sqlite3"))
+    result_store = ResultStore(str(tmp_path / "results.sqlite3"))
+    
+    def run(enrollments, output, exam="5001", **kwargs):
+        options = dict(solver=CaptchaSolver(None), auto_solve=False, journal=journal, result_store=result_store,
+                       harvest_dir=None, timings_dir=None, archive_dir=None)
+        options.update(kwargs)
+        scrape_run = ScrapeRun(
+            lambda worker_id: HttpSession("Regular", exam, base_url=mock_server.url),
+            enrollments, str(output), lambda enrollment, captcha_png: mock_server.answer_for(captcha_png),
+            job_params={"result_type": "Regular", "exam_value": exam}, **options
+        )
+        scrape_run.run()
+        return scrape_run
+        
+    yield run
+    journal.close()
+    result_store.close()
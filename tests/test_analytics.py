@@ -0,0 +1,46 @@
+import pandas as pd
+from analytics import RANKS_SHEET, cohort_tables
+
+
+def results(rows):
+    columns = ["Name", "Enrollment_No", "Current_Sem_Back", "Total_Back", "SPI", "CPI", "CGPA"]
+    return pd.DataFrame(rows, columns=columns).astype(str)
+
+
+STUDENTS = results([
+    ("A", "226400316001", "0", "0", "9.0", "8.5", "8.4"),
+    ("B", "226400316002", "1", "2", "6.0", "6.5", "6.4"),
+    ("C", "226400307001", "0", "0", "9.0", "9.1", "9.0"),
+    ("D", "226410316001", "3", "4", "5.0", "5.5", "5.4"),
+    ("E", "236400316001", "0", "0", "7.0", "7.0", "7.0"),
+    ("F", "not a number", "0", "0", "9.9", "9.9", "9.9"),
+])
+
+
+def test_groups_by_enrollment_parts():
+    tables = cohort_tables(STUDENTS)
+    by_college = tables["By College"].set_index("College")
+    assert by_college["Students"].to_dict() == {"640": 4, "641": 1}
+    assert by_college.loc["640", "Pass_Rate"] == 75.0
+    assert by_college.loc["640", "SPI_Mean"] == 7.75
+    by_branch = tables["By Branch"].set_index("Branch")
+    assert by_branch["Students"].to_dict() == {"07": 1, "16": 4}
+    assert list(tables["By Batch"]["Batch"]) == ["22", "23"]
+
+
+def test_backlog_histogram():
+    by_batch = cohort_tables(STUDENTS)["By Batch"].set_index("Batch")
+    assert by_batch.loc["22", ["Back_0", "Back_1", "Back_2", "Back_3+"]].tolist() == [2, 1, 0, 1]
+    assert by_batch.loc["23", ["Back_0", "Back_1", "Back_2", "Back_3+"]].tolist() == [1, 0, 0, 0]
+
+
+def test_ranks_share_ties():
+    ranks = cohort_tables(STUDENTS)[RANKS_SHEET].set_index("Enrollment_No")
+    assert ranks["Overall_Rank"].tolist() == [1, 1, 3, 4, 5]
+    assert ranks.loc["226400316002", "College_Rank"] == 4
+    assert ranks.loc["226400316002", "Branch_Rank"] == 3
+    assert ranks.loc["226410316001", ["College_Rank", "Branch_Rank"]].tolist() == [1, 1]
+
+
+def test_no_valid_enrollments_gives_no_sheets():
+    assert cohort_tables(STUDENTS.tail(1)) == {}
@@ -0,0 +1,48 @@
+import pandas as pd
+from archive import PageArchive, reparse
+from common import build_enrollments
+from pages import STATUS_OK, STATUS_NOT_AVAILABLE
+from writers import read_results
+
+
+def test_pages_survive_reopening(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    archive.put("5001", "226400316001", "<html>old</html>")
+    archive.put("5001", "226400316001", "<html>new</html>")
+    archive.put("5002", "226400316001", "<html>other exam</html>")
+    archive.close()
+    
+    archive = PageArchive(str(tmp_path))
+    assert archive.get("5001", "226400316001") == "<html>new</html>"
+    assert archive.get("5001", "226400316002") is None
+    assert archive.exams() == {"5001": 1, "5002": 1}
+    archive.close()
+
+
+def test_index_entry_without_its_page_is_ignored(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    archive.put("5001", "226400316001", "<html>kept</html>")
+    archive.close()
+    # A crash after the index line but before the page reached the disk
+    with open(tmp_path / "pages.idx", "a", encoding="utf-8") as f:
+        f.write("5001\t226400316002\t999999\t10\t0\n")
+        
+    archive = PageArchive(str(tmp_path))
+    assert len(archive) == 1
+    archive.close()
+
+
+def test_reparse_rebuilds_the_scraped_output(mock_server, scrape, tmp_path):
+    archive_dir = tmp_path / "archive"
+    run = scrape(build_enrollments("226400316220", 12), tmp_path / "scraped.xlsx", archive_dir=str(archive_dir))
+    
+    archive = PageArchive(str(archive_dir))
+    try:
+        counts = reparse(archive, "5001", str(tmp_path / "rebuilt.xlsx"), on_log=lambda message: None)
+    finally:
+        archive.close()
+    # Only result pages are archived, "Data not available" pages are not
+    assert counts == {STATUS_OK: run.counts[STATUS_OK]}
+    assert run.counts[STATUS_NOT_AVAILABLE] > 0
+    pd.testing.assert_frame_equal(read_results(str(tmp_path / "rebuilt.xlsx")),
+                                  read_results(str(tmp_path / "scraped.xlsx")))
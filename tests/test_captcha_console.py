@@ -0,0 +1,69 @@
+import threading
+import urllib.request
+import pytest
+from urllib.parse import urlencode
+from captcha_console import WebCaptchaConsole
+from common import CaptchaExpired, CaptchaRequest
+
+
+@pytest.fixture
+def console():
+    console = WebCaptchaConsole(port=0, expire_after=0.5, lease=15)
+    yield console
+    console.close()
+    console.httpd.shutdown()
+    console.httpd.server_close()
+
+
+def test_first_answer_wins(console):
+    request = CaptchaRequest("226400316001", b"")
+    console.publish(request)
+    assert console.answer(id(request), "AB1C9", "alice")
+    assert not console.answer(id(request), "XXXXX", "bob")
+    assert console.wait(request) == "AB1C9"
+    assert console.operators["alice"].answered == 1 and console.operators["bob"].late == 1
+    assert console.summary().endswith("; bob 0 answered, 1 too late")
+
+
+def test_answer_posted_on_the_page(console):
+    result = []
+    waiting = threading.Thread(target=lambda: result.append(console("226400316001", b"")))
+    waiting.start()
+    while console.next_for("alice")[0] is None:
+        waiting.join(0.05)
+    request, queued = console.next_for("alice")
+    assert queued == 1
+    data = urlencode({"id": id(request), "answer": " AB1C9 "}).encode()
+    urllib.request.urlopen(urllib.request.Request(console.url + "answer", data=data))
+    waiting.join(5)
+    assert result == ["AB1C9"]
+    assert console.next_for("alice") == (None, 0)
+
+
+def test_operators_are_shown_different_captchas(console):
+    first, second = CaptchaRequest("226400316001", b""), CaptchaRequest("226400316002", b"")
+    console.publish(first)
+    console.publish(second)
+    assert console.next_for("alice")[0] is first
+    assert console.next_for("bob")[0] is second
+    # Everything is taken, a third operator races for the oldest one
+    assert console.next_for("carol")[0] is first
+
+
+def test_unanswered_captcha_expires(console):
+    request = CaptchaRequest("226400316001", b"")
+    console.publish(request)
+    with pytest.raises(CaptchaExpired):
+        console.wait(request)
+    assert not console.is_pending(id(request))
+    # An answer typed in after expiry is too late
+    assert not console.answer(id(request), "AB1C9", "alice")
+    assert console.expired == 1 and console.summary().endswith("1 expired")
+
+
+def test_stop_withdraws_the_captcha(console):
+    request = CaptchaRequest("226400316001", b"")
+    console.publish(request)
+    console.stop_event.set()
+    assert console.wait(request) is None
+    assert console.next_for("alice") == (None, 0)
@@ -0,0 +1,57 @@
+import os
+import random
+from captcha_solver import CaptchaSolver, SolvingCaptchaProvider, captcha_glyphs
+from mock_server import CAPTCHA_ALPHABET, render_captcha
+
+
+def test_harvest_file_names_only_take_letters_and_digits(tmp_path):
+    provider = SolvingCaptchaProvider(CaptchaSolver(None), None, harvest_dir=str(tmp_path))
+    for answer in ("AB1C9", "../../A1C9", "A/B\\C"):
+        provider.report("226400316001", render_captcha("AB1C9"), answer, True)
+    assert [name.split("_")[0] for name in os.listdir(tmp_path)] == ["AB1C9"]
+    assert provider.stats["learned"] == 1
+
+
+def captchas(count, seed):
+    rng = random.Random(seed)
+    texts = ["".join(rng.choice(CAPTCHA_ALPHABET) for _ in range(5)) for _ in range(count)]
+    return [(text, render_captcha(text)) for text in texts]
+
+
+def test_segments_one_glyph_per_character():
+    # Touching glyphs are split by width, a few captchas still come out wrong
+    clean = sum(len(captcha_glyphs(image)) == len(text) for text, image in captchas(200, seed=1))
+    assert clean >= 180
+
+
+def test_empty_solver_does_not_guess():
+    assert CaptchaSolver(None).solve(render_captcha("AB1C9"))[1] == 0
+
+
+def test_learns_from_confirmed_answers():
+    solver = CaptchaSolver(None)
+    learned = [solver.learn(image, text) for text, image in captchas(60, seed=2)]
+    assert sum(learned) >= 50
+    assert len(solver) == 5 * sum(learned)
+    answers = [(solver.solve(image), text) for text, image in captchas(200, seed=3)]
+    assert sum(answer == text for (answer, _), text in answers) >= 150
+    # Confident answers are the ones submitted without asking the operator
+    confident = [answer == text for (answer, confidence), text in answers if confidence >= 0.7]
+    assert len(confident) >= 40 and sum(confident) >= 0.95 * len(confident)
+
+
+def test_templates_are_saved_and_bootstrapped(tmp_path):
+    harvest_dir = tmp_path / "captchas"
+    harvest_dir.mkdir()
+    for number, (text, image) in enumerate(captchas(40, seed=4)):
+        (harvest_dir / f"{text}_{number:03d}.png").write_bytes(image)
+    path = str(tmp_path / "templates.npz")
+    solver = CaptchaSolver(path)
+    # Captchas that do not segment cleanly are left out
+    assert 35 <= solver.bootstrap(str(harvest_dir)) <= 40
+    solver.save()
+    
+    reloaded = CaptchaSolver(path)
+    assert len(reloaded) == len(solver)
+    text, image = captchas(1, seed=5)[0]
+    assert reloaded.solve(image) == solver.solve(image)
@@ -0,0 +1,36 @@
+import json
+from catalogue import ExamCatalogue
+
+
+def test_empty_catalogue_is_stale(tmp_path):
+    assert ExamCatalogue(str(tmp_path / "exam_catalogue.json")).get("Regular") == ([], True)
+
+
+def test_cached_exams_go_stale_after_the_ttl(tmp_path):
+    path = str(tmp_path / "exam_catalogue.json")
+    catalogue = ExamCatalogue(path)
+    catalogue.update("Regular", [("5001", "BE SEM 5 - Winter 2025")])
+    assert ExamCatalogue(path).get("Regular") == ([("5001", "BE SEM 5 - Winter 2025")], False)
+    assert ExamCatalogue(path).get("Archive") == ([], True)
+    
+    catalogue.entries["Regular"]["fetched_at"] -= 7 * 60 * 60
+    catalogue.save()
+    assert ExamCatalogue(path).get("Regular") == ([("5001", "BE SEM 5 - Winter 2025")], True)
+
+
+def test_refresh_merges_new_exams(tmp_path):
+    catalogue = ExamCatalogue(str(tmp_path / "exam_catalogue.json"))
+    catalogue.update("Regular", [("5001", "BE SEM 5"), ("4001", "BE SEM 3")])
+    added = catalogue.update("Regular", [("6001", "BE SEM 7"), ("5001", "BE SEM 5")])
+    assert added == [("6001", "BE SEM 7")]
+    # Site order first, exams the site dropped stay at the end
+    assert catalogue.get("Regular")[0] == [("6001", "BE SEM 7"), ("5001", "BE SEM 5"), ("4001", "BE SEM 3")]
+
+
+def test_damaged_cache_starts_empty(tmp_path):
+    path = tmp_path / "exam_catalogue.json"
+    path.write_text("{not json", encoding="utf-8")
+    catalogue = ExamCatalogue(str(path))
+    assert catalogue.get("Regular") == ([], True)
+    catalogue.update("Regular", [("5001", "BE SEM 5")])
+    assert json.loads(path.read_text(encoding="utf-8"))["Regular"]["exams"] == [["5001", "BE SEM 5"]]
@@ -0,0 +1,34 @@
+import pytest
+from common import build_enrollments, read_enrollment_list
+
+
+def test_build_enrollments_crosses_into_next_branch():
+    assert build_enrollments("226400316998", 3) == ["226400316998", "226400316999", "226400317000"]
+    assert build_enrollments("999999999999", 5) == ["999999999999"]
+
+
+def test_text_list_with_comments_and_duplicates(tmp_path):
+    path = tmp_path / "list.txt"
+    path.write_text("# detained students\n226400316005\n\n226400316001  # rechecking\n226400316005\n",
+                    encoding="utf-8")
+    assert read_enrollment_list(str(path)) == ["226400316005", "226400316001"]
+
+
+def test_text_list_rejects_bad_numbers(tmp_path):
+    path = tmp_path / "list.txt"
+    path.write_text("226400316005\n22640031600\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="22640031600"):
+        read_enrollment_list(str(path))
+
+
+def test_csv_with_enrollment_column(tmp_path):
+    path = tmp_path / "list.csv"
+    path.write_text("﻿Name,Enrollment No,Phone\nA,226400316010,987654321012\nB,226400316011,\n,,\n",
+                    encoding="utf-8")
+    assert read_enrollment_list(str(path)) == ["226400316010", "226400316011"]
+
+
+def test_csv_without_header_uses_first_enrollment_field(tmp_path):
+    path = tmp_path / "list.csv"
+    path.write_text("A,226400316020\n226400316021,B\nno number here\n", encoding="utf-8")
+    assert read_enrollment_list(str(path)) == ["226400316020", "226400316021"]
@@ -0,0 +1,58 @@
+from common import build_enrollments
+from discovery import OccupancyMap, RangeDiscovery
+from pages import STATUS_OK, STATUS_NOT_AVAILABLE, STATUS_ERROR
+
+PREFIX = "226400316"
+
+
+def enrollment(suffix):
+    return f"{PREFIX}{suffix:03d}"
+
+
+def test_known_students_first_known_empty_last():
+    occupancy = OccupancyMap(hits=[enrollment(5), enrollment(9), enrollment(40)], misses=[enrollment(1)])
+    order = occupancy.prioritise(build_enrollments(enrollment(0), 12))
+    assert order[:2] == [enrollment(5), enrollment(9)]
+    # Between known students next, then the unknown rest in enrollment order
+    assert order[2:5] == [enrollment(6), enrollment(7), enrollment(8)]
+    assert order[5:] == [enrollment(n) for n in (0, 2, 3, 4, 10, 11, 1)]
+
+
+def test_closes_after_consecutive_misses_past_last_student():
+    occupancy = OccupancyMap(hits=[enrollment(10)])
+    discovery = RangeDiscovery(occupancy, max_misses=3)
+    for suffix in (11, 12):
+        discovery.record(enrollment(suffix), STATUS_NOT_AVAILABLE)
+    assert not discovery.should_skip(enrollment(20))
+    discovery.record(enrollment(13), STATUS_NOT_AVAILABLE)
+    assert discovery.should_skip(enrollment(20))
+    # Numbers up to the last student and known students are never skipped
+    assert not discovery.should_skip(enrollment(4))
+    assert "1 enrollment(s) skipped" in discovery.summary()
+
+
+def test_holes_and_errors_do_not_close():
+    occupancy = OccupancyMap(hits=[enrollment(2), enrollment(30)])
+    discovery = RangeDiscovery(occupancy, max_misses=3)
+    for suffix in range(3, 10):
+        discovery.record(enrollment(suffix), STATUS_NOT_AVAILABLE)
+    for suffix in range(31, 40):
+        discovery.record(enrollment(suffix), STATUS_ERROR)
+    assert not discovery.should_skip(enrollment(50))
+
+
+def test_earlier_misses_count_but_only_this_run_closes():
+    occupancy = OccupancyMap(hits=[enrollment(10)], misses=[enrollment(11), enrollment(12)])
+    discovery = RangeDiscovery(occupancy, max_misses=3)
+    assert not discovery.should_skip(enrollment(20))
+    discovery.record(enrollment(13), STATUS_NOT_AVAILABLE)
+    assert discovery.should_skip(enrollment(20))
+
+
+def test_student_past_the_cut_reopens_the_branch():
+    discovery = RangeDiscovery(OccupancyMap(), max_misses=2)
+    for suffix in (0, 1):
+        discovery.record(enrollment(suffix), STATUS_NOT_AVAILABLE)
+    assert discovery.should_skip(enrollment(5))
+    discovery.record(enrollment(3), STATUS_OK)
+    assert not discovery.should_skip(enrollment(5))
@@ -0,0 +1,45 @@
+import pytest
+from jobs import ScrapeJob, plan_jobs, read_job_file
+
+
+def test_plan_groups_exams_in_queue_order_and_merges_outputs():
+    jobs = plan_jobs([
+        ScrapeJob("5001", ["226400316001", "226400316002"], "a.xlsx"),
+        ScrapeJob("5002", ["226400316001"], "b.xlsx"),
+        ScrapeJob("5001", ["226400316002", "226400316003"], "a.xlsx"),
+        ScrapeJob("5001", ["226400316009"], "c.xlsx"),
+        ScrapeJob("5001", ["226400316001"], "a.xlsx", result_type="Archive"),
+    ])
+    assert [(job.result_type, job.exam_value, job.output) for job in jobs] == [
+        ("Regular", "5001", "a.xlsx"), ("Regular", "5001", "c.xlsx"),
+        ("Regular", "5002", "b.xlsx"), ("Archive", "5001", "a.xlsx"),
+    ]
+    assert jobs[0].enrollments == ["226400316001", "226400316002", "226400316003"]
+
+
+def test_plan_leaves_queued_jobs_alone():
+    queued = [ScrapeJob("5001", ["226400316001"], "a.xlsx"), ScrapeJob("5001", ["226400316002"], "a.xlsx")]
+    plan_jobs(queued)
+    assert queued[0].enrollments == ["226400316001"]
+
+
+def test_read_job_file(tmp_path):
+    (tmp_path / "list.txt").write_text("226400316500\n226400316501\n", encoding="utf-8")
+    (tmp_path / "jobs.csv").write_text(
+        "Exam,Start,Count,List,Output,Result_Type\n"
+        "5001,226400316998,3,,a.xlsx,\n"
+        "5002,,,list.txt,,Archive\n"
+        ",,,,,\n",
+        encoding="utf-8"
+    )
+    first, second = read_job_file(str(tmp_path / "jobs.csv"))
+    assert first.enrollments == ["226400316998", "226400316999", "226400317000"]
+    assert first.output == "a.xlsx" and first.result_type == "Regular"
+    assert second.enrollments == ["226400316500", "226400316501"]
+    assert second.output == "results_5002.xlsx" and second.result_type == "Archive"
+
+
+def test_read_job_file_rejects_rows_without_enrollments(tmp_path):
+    (tmp_path / "jobs.csv").write_text("exam,start\n5001,12345\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        read_job_file(str(tmp_path / "jobs.csv"))
@@ -0,0 +1,52 @@
+import threading
+from logsink import LogSink
+
+
+def test_drain_returns_each_message_once():
+    sink = LogSink()
+    threads = [threading.Thread(target=lambda n=n: [sink.write(f"{n}-{i}") for i in range(100)]) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batch = sink.drain()
+    assert sorted(batch) == sorted(f"{n}-{i}" for n in range(4) for i in range(100))
+    assert sink.drain() == []
+
+
+def test_display_keeps_the_newest_lines():
+    sink = LogSink(max_lines=3)
+    for n in range(10):
+        sink.write(n)
+    assert sink.drain() == ["7", "8", "9"]
+
+
+def test_clear_drops_pending_messages():
+    sink = LogSink()
+    sink.write("old")
+    sink.clear()
+    sink.write("new")
+    assert sink.drain() == ["new"]
+
+
+def test_file_gets_every_line(tmp_path):
+    path = tmp_path / "logs" / "status.log"
+    sink = LogSink(max_lines=1, path=str(path))
+    sink.write("first\nsecond")
+    sink.write("")
+    sink.write("third")
+    assert sink.drain() == ["third"]
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [line.split(" ", 2)[2] for line in lines] == ["first", "second", "third"]
+
+
+def test_file_rotates_and_drops_the_oldest(tmp_path):
+    path = tmp_path / "status.log"
+    sink = LogSink(path=str(path), max_bytes=100, backups=2)
+    for n in range(4):
+        sink.write(f"batch {n} " + "x" * 60)
+        sink.drain()
+    assert "batch 3" in path.read_text(encoding="utf-8")
+    assert "batch 2" in (tmp_path / "status.log.1").read_text(encoding="utf-8")
+    assert "batch 1" in (tmp_path / "status.log.2").read_text(encoding="utf-8")
+    assert not (tmp_path / "status.log.3").exists()
@@ -0,0 +1,71 @@
+import time
+from common import build_enrollments
+from pages import STATUS_OK, STATUS_NOT_AVAILABLE, STATUS_INCORRECT_CAPTCHA, STATUS_TIMEOUT, STATUS_ERROR
+from scraper import HttpSession, ScrapePool
+
+
+def run_pool(mock_server, enrollments, solve_captcha, session_class=HttpSession, **kwargs):
+    outcomes = {}
+    pool = ScrapePool(
+        lambda worker_id: session_class("Regular", "5001", base_url=mock_server.url), enrollments, 1,
+        solve_captcha=solve_captcha, on_result=lambda index, enrollment, status, data: outcomes.update(
+            {enrollment: status}), **kwargs
+    )
+    pool.run()
+    return pool, outcomes
+
+
+def test_incorrect_captcha_is_retried_right_away(mock_server):
+    enrollments = build_enrollments("226400316001", 4)
+    asked = []
+    
+    def first_answer_wrong(enrollment, captcha_png):
+        asked.append(enrollment)
+        return "WRONG" if asked.count(enrollment) == 1 else mock_server.answer_for(captcha_png)
+        
+    pool, outcomes = run_pool(mock_server, enrollments, first_answer_wrong)
+    assert set(outcomes.values()) <= {STATUS_OK, STATUS_NOT_AVAILABLE}
+    assert mock_server.stats["posts"] == 8
+    assert pool.retry_stats[STATUS_INCORRECT_CAPTCHA] == {"retried": 4, "recovered": 4}
+
+
+def test_gives_up_after_the_policy_attempts(mock_server):
+    enrollments = build_enrollments("226400316001", 2)
+    pool, outcomes = run_pool(mock_server, enrollments, lambda enrollment, captcha_png: "WRONG")
+    assert outcomes == dict.fromkeys(enrollments, STATUS_INCORRECT_CAPTCHA)
+    assert mock_server.stats["posts"] == 6
+    assert pool.retry_stats[STATUS_INCORRECT_CAPTCHA] == {"retried": 4, "gave up": 2}
+    assert pool.retry_report() == ["Incorrect captcha: 4 retries, 0 recovered, 2 gave up"]
+
+
+def test_server_errors_back_off_exponentially(mock_server):
+    mock_server.error_rate = 1.0
+    started = time.monotonic()
+    pool, outcomes = run_pool(mock_server, build_enrollments("226400316001", 1),
+                              lambda enrollment, captcha_png: mock_server.answer_for(captcha_png),
+                              retry_policy={STATUS_ERROR: (3, 0.2)})
+    # Two retries, 0.2s and then 0.4s after the failures
+    assert time.monotonic() - started >= 0.6
+    assert list(outcomes.values()) == [STATUS_ERROR]
+    assert mock_server.stats["posts"] == 3
+
+
+def test_backoff_does_not_hold_up_fresh_work(mock_server):
+    enrollments = build_enrollments("226400316001", 6)
+    submitted = []
+    
+    class FirstTimesOut(HttpSession):
+        def submit(self, enrollment, captcha):
+            submitted.append(enrollment)
+            if submitted == [enrollments[0]]:
+                return STATUS_TIMEOUT, "Timeout"
+            return super().submit(enrollment, captcha)
+            
+    pool, outcomes = run_pool(mock_server, enrollments,
+                              lambda enrollment, captcha_png: mock_server.answer_for(captcha_png),
+                              session_class=FirstTimesOut, retry_policy={STATUS_TIMEOUT: (3, 1.0)})
+    # Fresh enrollments go first while the timed out one waits out its backoff
+    assert submitted[:3] == enrollments[:3]
+    assert sorted(submitted) == sorted(enrollments + enrollments[:1])
+    assert outcomes[enrollments[0]] in (STATUS_OK, STATUS_NOT_AVAILABLE)
+    assert pool.retry_stats[STATUS_TIMEOUT] == {"retried": 1, "recovered": 1}
@@ -0,0 +1,89 @@
+import threading
+from common import build_enrollments
+from pages import STATUS_OK, STATUS_NOT_AVAILABLE, STATUS_PAGE, STATUS_SKIPPED
+from scraper import ScrapePool
+from writers import read_results
+
+
+def test_scrapes_range_into_enrollment_order(mock_server, scrape, tmp_path):
+    enrollments = build_enrollments("226400316990", 20)
+    present = [enrollment for enrollment in enrollments if not mock_server.is_missing("5001", enrollment)]
+    run = scrape(enrollments, tmp_path / "out.xlsx", workers=3, prefetch=1)
+    assert run.counts[STATUS_OK] == len(present)
+    assert run.counts[STATUS_NOT_AVAILABLE] == len(enrollments) - len(present)
+    assert list(read_results(str(tmp_path / "out.xlsx"))["Enrollment_No"]) == present
+
+
+def test_stored_students_are_not_scraped_again(mock_server, scrape, tmp_path):
+    enrollments = build_enrollments("226400316000", 12)
+    scrape(enrollments[:10], tmp_path / "first.xlsx")
+    posts = mock_server.stats["posts"]
+    run = scrape(enrollments, tmp_path / "second.xlsx")
+    # "Data not available" students are asked again, their result may be out by now
+    stored = [enrollment for enrollment in enrollments[:10] if not mock_server.is_missing("5001", enrollment)]
+    assert run.known == stored
+    assert mock_server.stats["posts"] - posts == len(enrollments) - len(stored)
+    present = [enrollment for enrollment in enrollments if not mock_server.is_missing("5001", enrollment)]
+    assert list(read_results(str(tmp_path / "second.xlsx"))["Enrollment_No"]) == present
+
+
+def test_range_discovery_skips_empty_tail(mock_server, scrape, tmp_path):
+    mock_server.is_missing = lambda exam, enrollment: int(enrollment[9:]) >= 30
+    enrollments = build_enrollments("226400316000", 150)
+    run = scrape(enrollments, tmp_path / "out.csv", workers=2, max_misses=10)
+    assert run.counts[STATUS_OK] == 30
+    assert run.counts[STATUS_SKIPPED] >= 100
+    assert mock_server.stats["posts"] < 60
+    output = read_results(str(tmp_path / "out.csv"))
+    assert list(output["Enrollment_No"]) == enrollments[:30]
+
+
+class PageSession:
+    """Session that returns the enrollment itself as its result page"""
+    
+    ready = False
+    
+    def start(self):
+        self.ready = True
+        
+    def fetch_captcha(self):
+        return b"captcha"
+        
+    def submit(self, enrollment, answer):
+        return STATUS_PAGE, enrollment
+        
+    def quit(self):
+        pass
+
+
+def test_pool_keeps_results_when_hooks_fail():
+    outcomes = []
+    
+    def on_result(index, enrollment, status, data):
+        outcomes.append((index, status))
+        if index == 3:
+            raise OSError("disk full")
+            
+    def on_page(enrollment, html):
+        if enrollment.endswith("5"):
+            raise OSError("archive is gone")
+            
+    def report_captcha(enrollment, captcha_png, answer, accepted):
+        if enrollment.endswith("7"):
+            raise OSError("harvest directory is read-only")
+            
+    logged = []
+    pool = ScrapePool(
+        lambda worker_id: PageSession(), build_enrollments("226400316000", 10), 3,
+        solve_captcha=lambda enrollment, captcha_png: "ABCDE", on_result=on_result, on_log=logged.append,
+        parse_page=lambda html: (STATUS_OK, {"Enrollment_No": html}), on_page=on_page,
+        report_captcha=report_captcha
+    )
+    thread = threading.Thread(target=pool.run, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert pool.outstanding == 0
+    # The parsed results are kept, only the failures are logged
+    assert outcomes == [(index, STATUS_OK) for index in range(10)]
+    assert sum("Error handling the result" in message for message in logged) == 2
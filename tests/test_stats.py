@@ -0,0 +1,32 @@
+import random
+import numpy as np
+import pytest
+from stats import P2Quantile
+
+
+def test_no_values():
+    assert P2Quantile(0.5).value() is None
+
+
+def test_few_values_are_exact():
+    estimator = P2Quantile(0.5)
+    for x in (9.0, 7.0, 8.0, 6.0):
+        estimator.add(x)
+    assert estimator.value() == pytest.approx(np.percentile([6, 7, 8, 9], 50))
+
+
+@pytest.mark.parametrize("p", [0.25, 0.5, 0.75, 0.9])
+def test_tracks_quantile_of_a_stream(p):
+    rng = random.Random(7)
+    values = [rng.gauss(6.5, 1.2) for _ in range(5000)]
+    estimator = P2Quantile(p)
+    for x in values:
+        estimator.add(x)
+    assert estimator.value() == pytest.approx(np.quantile(values, p), abs=0.05)
+
+
+def test_sorted_input():
+    estimator = P2Quantile(0.5)
+    for x in range(1001):
+        estimator.add(float(x))
+    assert estimator.value() == pytest.approx(500, rel=0.02)
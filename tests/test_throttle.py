@@ -0,0 +1,52 @@
+from throttle import AdaptiveLimiter
+
+
+def answer(limiter, latency, ok=True):
+    started = limiter.acquire()
+    limiter.release(started - latency, ok)
+
+
+def test_slow_start_grows_to_the_maximum():
+    limiter = AdaptiveLimiter(4)
+    assert int(limiter.limit) == 1
+    for _ in range(5):
+        answer(limiter, 0.1)
+    assert int(limiter.limit) == 4 and limiter.interval == 0
+
+
+def test_failure_halves_the_limit_and_spaces_submissions():
+    decreased = []
+    limiter = AdaptiveLimiter(8)
+    limiter.on_decrease = decreased.append
+    for _ in range(8):
+        answer(limiter, 0.1)
+    answer(limiter, 0.1, ok=False)
+    assert int(limiter.limit) == 4 and limiter.interval == 0.25
+    assert decreased == [limiter] and not limiter.slow_start
+
+
+def test_slow_answers_count_as_overload():
+    limiter = AdaptiveLimiter(4, slow_floor=0.5)
+    for _ in range(6):
+        answer(limiter, 0.1)
+    answer(limiter, 1.0)
+    assert limiter.decreases == 1
+
+
+def test_one_cut_per_slowdown():
+    limiter = AdaptiveLimiter(8)
+    for _ in range(8):
+        answer(limiter, 0.1)
+    # Both submissions were sent before either answer, only the first one cuts
+    first, second = limiter.acquire(), limiter.acquire()
+    limiter.release(first, False)
+    limiter.release(second, False)
+    assert int(limiter.limit) == 4 and limiter.decreases == 1
+
+
+def test_limit_never_drops_below_minimum():
+    limiter = AdaptiveLimiter(4, min_limit=1, max_interval=0)
+    for _ in range(10):
+        answer(limiter, 0.1, ok=False)
+        limiter.last_decrease = 0
+    assert int(limiter.limit) == 1 and limiter.in_flight == 0
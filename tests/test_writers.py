@@ -0,0 +1,91 @@
+import pytest
+import pandas as pd
+from writers import RESULT_COLUMNS, get_writer, read_results
+from changes import ChangeSetWriter
+
+
+def result_row(n, spi="8.10"):
+    return {"Name": f"Student {n}", "Enrollment_No": str(226400316000 + n), "Current_Sem_Back": "0",
+            "Total_Back": "1", "SPI": spi, "CPI": "7.50", "CGPA": "7.40"}
+
+
+def enrollments_in(path):
+    return list(read_results(str(path))["Enrollment_No"])
+
+
+@pytest.mark.parametrize("extension", [".xlsx", ".csv"])
+def test_resumes_spool_of_interrupted_run(tmp_path, extension):
+    output = tmp_path / ("results" + extension)
+    writer = get_writer(str(output), flush_every=2)
+    for n in (3, 1, 2):
+        writer.write(result_row(n))
+    writer.flush()
+    # Crash: the spool is never closed
+    
+    writer = get_writer(str(output))
+    assert writer.spooled == {str(226400316000 + n) for n in (1, 2, 3)}
+    writer.write(result_row(2))  # scraped again by the resumed run
+    writer.write(result_row(0))
+    writer.close()
+    assert enrollments_in(output) == [str(226400316000 + n) for n in range(4)]
+    assert not (tmp_path / ("results" + extension + ".partial.csv")).exists()
+
+
+def test_spool_header_is_on_disk_before_the_first_flush(tmp_path):
+    output = tmp_path / "results.xlsx"
+    writer = get_writer(str(output))
+    writer.write(result_row(1))
+    with open(writer.spool_path, encoding="utf-8") as f:
+        assert f.readline().strip() == ",".join(RESULT_COLUMNS)
+
+
+@pytest.mark.parametrize("leftover", ["", "226400316001,Student 1,0,0,8,8,8\n"])
+def test_empty_or_headerless_spool_starts_over(tmp_path, leftover):
+    output = tmp_path / "results.xlsx"
+    (tmp_path / "results.xlsx.partial.csv").write_text(leftover, encoding="utf-8")
+    writer = get_writer(str(output))
+    for n in range(3):
+        writer.write(result_row(n))
+    writer.close()
+    assert enrollments_in(output) == [str(226400316000 + n) for n in range(3)]
+
+
+def test_change_set_with_empty_leftover_spool(tmp_path):
+    baseline = tmp_path / "sem5.xlsx"
+    writer = get_writer(str(baseline))
+    for n in range(3):
+        writer.write(result_row(n))
+    writer.close()
+    
+    output = tmp_path / "sem5.changes.csv"
+    (tmp_path / "sem5.changes.csv.partial.csv").write_text("", encoding="utf-8")
+    changes = ChangeSetWriter(str(output), str(baseline))
+    changes.write(result_row(0))
+    changes.write(result_row(1, spi="9.20"))
+    changes.write(result_row(5))
+    changes.close()
+    assert changes.counts == {"changed": 1, "new": 1, "unchanged": 1}
+    data = pd.read_csv(output, dtype=str)
+    assert list(data["Change"]) == ["changed", "new"]
+    assert list(data["Old_SPI"].fillna("")) == ["8.1", ""]
+
+
+def test_resumed_change_set_counts_each_student_once(tmp_path):
+    baseline = tmp_path / "sem5.xlsx"
+    writer = get_writer(str(baseline))
+    for n in range(3):
+        writer.write(result_row(n))
+    writer.close()
+    
+    output = str(tmp_path / "sem5.changes.csv")
+    changes = ChangeSetWriter(output, str(baseline))
+    changes.write(result_row(1, spi="9.20"))
+    changes.flush()
+    # Crash, then the resumed run scrapes the changed student again
+    
+    changes = ChangeSetWriter(output, str(baseline))
+    assert changes.stats.students == 1
+    changes.write(result_row(1, spi="9.20"))
+    changes.write(result_row(2))
+    assert changes.stats.students == 2
+    assert changes.counts == {"changed": 1, "new": 0, "unchanged": 1}
@@ -0,0 +1,88 @@
+"""
+GTU Results Scraper - adaptive submission limit
+Watches how the results server answers and adjusts how many submissions
+are in flight and how far apart they start, the way TCP adjusts its
+congestion window (additive increase, multiplicative decrease).
+"""
+
+import time
+import threading
+import collections
+
+
+class AdaptiveLimiter:
+    """AIMD limit on concurrent submissions, plus pacing between them
+    
+    Every answered submission raises the limit a little. A timeout, an error
+    or an answer much slower than the fastest recent one halves the limit and
+    spaces submissions out, at most once per slowdown.
+    """
+    
+    def __init__(self, max_limit, min_limit=1, slow_factor=3.0, slow_floor=0.5, max_interval=5.0, window=50):
+        self.max_limit = max(min_limit, max_limit)
+        self.min_limit = min_limit
+        self.slow_factor = slow_factor
+        self.slow_floor = slow_floor  # seconds, faster answers never count as slow
+        self.max_interval = max_interval
+        self.limit = float(min_limit)
+        self.interval = 0.0  # seconds between submission starts
+        self.in_flight = 0
+        self.slow_start = True  # grow by one per answer until the first slowdown
+        self.latencies = collections.deque(maxlen=window)
+        self.last_start = 0.0
+        self.last_decrease = 0.0
+        self.decreases = 0
+        self.condition = threading.Condition()
+        self.on_decrease = None
+        
+    def acquire(self):
+        """Wait for a free slot and the pacing interval, return the start time to pass to release()"""
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                if self.in_flight < int(self.limit):
+                    wait = self.last_start + self.interval - now
+                    if wait <= 0:
+                        break
+                    self.condition.wait(wait)
+                else:
+                    self.condition.wait()
+            self.in_flight += 1
+            self.last_start = now
+            return now
+            
+    def release(self, started, ok):
+        """Report how a submission went, ok is False for timeouts and server errors"""
+        decreased = False
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            latency = now - started
+            baseline = min(self.latencies) if self.latencies else latency
+            slow = (ok and len(self.latencies) >= 5
+                    and latency > max(baseline * self.slow_factor, self.slow_floor))
+            if ok:
+                self.latencies.append(latency)
+                
+            if not ok or slow:
+                # Submissions sent before the last cut saw the same slowdown, they don't cut again
+                if started >= self.last_decrease:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self.interval = min(self.max_interval, max(self.interval * 2, 0.25))
+                    self.slow_start = False
+                    self.last_decrease = now
+                    self.decreases += 1
+                    decreased = True
+            else:
+                self.limit = min(self.max_limit, self.limit + (1 if self.slow_start else 1 / self.limit))
+                self.interval = self.interval * 0.8 if self.interval > 0.05 else 0.0
+            self.condition.notify_all()
+        if decreased and self.on_decrease:
+            self.on_decrease(self)
+            
+    def describe(self):
+        """Short state for the progress line, e.g. "Limit 3/4" or "Limit 1/4, 0.5s apart" """
+        text = f"Limit {int(self.limit)}/{self.max_limit}"
+        if self.interval:
+            text += f", {self.interval:.1f}s apart"
+        return text
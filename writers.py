@@ -0,0 +1,294 @@
+"""
+GTU Results Scraper - result writers
+Results are appended to an on-disk spool while scraping and the
+output file is built from the spool once, when the run finishes.
+"""
+
+import os
+import csv
+import json
+import pandas as pd
+from stats import ResultStats
+from analytics import cohort_tables
+
+try:
+    import pyarrow
+except ImportError:  # optional, only Parquet and Feather output need it
+    pyarrow = None
+
+
+RESULT_COLUMNS = ["Name", "Enrollment_No", "Current_Sem_Back", "Total_Back", "SPI", "CPI", "CGPA"]
+# Column types of the final output; the spool itself is all text
+RESULT_DTYPES = {
+    "Name": "string", "Enrollment_No": "string",
+    "Current_Sem_Back": "Int16", "Total_Back": "Int16",
+    "SPI": "float32", "CPI": "float32", "CGPA": "float32",
+}
+RESULTS_SHEET = "Results"
+SUBJECTS_SHEET = "Subjects"
+SUMMARY_SHEET = "Summary"
+# Older versions appended these rows to the results sheet itself
+LEGACY_SUMMARY_NAMES = ["MAX", "MIN", "AVG", "Total Failed Students"]
+
+
+def typed_results(data):
+    """Results with their output dtypes instead of object columns"""
+    data = data.reindex(columns=RESULT_COLUMNS)
+    for col, dtype in RESULT_DTYPES.items():
+        if dtype == "string":
+            data[col] = data[col].astype("string")
+        elif dtype.startswith("Int"):
+            data[col] = pd.to_numeric(data[col], errors="coerce").round().astype(dtype)
+        else:
+            data[col] = pd.to_numeric(data[col], errors="coerce").astype(dtype)
+    return data
+
+
+def open_spool(path, fieldnames):
+    """Open a CSV spool for appending, returns (file, writer, rows already spooled)
+    
+    A missing, empty or headerless spool is started over, and its header is
+    fsynced right away so a crash before the first flush leaves a readable file.
+    """
+    rows = None
+    if os.path.exists(path):
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames == list(fieldnames):
+                rows = list(reader)
+    f = open(path, "w" if rows is None else "a", newline="", encoding="utf-8")
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    if rows is None:
+        writer.writeheader()
+        f.flush()
+        os.fsync(f.fileno())
+    return f, writer, rows or []
+
+
+class ResultWriter:
+    """Append-only result sink, subclasses decide the final output format"""
+    
+    extension = None
+    
+    def __init__(self, file_path, flush_every=25, stats=None, on_flush=None, cohorts=cohort_tables):
+        self.file_path = file_path
+        self.cohorts = cohorts
+        self.stats = stats if stats is not None else ResultStats()
+        self.on_flush = on_flush
+        self.spool_path = file_path + ".partial.csv"
+        self.subjects_path = file_path + ".subjects.partial.jsonl"
+        self.flush_every = flush_every
+        self.pending = 0
+        self.rows_written = 0
+        
+        # Reuse a spool left behind by an interrupted run instead of dropping it
+        self._file, self._csv, rows = open_spool(self.spool_path, RESULT_COLUMNS)
+        self.spooled = set()
+        for row in rows:
+            self.stats.add(row)
+            self.spooled.add(row["Enrollment_No"])
+        # Subject grades of rows that are not in the spool any more would be orphans
+        self._subjects = open(self.subjects_path, "a" if rows else "w", encoding="utf-8")
+            
+    def write(self, row):
+        """Append one result row and its subject grades to the spool"""
+        # A resumed run can scrape a row again that the interrupted run had already spooled
+        if row.get("Enrollment_No") in self.spooled:
+            return
+        self.spooled.add(row.get("Enrollment_No"))
+        self._csv.writerow({col: row.get(col, "") for col in RESULT_COLUMNS})
+        self.stats.add(row)
+        for subject in row.get("Subjects") or []:
+            record = {"Enrollment_No": row.get("Enrollment_No", "")}
+            record.update(subject)
+            self._subjects.write(json.dumps(record) + "\n")
+        self.rows_written += 1
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+            
+    def flush(self):
+        """Flush buffered rows and fsync them to disk"""
+        if self._file.closed:
+            return
+        for f in (self._file, self._subjects):
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending = 0
+        if self.on_flush:
+            self.on_flush()
+        
+    def close(self):
+        """Close the spool and build the output file from it"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        self._subjects.close()
+        
+        data = pd.read_csv(self.spool_path, dtype=str, keep_default_na=False)
+        with open(self.subjects_path, encoding="utf-8") as f:
+            subjects = pd.DataFrame([json.loads(line) for line in f if line.strip()], dtype=str)
+        if os.path.exists(self.file_path):
+            existing, existing_subjects = self.read_existing()
+            existing = existing[~(existing["Name"].isin(LEGACY_SUMMARY_NAMES) & (existing["Enrollment_No"] == " - "))]
+            # Upsert: students scraped in this run replace their older rows instead of duplicating them
+            existing = existing[~existing["Enrollment_No"].astype(str).isin(self.spooled)]
+            if "Enrollment_No" in existing_subjects:
+                existing_subjects = existing_subjects[~existing_subjects["Enrollment_No"].astype(str).isin(self.spooled)]
+            for row in existing.to_dict("records"):
+                self.stats.add(row)
+            data = pd.concat([typed_results(existing), typed_results(data)], ignore_index=True)
+            subjects = pd.concat([existing_subjects.astype("string"), subjects], ignore_index=True)
+        # Range discovery and resumed runs spool rows out of enrollment order
+        data = typed_results(data).sort_values("Enrollment_No", kind="stable", ignore_index=True)
+        subjects = subjects.astype("string")
+        if "Enrollment_No" in subjects:
+            subjects = subjects.sort_values("Enrollment_No", kind="stable", ignore_index=True)
+            
+        # Nothing scraped and nothing to merge with, don't create an empty file
+        if not data.empty or os.path.exists(self.file_path):
+            self.export(data, subjects, pd.DataFrame(self.stats.summary_rows()), self.cohorts(data))
+        os.remove(self.spool_path)
+        os.remove(self.subjects_path)
+        
+    def read_existing(self):
+        """Read (results, subjects) already present in the output file"""
+        raise NotImplementedError
+        
+    @classmethod
+    def read_results(cls, file_path):
+        """Results table of an output file in this format"""
+        raise NotImplementedError
+        
+    def export(self, data, subjects, summary, cohorts):
+        """Write the final tables to the output file, cohorts is {sheet name: table}"""
+        raise NotImplementedError
+
+
+class ExcelResultWriter(ResultWriter):
+    """Builds the .xlsx output in a single write, subject grades go to their own sheet"""
+    
+    extension = ".xlsx"
+    
+    def read_existing(self):
+        sheets = pd.read_excel(self.file_path, sheet_name=None, dtype={"Enrollment_No": str})
+        results = next(iter(sheets.values()))
+        return results, sheets.get(SUBJECTS_SHEET, pd.DataFrame())
+        
+    @classmethod
+    def read_results(cls, file_path):
+        return pd.read_excel(file_path, sheet_name=0, dtype={"Enrollment_No": str})
+        
+    def export(self, data, subjects, summary, cohorts):
+        # float32 cells would show as 7.800000190734863 in Excel
+        grades = ["SPI", "CPI", "CGPA"]
+        data = data.astype({col: "float64" for col in grades}).round({col: 2 for col in grades})
+        with pd.ExcelWriter(self.file_path) as excel:
+            data.to_excel(excel, sheet_name=RESULTS_SHEET, index=False)
+            if not subjects.empty:
+                subjects.to_excel(excel, sheet_name=SUBJECTS_SHEET, index=False)
+            summary.to_excel(excel, sheet_name=SUMMARY_SHEET, index=False)
+            for sheet, table in cohorts.items():
+                table.to_excel(excel, sheet_name=sheet, index=False)
+
+
+class TableResultWriter(ResultWriter):
+    """Single-table formats: results in the output file, other tables in files next to it
+    
+    For results.parquet the subject grades go to results.subjects.parquet,
+    the summary to results.summary.parquet and cohorts to results.by_college.parquet etc.
+    """
+    
+    def side_path(self, name):
+        base = self.file_path[:-len(self.extension)]
+        return f"{base}.{name.lower().replace(' ', '_')}{self.extension}"
+        
+    def read_existing(self):
+        results = self.read_table(self.file_path)
+        subjects_path = self.side_path(SUBJECTS_SHEET)
+        subjects = self.read_table(subjects_path) if os.path.exists(subjects_path) else pd.DataFrame()
+        return results, subjects
+        
+    @classmethod
+    def read_results(cls, file_path):
+        return cls.read_table(file_path)
+        
+    def export(self, data, subjects, summary, cohorts):
+        self.write_table(data, self.file_path)
+        if not subjects.empty:
+            self.write_table(subjects, self.side_path(SUBJECTS_SHEET))
+        self.write_table(summary, self.side_path(SUMMARY_SHEET))
+        for name, table in cohorts.items():
+            self.write_table(table, self.side_path(name))
+            
+    @staticmethod
+    def read_table(path):
+        raise NotImplementedError
+        
+    def write_table(self, table, path):
+        raise NotImplementedError
+
+
+class CsvResultWriter(TableResultWriter):
+    extension = ".csv"
+    
+    @staticmethod
+    def read_table(path):
+        return pd.read_csv(path, dtype={"Enrollment_No": str})
+        
+    def write_table(self, table, path):
+        table.to_csv(path, index=False, float_format="%.2f")
+
+
+class ArrowResultWriter(TableResultWriter):
+    """Parquet and Feather need pyarrow, which is optional"""
+    
+    def __init__(self, file_path, **kwargs):
+        if pyarrow is None:
+            raise ValueError(f"Writing {self.extension} files requires pyarrow (pip install pyarrow)")
+        super().__init__(file_path, **kwargs)
+
+
+class ParquetResultWriter(ArrowResultWriter):
+    extension = ".parquet"
+    
+    @staticmethod
+    def read_table(path):
+        return pd.read_parquet(path)
+        
+    def write_table(self, table, path):
+        table.to_parquet(path, index=False)
+
+
+class FeatherResultWriter(ArrowResultWriter):
+    extension = ".feather"
+    
+    @staticmethod
+    def read_table(path):
+        return pd.read_feather(path)
+        
+    def write_table(self, table, path):
+        table.reset_index(drop=True).to_feather(path)
+
+
+WRITERS = [ExcelResultWriter, ParquetResultWriter, FeatherResultWriter, CsvResultWriter]
+OUTPUT_EXTENSIONS = [writer_cls.extension for writer_cls in WRITERS]
+
+
+def writer_class(file_path):
+    """Writer class matching the output file extension"""
+    for writer_cls in WRITERS:
+        if file_path.lower().endswith(writer_cls.extension):
+            return writer_cls
+    raise ValueError(f"Unsupported output format: {file_path}")
+
+
+def get_writer(file_path, **kwargs):
+    """Return the writer matching the output file extension"""
+    return writer_class(file_path)(file_path, **kwargs)
+
+
+def read_results(file_path):
+    """Results table of an output file written by any of the writers"""
+    return writer_class(file_path).read_results(file_path)